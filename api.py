@@ -1,11 +1,24 @@
-import streamlit as st
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
+import asyncio
 import json
 import os
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from components.result_store import create_result_store
+from components.parser import StreamingSectionParser, normalize_llm_response
+from components.metrics import JobMetrics
+from components import json_codec
 
-app = FastAPI()
+class CodecJSONResponse(JSONResponse):
+    """json_codec으로 직렬화하는 응답 (orjson이 있으면 사용)"""
+    def render(self, content):
+        return json_codec.dumps(content)
+
+app = FastAPI(default_response_class=CodecJSONResponse)
 
 class ResultNotification(BaseModel):
     job_id: str
@@ -13,27 +26,229 @@ class ResultNotification(BaseModel):
     result_data: dict = None
     status: str
 
-# 결과 저장소 (메모리 기반 - 프로덕션에서는 Redis 사용 권장)
-result_store = {}
+class ResultChunk(BaseModel):
+    content: str = ""
+    seq: int = None
+    done: bool = False
+
+class JobSpans(BaseModel):
+    platform: str = None
+    spans: dict[str, float] = {}
+    durations: dict[str, float] = {}
+
+# 결과 저장소 (RESULT_STORE_* 환경변수로 종류/한도 설정)
+result_store = create_result_store()
+
+# 작업별 단계 시각 (이 워커가 처리한 요청 기준)
+job_metrics = JobMetrics()
+
+# 만료 항목 정리 주기 (초)
+RESULT_STORE_SWEEP_INTERVAL = float(os.getenv("RESULT_STORE_SWEEP_INTERVAL", "60"))
+
+async def sweep_result_store():
+    """만료된 결과를 주기적으로 정리하는 백그라운드 작업"""
+    while True:
+        await asyncio.sleep(RESULT_STORE_SWEEP_INTERVAL)
+        try:
+            expired = await asyncio.to_thread(result_store.sweep)
+            if expired:
+                print(f"🧹 만료된 결과 {expired}개 정리")
+        except Exception as e:
+            print(f"❌ 결과 저장소 정리 오류: {str(e)}")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """백그라운드 작업 시작"""
+    app.state.sweep_task = asyncio.create_task(sweep_result_store())
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """백그라운드 작업 종료 및 저장소 정리"""
+    app.state.sweep_task.cancel()
+    result_store.close()
+
+# 결과/스트림 대기자 (job_id -> {"event", "count"}) - long-poll 대기자에게 도착을 알림
+result_waiters = {}
+stream_waiters = {}
+
+# long-poll 최대 대기 시간 (초)
+MAX_WAIT_TIMEOUT = float(os.getenv("RESULT_WAIT_MAX_TIMEOUT", "55"))
+
+# long-poll 중 저장소 재확인 주기 (초) - 다른 워커가 받은 결과 감지용
+RESULT_WAIT_POLL_INTERVAL = float(os.getenv("RESULT_WAIT_POLL_INTERVAL", "0.5"))
+
+# 여러 작업 결과를 한 번에 기다릴 때 최대 작업 수
+MAX_WAIT_JOB_IDS = int(os.getenv("RESULT_WAIT_MAX_JOB_IDS", "50"))
+
+# 텍스트 조각 순서 창 - 다음 순서보다 이만큼 넘게 앞선 seq는 거부 (보관 조각 수 상한)
+STREAM_MAX_PENDING = int(os.getenv("STREAM_MAX_PENDING", "64"))
+# 새 이벤트 없이 이만큼 조각이 쌓이면 파서 상태를 저장 (다른 워커가 이어받을 때 다시 넣을 조각 수 상한)
+STREAM_CHECKPOINT_CHUNKS = int(os.getenv("STREAM_CHECKPOINT_CHUNKS", "32"))
+# 이 워커에서 이어서 파싱 중인 스트림 수 상한
+STREAM_PARSER_CACHE_SIZE = int(os.getenv("STREAM_PARSER_CACHE_SIZE", "256"))
+
+# 이 워커의 스트림 파서 (job_id -> {"parser", "fed"}) - 조각마다 파서 상태를 저장소에서 읽고 쓰지 않도록 보관
+stream_parsers = OrderedDict()
+# 작업별 조각 처리는 서로 다른 스레드에서 동시에 실행되므로 파서 보관소 변경을 보호
+stream_parsers_lock = threading.Lock()
+# 작업별 잠금 (job_id -> {"lock", "users"}) - 같은 작업의 조각만 순서대로 처리, 대기자가 없으면 제거
+stream_locks = {}
+
+def loop_time():
+    """현재 이벤트 루프 기준 시간"""
+    return asyncio.get_running_loop().time()
+
+def notify_waiters(waiters, job_id):
+    """job_id를 기다리는 long-poll 요청 깨우기"""
+    entry = waiters.pop(job_id, None)
+    if entry:
+        entry["event"].set()
+
+async def wait_any(events, timeout):
+    """이벤트 중 하나가 설정되거나 timeout(초)이 지날 때까지 대기"""
+    if len(events) == 1:
+        try:
+            await asyncio.wait_for(events[0].wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return
+    
+    tasks = [asyncio.ensure_future(event.wait()) for event in events]
+    try:
+        await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def wait_until(waiters, job_ids, check, timeout):
+    """check()가 None이 아닌 값을 반환하거나 timeout(초)이 지날 때까지 대기
+    
+    같은 워커에 도착한 알림은 이벤트로 즉시 깨어나고,
+    다른 워커에 도착한 알림은 공유 저장소를 주기적으로 확인해 감지합니다.
+    job_ids가 목록이면 그중 하나라도 알림이 오면 다시 확인합니다.
+    check()는 저장소 조회(sqlite/공유 서버 I/O)를 하므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    
+    Returns:
+        check()의 결과 (시간 초과 시 None)
+    """
+    if isinstance(job_ids, str):
+        job_ids = [job_ids]
+    deadline = loop_time() + max(0.0, min(timeout, MAX_WAIT_TIMEOUT))
+    while True:
+        entries = []
+        for job_id in job_ids:
+            entry = waiters.setdefault(job_id, {"event": asyncio.Event(), "count": 0})
+            entry["count"] += 1
+            entries.append((job_id, entry))
+        try:
+            # 등록 후 확인해야 그 사이에 도착한 알림을 놓치지 않음
+            value = await asyncio.to_thread(check)
+            remaining = deadline - loop_time()
+            if value is not None or remaining <= 0:
+                return value
+            await wait_any([entry["event"] for _, entry in entries], min(remaining, RESULT_WAIT_POLL_INTERVAL))
+        finally:
+            # 마지막 대기자가 빠지면 이벤트 정리
+            for job_id, entry in entries:
+                entry["count"] -= 1
+                if entry["count"] <= 0 and waiters.get(job_id) is entry:
+                    waiters.pop(job_id, None)
+
+def stream_key(job_id):
+    """생성 중인 콘텐츠 이벤트를 저장하는 결과 저장소 키 ({"events", "done"}, 조회용)"""
+    return f"stream:{job_id}"
+
+def stream_state_key(job_id):
+    """조각 순서/아직 저장하지 않은 조각을 저장하는 키 (조각마다 갱신, 작은 기록)"""
+    return f"stream:{job_id}:state"
+
+def stream_parser_key(job_id):
+    """파서 상태 체크포인트 키 (새 이벤트가 생기거나 조각이 쌓일 때만 갱신)"""
+    return f"stream:{job_id}:parser"
+
+def load_stream_parser(job_id, state):
+    """state까지 조각을 넣은 파서 (이 워커에 없거나 뒤처졌으면 체크포인트 + 남은 조각으로 복원)"""
+    with stream_parsers_lock:
+        local = stream_parsers.get(job_id)
+        if local and local["fed"] == state["fed"]:
+            stream_parsers.move_to_end(job_id)
+            return local["parser"]
+    
+    checkpoint = result_store.get(stream_parser_key(job_id))
+    parser = StreamingSectionParser.from_state(checkpoint["parser"]) if checkpoint else StreamingSectionParser()
+    # 체크포인트 이후 조각은 이미 이벤트를 저장했으므로 결과는 버림
+    for content in state["tail"]:
+        parser.feed(content)
+    return parser
+
+def normalize_notification(notification):
+    """완료 알림을 화면에 바로 표시할 수 있는 결과로 정규화 (실패하면 None)"""
+    if notification.result_data:
+        response_data = notification.result_data
+    elif notification.result:
+        response_data = {"content": notification.result}
+    else:
+        return None
+    
+    try:
+        return normalize_llm_response(response_data)
+    except Exception as e:
+        print(f"⚠️ 결과 정규화 실패: {notification.job_id[:8]}... ({str(e)})")
+        return None
+
+def result_response(request, record):
+    """저장된 결과 응답 (content_hash가 있으면 ETag / If-None-Match 304 지원)"""
+    if not record.get("content_hash"):
+        return record
+    
+    etag = f'"{record["content_hash"]}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if any(tag.strip().removeprefix("W/") in (etag, "*") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return CodecJSONResponse(record, headers={"ETag": etag})
 
 @app.post("/api/result")
-async def receive_result(notification: ResultNotification):
+async def receive_result(request: Request):
     """n8n에서 완료 알림을 받는 엔드포인트"""
+    # 큰 블로그 결과도 빠르게 처리하도록 json_codec으로 디코딩 후 검증
     try:
-        # 결과 저장
-        result_store[notification.job_id] = {
+        notification = json_codec.decode_model(ResultNotification, await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    try:
+        job_metrics.record(notification.job_id, "callback")
+        
+        # 받을 때 한 번만 정규화해서 저장 (조회 시에는 다시 파싱하지 않음)
+        # 파싱은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        started = time.perf_counter()
+        normalized = await asyncio.to_thread(normalize_notification, notification)
+        job_metrics.record_duration(notification.job_id, "normalize", time.perf_counter() - started)
+        record = {
             "status": notification.status,
-            "result": notification.result,
-            "result_data": notification.result_data,
+            "normalized": normalized,
+            "content_hash": json_codec.content_hash(normalized) if normalized is not None else None,
             "received_at": datetime.now().isoformat()
         }
+        if normalized is None:
+            # 정규화하지 못한 경우 원본을 남겨 클라이언트에서 처리
+            record["result"] = notification.result
+            record["result_data"] = notification.result_data
+        
+        # 결과 저장 (저장소 I/O는 스레드에서)
+        await asyncio.to_thread(result_store.set, notification.job_id, record)
+        
+        # 대기 중인 long-poll 요청 깨우기
+        notify_waiters(result_waiters, notification.job_id)
+        notify_waiters(stream_waiters, notification.job_id)
         
         print(f"✅ 결과 받음: {notification.job_id[:8]}... (상태: {notification.status})")
         
         return {
             "success": True,
             "message": f"결과를 성공적으로 받았습니다. job_id: {notification.job_id[:8]}...",
-            "received_at": datetime.now().isoformat()
+            "received_at": datetime.now().isoformat(),
+            "worker": os.getpid()
         }
         
     except Exception as e:
@@ -41,17 +256,215 @@ async def receive_result(notification: ResultNotification):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/result/{job_id}")
-async def get_result(job_id: str):
+async def get_result(job_id: str, request: Request):
     """결과 조회 엔드포인트"""
-    if job_id in result_store:
-        return result_store[job_id]
+    record = await asyncio.to_thread(result_store.get, job_id)
+    if record is not None:
+        job_metrics.record(job_id, "first_poll", first_only=True)
+        return result_response(request, record)
     else:
         raise HTTPException(status_code=404, detail="결과를 찾을 수 없습니다")
 
+@app.get("/api/result/{job_id}/wait")
+async def wait_result(job_id: str, request: Request, timeout: float = 25.0):
+    """결과 대기 엔드포인트 (long-poll)
+    
+    결과가 도착하면 즉시 반환하고, timeout(초) 동안 도착하지 않으면 404를 반환합니다.
+    """
+    record = await wait_until(result_waiters, job_id, lambda: result_store.get(job_id), timeout)
+    if record is not None:
+        job_metrics.record(job_id, "first_poll", first_only=True)
+        return result_response(request, record)
+    raise HTTPException(status_code=404, detail="결과를 찾을 수 없습니다")
+
+@app.get("/api/results/wait")
+async def wait_results(job_ids: str, timeout: float = 25.0):
+    """여러 작업 결과 대기 엔드포인트 (long-poll, 일괄 생성용)
+    
+    job_ids(쉼표로 구분) 중 하나라도 결과가 있으면 그때까지 도착한 결과를 모두 반환하고,
+    timeout(초) 동안 도착하지 않으면 빈 results를 반환합니다.
+    """
+    ids = list(dict.fromkeys(job_id.strip() for job_id in job_ids.split(",") if job_id.strip()))
+    if not ids:
+        raise HTTPException(status_code=422, detail="job_ids가 비어 있습니다")
+    if len(ids) > MAX_WAIT_JOB_IDS:
+        raise HTTPException(status_code=422, detail=f"job_ids는 최대 {MAX_WAIT_JOB_IDS}개까지 가능합니다")
+    
+    def check():
+        records = {}
+        for job_id in ids:
+            record = result_store.get(job_id)
+            if record is not None:
+                records[job_id] = record
+        return records or None
+    
+    records = await wait_until(result_waiters, ids, check, timeout) or {}
+    for job_id in records:
+        job_metrics.record(job_id, "first_poll", first_only=True)
+    return {"results": records}
+
+@app.post("/api/result/{job_id}/chunk")
+async def receive_result_chunk(job_id: str, request: Request):
+    """n8n에서 생성 중인 텍스트 조각을 받는 엔드포인트 (점진적 표시용)
+    
+    seq가 있으면 순서대로 이어 붙이고, 앞 조각보다 먼저 도착한 조각은 STREAM_MAX_PENDING개까지 보관합니다.
+    이미 받은 seq는 무시하고, 창을 벗어난 seq는 409로 거부합니다.
+    done=True면 남은 섹션을 마무리합니다. 최종 결과는 기존 /api/result 알림으로 받습니다.
+    
+    파서는 이 워커의 메모리에 두고, 조각마다 저장하는 기록은 순서 정보와 체크포인트 이후 조각뿐입니다.
+    이벤트 목록과 파서 체크포인트(아직 확정하지 않은 끝부분)는 새 이벤트가 생길 때만 저장합니다.
+    같은 작업의 조각만 작업별 잠금으로 순서대로 처리하고, 다른 작업의 조각은 기다리지 않습니다.
+    """
+    try:
+        chunk = json_codec.decode_model(ResultChunk, await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    entry = stream_locks.setdefault(job_id, {"lock": asyncio.Lock(), "users": 0})
+    entry["users"] += 1
+    try:
+        async with entry["lock"]:
+            return await asyncio.to_thread(apply_result_chunk, job_id, chunk)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ 조각 처리 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        entry["users"] -= 1
+        if not entry["users"]:
+            del stream_locks[job_id]
+
+def apply_result_chunk(job_id, chunk):
+    """조각을 순서대로 파서에 넣고 새 이벤트 저장 (저장소 I/O가 있어 스레드에서 실행)"""
+    state_key = stream_state_key(job_id)
+    state = result_store.get(state_key) or {"fed": 0, "next_seq": 0, "pending": {}, "tail": [], "events": 0, "done": False}
+    if state["done"]:
+        return {"success": True, "events": state["events"], "done": True}
+    
+    if chunk.seq is None:
+        ready = [chunk]
+    elif chunk.seq < state["next_seq"] or str(chunk.seq) in state["pending"]:
+        # 재전송된 조각
+        return {"success": True, "events": state["events"], "done": False}
+    elif chunk.seq > state["next_seq"] + STREAM_MAX_PENDING:
+        raise HTTPException(
+            status_code=409,
+            detail=f"seq {chunk.seq}이(가) 다음 순서 {state['next_seq']}보다 {STREAM_MAX_PENDING} 넘게 앞섭니다"
+        )
+    else:
+        # 저장소가 JSON으로 저장할 수 있도록 seq는 문자열 키로 보관
+        state["pending"][str(chunk.seq)] = chunk.model_dump()
+        ready = []
+        while str(state["next_seq"]) in state["pending"]:
+            ready.append(ResultChunk(**state["pending"].pop(str(state["next_seq"]))))
+            state["next_seq"] += 1
+    
+    new_events = []
+    if ready:
+        parser = load_stream_parser(job_id, state)
+        for item in ready:
+            new_events.extend(parser.feed(item.content))
+            state["tail"].append(item.content)
+            state["fed"] += 1
+            if item.done:
+                new_events.extend(parser.finish())
+                state["done"] = True
+                break
+        
+        with stream_parsers_lock:
+            if state["done"]:
+                stream_parsers.pop(job_id, None)
+            else:
+                stream_parsers[job_id] = {"parser": parser, "fed": state["fed"]}
+                stream_parsers.move_to_end(job_id)
+                while len(stream_parsers) > STREAM_PARSER_CACHE_SIZE:
+                    stream_parsers.popitem(last=False)
+        if not state["done"]:
+            if new_events or len(state["tail"]) >= STREAM_CHECKPOINT_CHUNKS:
+                result_store.set(stream_parser_key(job_id), {"parser": parser.to_state()})
+                state["tail"] = []
+    
+    if new_events or state["done"]:
+        key = stream_key(job_id)
+        record = result_store.get(key) or {"events": [], "done": False}
+        record["events"].extend(new_events)
+        record["done"] = state["done"]
+        result_store.set(key, record)
+        state["events"] = len(record["events"])
+    
+    result_store.set(state_key, state)
+    
+    if new_events or state["done"]:
+        notify_waiters(stream_waiters, job_id)
+    
+    return {"success": True, "events": state["events"], "done": state["done"]}
+
+@app.get("/api/result/{job_id}/stream")
+async def get_result_stream(job_id: str, since: int = 0, timeout: float = 0.0):
+    """생성 중인 콘텐츠 이벤트 조회 엔드포인트 (long-poll)
+    
+    since 이후의 새 이벤트나 최종 결과가 생기면 즉시 반환하고,
+    timeout(초) 동안 변화가 없으면 빈 이벤트 목록을 반환합니다.
+    """
+    def check():
+        record = result_store.get(stream_key(job_id)) or {"events": [], "done": False}
+        completed = result_store.get(job_id) is not None
+        response = {
+            "events": record["events"][since:],
+            "next": max(since, len(record["events"])),
+            "done": record["done"],
+            "completed": completed
+        }
+        if response["events"] or record["done"] or completed:
+            return response
+        return None
+    
+    response = await wait_until(stream_waiters, job_id, check, timeout)
+    if response is None:
+        response = {"events": [], "next": since, "done": False, "completed": False}
+    return response
+
+@app.post("/api/metrics/{job_id}")
+async def receive_job_spans(job_id: str, request: Request):
+    """Streamlit 앱에서 측정한 단계 시각(submit, ack, parse, render 등)을 받는 엔드포인트"""
+    try:
+        spans = json_codec.decode_model(JobSpans, await request.body())
+        job_metrics.record_spans(job_id, spans.spans, platform=spans.platform, durations=spans.durations)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"success": True}
+
+@app.get("/api/metrics/{job_id}")
+async def get_job_metrics(job_id: str):
+    """작업 하나의 단계 시각과 구간별 소요 시간(초) 조회"""
+    timeline = job_metrics.get(job_id)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="작업 기록을 찾을 수 없습니다")
+    return timeline
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """플랫폼별 단계 구간 지연 백분위 (p50/p95/p99, 밀리초)
+    
+    end_to_end는 요청 전송(submit)부터 화면 표시(render)까지입니다.
+    API_WORKERS > 1이면 요청을 받은 워커의 기록만 집계됩니다.
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "jobs_tracked": len(job_metrics),
+        "platforms": job_metrics.summary()
+    }
+
 @app.get("/api/health")
 async def health_check():
     """헬스체크 엔드포인트"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "worker": os.getpid(),
+        "result_store": await asyncio.to_thread(result_store.stats)
+    }
 
 # 개발용 서버 실행
 if __name__ == "__main__":
@@ -2,19 +2,29 @@ import streamlit as st
 import streamlit_shadcn_ui as ui
 import os
 import json
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 
 # 컴포넌트 도입
-from components.webhook import call_n8n_webhook_async, check_job_result
-from components.ui import show_input_form, show_results, init_page
+from components.webhook import call_n8n_webhook_async, check_job_result, check_job_stream, report_job_timing, submit_job_group, check_group_results
+from components.dispatcher import get_delivery, complete_job, cancel_job, DELIVERY_ACCEPTED, DELIVERY_FAILED, DISPATCH_IN_FLIGHT_TIMEOUT
+from components.job_client import RESULT_WAIT_TIMEOUT
+from components.job_cache import get_result as get_cached_result
+from components.ui import show_input_form, show_results, init_page, show_delivery_status, show_partial_result, show_job_group_progress, show_group_results, show_modify_chat
+from components import batch
 from components.session import init_session_state, display_version, restore_version
+from components.version_store import VersionStore
+from components.modify_payload import build_modify_payload
 from components.auth import login_page, auth_required, is_authenticated, init_auth_session, is_admin
 from components.admin import admin_page
 
 # 환경 변수 로드
 load_dotenv()
 
+# 작업 결과를 기다리는 최대 시간 (초, 지나면 실패로 표시하고 n8n 처리 자리 반환)
+JOB_RESULT_TIMEOUT = float(os.getenv("JOB_RESULT_TIMEOUT", str(DISPATCH_IN_FLIGHT_TIMEOUT)))
+
 def generate_content(form_data):
     """광고 컨텐츠 생성 - 비동기 방식"""
     # 컨텐츠 타입에 따른 예상 시간 안내
@@ -36,7 +46,7 @@ def generate_content(form_data):
         job_id = call_n8n_webhook_async({
             "type": "generate",
             "data": form_data
-        })
+        }, use_cache=st.session_state.get('reuse_cached_result', True))
         
         if job_id:
             # 세션 상태 업데이트
@@ -58,8 +68,69 @@ def generate_content(form_data):
         progress_placeholder.empty()
         status_placeholder.empty()
 
+def generate_job_group(variants):
+    """일괄 생성 - 하나의 입력을 여러 플랫폼/연령대 작업으로 나눠 동시에 요청"""
+    progress_placeholder = st.empty()
+    with progress_placeholder:
+        st.info(f"✨ {len(variants)}개 콘텐츠를 동시에 생성하고 있습니다... (예상 소요시간: 최대 3분)")
+    
+    try:
+        return submit_job_group(variants, use_cache=st.session_state.get('reuse_cached_result', True)) is not None
+    except Exception as e:
+        st.error(f"❌ 오류 발생: {str(e)}")
+        return False
+    finally:
+        progress_placeholder.empty()
+
+def wait_job_group(group):
+    """작업 묶음의 결과를 도착하는 대로 모으고, 모두 끝나면 결과 화면으로 전환"""
+    st.info(f"🔄 {len(group['jobs'])}개 콘텐츠를 생성 중입니다... 완료되는 대로 표시합니다.")
+    progress_placeholder = st.empty()
+    result_placeholder = st.empty()
+    
+    while True:
+        pending = [job for job in batch.pending_jobs(group) if job['job_id']]
+        accepted = True
+        for job in pending:
+            # 같은 입력으로 보관된 결과는 기다리지 않고 바로 사용
+            cached = get_cached_result(job['job_id'])
+            if cached:
+                job.update(status=batch.JOB_DONE, result=cached)
+                continue
+            delivery = get_delivery(job['job_id'])
+            job['delivery'] = delivery
+            if delivery and delivery['status'] == DELIVERY_FAILED:
+                job.update(status=batch.JOB_FAILED, error=delivery.get('error') or "요청 전송에 실패했습니다.")
+            elif delivery and delivery['status'] != DELIVERY_ACCEPTED:
+                accepted = False
+        
+        with progress_placeholder.container():
+            show_job_group_progress(group)
+        
+        pending = [job for job in batch.pending_jobs(group) if job['job_id']]
+        if not pending:
+            break
+        
+        # 하나라도 도착하면 바로 반환되는 long-poll (전송 중인 작업이 있으면 짧게 대기)
+        started_at = time.time()
+        with result_placeholder:
+            results = check_group_results([job['job_id'] for job in pending], wait_timeout=None if accepted else 2)
+        for job in pending:
+            result = results.get(job['job_id'])
+            if result:
+                job.update(status=batch.JOB_DONE, result=result)
+                # n8n 처리 자리 반환 및 같은 요청 재사용을 위해 결과 보관
+                complete_job(job['job_id'], result)
+        # 오류로 즉시 반환된 경우 과도한 재요청 방지
+        elapsed = time.time() - started_at
+        if not results and elapsed < 1:
+            time.sleep(1 - elapsed)
+    
+    st.session_state.job_status = "group_completed"
+    st.rerun()
+
 def handle_chat_input(user_input):
-    """채팅 입력 처리"""
+    """채팅 입력 처리 - 수정 요청을 전송하고 결과는 작업 대기 화면에서 반영 (apply_modification)"""
     # 메시지 추가
     st.session_state.messages.append({"role": "user", "content": user_input})
     
@@ -78,81 +149,23 @@ def handle_chat_input(user_input):
     with progress_placeholder:
         st.info(modify_msg)
     
-    # 전체 수정 히스토리 구성
-    modification_history = []
-    for version in st.session_state.get('version_history', []):
-        modification_history.append({
-            "version": version['version'],
-            "timestamp": version['timestamp'],
-            "content": version['data'],
-            "user_request": version.get('user_request'),
-            "is_original": version.get('is_original', False)
-        })
-    
-    # 원본 콘텐츠 찾기 (첫 번째 버전)
-    original_content = None
-    if modification_history and modification_history[0].get('is_original'):
-        original_content = modification_history[0]['content']
-    
-    modify_data = {
-        "type": "modify",
-        "is_modification": True,  # 수정 요청임을 명시하는 플래그
-        "data": {
-            "current_request": user_input,  # 현재 수정 요청
-            "modification_request": user_input,  # 수정 요청 내용 (명확한 변수명)
-            
-            # 전체 히스토리 정보
-            "modification_history": modification_history,  # 전체 수정 히스토리
-            "original_content": original_content,  # 맨 처음 원본
-            "current_content": st.session_state.result,  # 현재 결과
-            
-            # 기존 호환성 유지
-            "original_result": st.session_state.result,  # 이전 출력 결과
-            "previous_output": {
-                "headline": st.session_state.result.get('headline', ''),
-                "caption": st.session_state.result.get('caption', ''),
-                "hashtags": st.session_state.result.get('hashtags', []),
-                "blog_title": st.session_state.result.get('blog_title', ''),
-                "blog_content": st.session_state.result.get('blog_content', '')
-            },
-            "user_request": user_input,  # 사용자의 수정 요청
-            "context": st.session_state.get('form_data', {}),  # 원본 폼 데이터
-            "version_history": st.session_state.get('version_history', [])  # 버전 히스토리
-        }
-    }
+    # 수정 요청 구성 (MODIFY_PAYLOAD_FORMAT=compact면 해시 참조 형식, 기본은 기존 형식)
+    modify_data = build_modify_payload(
+        user_input,
+        st.session_state.result,
+        st.session_state.get('version_history', VersionStore()),
+        st.session_state.get('form_data', {})
+    )
     
-    result = call_n8n_webhook_async(modify_data, webhook_type="modify")
+    # 생성 요청과 같이 백그라운드로 전송하고 job_id만 받음
+    job_id = call_n8n_webhook_async(modify_data, webhook_type="modify")
     
     # 진행 상태 표시 제거
     progress_placeholder.empty()
     
-    if result and result.get('status') == 'success':
-        # 수정된 결과 업데이트
-        modified_data = result['data']
-        
-        # 결과 업데이트
-        if 'modified_headline' in modified_data:
-            st.session_state.result['headline'] = modified_data['modified_headline']
-        if 'modified_caption' in modified_data:
-            st.session_state.result['caption'] = modified_data['modified_caption']
-        if 'modified_hashtags' in modified_data:
-            st.session_state.result['hashtags'] = modified_data['modified_hashtags']
-        
-        # 응답 메시지 추가
-        st.session_state.messages.append({
-            "role": "assistant", 
-            "content": "✅ 수정이 완료되었습니다."
-        })
-        
-        # 버전 기록 업데이트
-        new_version = len(st.session_state.version_history) + 1
-        st.session_state.version_history.append({
-            'version': new_version,
-            'timestamp': datetime.now().strftime("%H:%M:%S"),
-            'data': st.session_state.result.copy(),
-            'user_request': user_input,  # 이번 수정 요청 저장
-            'is_original': False  # 수정본임을 표시
-        })
+    if job_id:
+        # 결과가 도착하면 이 요청으로 수정 결과를 반영
+        st.session_state.pending_modify = user_input
         return True
     else:
         # 오류 메시지 추가
@@ -162,6 +175,41 @@ def handle_chat_input(user_input):
         })
         return False
 
+def fail_current_job(job_id, error):
+    """작업 대기 실패 처리 - 수정 요청이면 기존 결과를 유지하고 채팅에 안내"""
+    st.session_state.job_status = "failed"
+    st.session_state.get('job_deadlines', {}).pop(job_id, None)
+    if st.session_state.pop('pending_modify', None) is not None:
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": f"❌ 수정 중 오류가 발생했습니다. 다시 시도해주세요. ({error})"
+        })
+    else:
+        st.session_state.delivery_error = error
+
+def apply_modification(user_input, modified):
+    """수정 요청 결과를 현재 결과에 반영하고 새 버전으로 기록"""
+    # 수정 결과에 값이 있는 필드만 교체 (나머지는 기존 값 유지)
+    result = dict(st.session_state.result or {})
+    result.update({field: value for field, value in modified.items() if value})
+    st.session_state.result = result
+    
+    # 응답 메시지 추가
+    st.session_state.messages.append({
+        "role": "assistant", 
+        "content": "✅ 수정이 완료되었습니다."
+    })
+    
+    # 버전 기록 업데이트 (저장소가 바뀐 필드만 복사해 보관)
+    new_version = len(st.session_state.version_history) + 1
+    st.session_state.version_history.append({
+        'version': new_version,
+        'timestamp': datetime.now().strftime("%H:%M:%S"),
+        'data': result,
+        'user_request': user_input,  # 이번 수정 요청 저장
+        'is_original': False  # 수정본임을 표시
+    })
+
 def main():
     """메인 앱 함수"""
     # 페이지 설정
@@ -196,36 +244,99 @@ def main():
             st.rerun()
         
         # 상태 UI 표시
-        st.info(f"🔄 콘텐츠 생성 중입니다... 잠시만 기다려주세요. (작업 ID: {job_id[:8]}...)")
+        action = "수정" if 'pending_modify' in st.session_state else "생성"
+        st.info(f"🔄 콘텐츠 {action} 중입니다... 잠시만 기다려주세요. (작업 ID: {job_id[:8]}...)")
         
-        # 결과 확인
-        result = check_job_result(job_id)
+        # 결과 확인 - long-poll로 결과가 도착할 때까지 현재 실행 안에서 대기
+        # (페이지 새로고침 없이 대기 요청 하나로 완료를 감지)
+        delivery_placeholder = st.empty()
+        stream_placeholder = st.empty()
+        result_placeholder = st.empty()
+        stream_since = 0
+        stream_events = []
+        # 대기 기한 (새로고침/수동 확인 후에도 처음 기다리기 시작한 시각 기준)
+        deadline = st.session_state.setdefault('job_deadlines', {}).setdefault(job_id, time.time() + JOB_RESULT_TIMEOUT)
+        # 같은 입력으로 보관된 결과가 있으면 기다리지 않고 바로 사용
+        result = get_cached_result(job_id)
+        while not result:
+            # 기한이 지나면 대기열에서 빼거나 처리 중 자리를 반환하고 실패로 표시
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                cancel_job(job_id)
+                fail_current_job(job_id, f"{JOB_RESULT_TIMEOUT:.0f}초 동안 결과가 도착하지 않았습니다.")
+                st.rerun()
+            
+            # 백그라운드 웹훅 전송 상태 확인
+            delivery = get_delivery(job_id)
+            if delivery:
+                if delivery['status'] == DELIVERY_FAILED:
+                    fail_current_job(job_id, delivery.get('error') or "요청 전송에 실패했습니다.")
+                    st.rerun()
+                with delivery_placeholder:
+                    show_delivery_status(delivery)
+            
+            # 전송이 아직 접수되지 않았으면 짧게 대기해 전송 실패를 빨리 감지 (기한을 넘기지 않도록 제한)
+            accepted = not delivery or delivery['status'] == DELIVERY_ACCEPTED
+            wait_timeout = max(0.5, min(RESULT_WAIT_TIMEOUT if accepted else 2, remaining))
+            started_at = time.time()
+            
+            # 생성 중인 콘텐츠가 조각으로 도착하면 완성된 섹션/문단부터 표시
+            stream = check_job_stream(job_id, since=stream_since, wait_timeout=wait_timeout)
+            if stream is not None:
+                if stream['events']:
+                    stream_events.extend(stream['events'])
+                    stream_since = stream['next']
+                    with stream_placeholder.container():
+                        show_partial_result(stream_events)
+                if not stream['completed'] and not stream['done']:
+                    if not stream['events'] and time.time() - started_at < 1:
+                        time.sleep(1)
+                    continue
+            
+            with result_placeholder:
+                result = check_job_result(job_id, wait_timeout=wait_timeout)
+            if result:
+                break
+            # 오류로 즉시 반환된 경우 과도한 재요청 방지
+            elapsed = time.time() - started_at
+            if elapsed < 1:
+                time.sleep(1 - elapsed)
+        
+        # n8n 처리 자리 반환 (다음 대기 요청 전송) 및 같은 요청 재사용을 위해 결과 보관
+        complete_job(job_id, result)
+        st.session_state.job_deadlines.pop(job_id, None)
         
-        if result:
-            # 결과 저장 및 상태 업데이트
+        modify_request = st.session_state.pop('pending_modify', None)
+        if modify_request is not None:
+            # 수정 요청 결과는 현재 결과에 반영하고 버전 추가
+            apply_modification(modify_request, result)
+        else:
+            # 결과 저장
             st.session_state.result = result
-            st.session_state.job_status = "completed"
             
             # 버전 관리용 히스토리 추가
-            st.session_state.version_history = [{
+            st.session_state.version_history = VersionStore([{
                 'version': 1,
                 'timestamp': datetime.now().strftime("%H:%M:%S"),
-                'data': result.copy(),
+                'data': result,
                 'is_original': True
-            }]
-            
-            # 페이지 리로드
-            st.rerun()
-        else:
-            # 결과가 아직 없으면 자동 새로고침
-            st.markdown("""
-            <script>
-                // 5초 후 자동 새로고침
-                setTimeout(function() {
-                    window.location.reload();
-                }, 5000);
-            </script>
-            """, unsafe_allow_html=True)
+            }])
+        st.session_state.job_status = "completed"
+        
+        # 페이지 리로드
+        st.rerun()
+    
+    # 일괄 생성 진행 중 - 작업별 결과를 도착하는 대로 수집
+    elif st.session_state.get('job_status') == 'group_processing' and st.session_state.get('job_group'):
+        wait_job_group(st.session_state.job_group)
+    
+    # 일괄 생성 결과 표시
+    elif st.session_state.get('job_status') == 'group_completed' and st.session_state.get('job_group'):
+        show_group_results()
+        # 결과가 처음 표시된 작업들의 단계 시각 전송
+        for job in st.session_state.job_group['jobs']:
+            if job['status'] == batch.JOB_DONE:
+                report_job_timing(job['job_id'])
     
     # 임시 표시 상태 확인 (버전 미리보기)
     elif 'temp_display' in st.session_state and st.session_state.temp_display:
@@ -254,12 +365,27 @@ def main():
     else:
         # 결과가 없으면 입력 폼 표시
         if not st.session_state.get('result'):
+            # 이전 요청의 전송 실패 안내
+            if st.session_state.get('delivery_error'):
+                st.error(f"❌ 요청 처리 중 오류가 발생했습니다: {st.session_state.pop('delivery_error')}")
             form_data = show_input_form()
             if form_data:
-                if generate_content(form_data):
+                # 여러 플랫폼/연령대를 고른 경우 일괄 생성
+                variants = st.session_state.pop('batch_variants', None)
+                if variants:
+                    if generate_job_group(variants):
+                        st.rerun()
+                elif generate_content(form_data):
                     st.rerun()
         else:
             show_results()
+            # 새 결과가 처음 표시된 작업의 단계 시각 전송
+            if st.session_state.get('current_job_id'):
+                report_job_timing(st.session_state.current_job_id)
+            # 채팅으로 받은 수정 요청 전송
+            user_input = show_modify_chat()
+            if user_input and handle_chat_input(user_input):
+                st.rerun()
 
 if __name__ == "__main__":
     main()
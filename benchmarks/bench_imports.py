@@ -0,0 +1,119 @@
+"""모듈 import 시간과 결과 파싱 호출당 오버헤드 측정
+
+- import: 새 프로세스에서 모듈 하나를 import하는 데 걸린 시간 (중앙값)과 streamlit이 함께 로드되는지
+- per-call: webhook.process_llm_response / parse_blog_format 호출당 시간과 호출당 st.* 메시지 수
+  (Streamlit 앱 안에서는 st.* 호출 하나가 브라우저로 가는 메시지 하나)
+
+실행: python -m benchmarks.bench_imports [--runs 5] [--repeat 200]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:1")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.benchmark")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(ROOT, "benchmarks", "corpus", "n8n_callbacks")
+
+MODULES = [
+    "components.parser",
+    "components.job_client",
+    "components.batch_runner",
+    "components.webhook",
+    "api",
+]
+
+IMPORT_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started, "streamlit" in sys.modules)
+"""
+
+
+def measure_import(module, runs):
+    """새 프로세스에서 import 시간 (초, 중앙값)과 streamlit 로드 여부 (모듈이 없으면 None)"""
+    times = []
+    loads_streamlit = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            return None, None
+        seconds, loaded = completed.stdout.split()[-2:]
+        times.append(float(seconds))
+        loads_streamlit = loaded == "True"
+    return statistics.median(times), loads_streamlit
+
+
+def count_st_calls():
+    """st.info/success/warning/error 호출 수를 세는 래퍼 설치 (호출 수 dict 반환)"""
+    import streamlit as st
+    counts = {"calls": 0}
+    for name in ("info", "success", "warning", "error"):
+        original = getattr(st, name)
+
+        def wrapper(*args, _original=original, **kwargs):
+            counts["calls"] += 1
+            return _original(*args, **kwargs)
+
+        setattr(st, name, wrapper)
+    return counts
+
+
+def measure_call(func, payload, repeat, counts):
+    """호출당 시간 (마이크로초)과 호출당 st.* 메시지 수"""
+    func(payload)
+    counts["calls"] = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(payload)
+    elapsed = time.perf_counter() - started
+    return elapsed / repeat * 1e6, counts["calls"] / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="모듈별 import 측정 횟수")
+    parser.add_argument("--repeat", type=int, default=200, help="호출 측정 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"{'module':<26} {'import ms':>10} {'streamlit':>10}")
+    for module in MODULES:
+        seconds, loaded = measure_import(module, args.runs)
+        if seconds is None:
+            print(f"{module:<26} {'n/a':>10} {'-':>10}")
+        else:
+            print(f"{module:<26} {seconds * 1000:10.1f} {str(loaded):>10}")
+
+    # Streamlit 실행 컨텍스트 없이 호출할 때 경고 로그 제외
+    import logging
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    counts = count_st_calls()
+    from components import webhook
+
+    with open(os.path.join(CORPUS_DIR, "instagram_result.json"), encoding="utf-8") as f:
+        instagram = json.load(f)["result"]
+    with open(os.path.join(CORPUS_DIR, "blog_result.json"), encoding="utf-8") as f:
+        blog = json.load(f)["result"]
+
+    print(f"\n{'call':<38} {'us/call':>10} {'st msgs/call':>13}")
+    cases = [
+        ("process_llm_response(instagram)", webhook.process_llm_response, {"output": instagram}),
+        ("process_llm_response(blog)", webhook.process_llm_response, {"output": blog}),
+        ("parse_blog_format(blog)", webhook.parse_blog_format, blog),
+    ]
+    for name, func, payload in cases:
+        micros, messages = measure_call(func, payload, args.repeat, counts)
+        print(f"{name:<38} {micros:10.1f} {messages:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
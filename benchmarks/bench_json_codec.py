@@ -0,0 +1,67 @@
+"""n8n 콜백 페이로드 JSON 디코딩/검증 벤치마크 (코덱별 비교)
+
+corpus/n8n_callbacks/*.json 페이로드마다 다음 경로의 1회 평균 시간을 비교합니다.
+- stdlib / orjson: 디코딩만, 디코딩 + ResultNotification 검증, 응답 인코딩
+- pydantic: model_validate_json (pydantic 내장 JSON 파서로 디코딩 + 검증)
+
+실행: python -m benchmarks.bench_json_codec [--repeat 200]
+"""
+import os
+import glob
+import json
+import time
+import argparse
+from api import ResultNotification
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus", "n8n_callbacks")
+
+
+def codecs():
+    """(이름, 디코딩 함수, 인코딩 함수) 목록 - 설치된 코덱만"""
+    items = [("stdlib", json.loads, lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))]
+    if orjson is not None:
+        items.append(("orjson", orjson.loads, orjson.dumps))
+    return items
+
+
+def bench(func, repeat):
+    """repeat회 실행 후 1회 평균 시간(µs) 반환"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200, help="반복 횟수")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("ℹ️ orjson이 설치되어 있지 않아 stdlib만 측정합니다. (pip install orjson)")
+
+    print(f"{'payload':<24} {'size':>8}  {'codec':<8} {'decode':>9} {'validate':>9} {'encode':>9}  (µs)")
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.json"))):
+        with open(path, "rb") as f:
+            # 실제 요청 본문처럼 공백 없이 다시 직렬화
+            body = json.dumps(json.load(f), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        name = os.path.basename(path)
+        data = json.loads(body)
+
+        for codec, decode, encode in codecs():
+            decode_us = bench(lambda: decode(body), args.repeat)
+            validate_us = bench(lambda: ResultNotification.model_validate(decode(body)), args.repeat)
+            encode_us = bench(lambda: encode(data), args.repeat)
+            print(f"{name:<24} {len(body) / 1024:7.1f}K  {codec:<8} {decode_us:9.1f} {validate_us:9.1f} {encode_us:9.1f}")
+
+        validate_us = bench(lambda: ResultNotification.model_validate_json(body), args.repeat)
+        print(f"{name:<24} {len(body) / 1024:7.1f}K  {'pydantic':<8} {'-':>9} {validate_us:9.1f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""JSON 형태 응답 필드 추출 벤치마크 (기존 정규식 extract_field vs scan_json_fields)
+
+1. 회귀 코퍼스(corpus/json_fields.json)의 기대값과 비교
+2. 코퍼스를 무작위로 자르고 섞은 입력으로 예외가 없는지 퍼징
+3. 큰 정상/깨진 입력에서 두 방식의 시간 비교
+
+실행: python -m benchmarks.bench_json_fields [--fuzz 2000] [--size 100000] [--repeat 20]
+"""
+import os
+import re
+import json
+import time
+import random
+import argparse
+from components.parser import scan_json_fields, JSON_FIELDS
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "corpus", "json_fields.json")
+
+
+def legacy_extract(content):
+    """기존 webhook.process_llm_response의 정규식 필드 추출"""
+    def extract_field(field_name, content):
+        pattern = r'"' + field_name + r'"\s*:\s*"(.+?)(?:"|$)'
+        match = re.search(pattern, content, re.DOTALL)
+        if match:
+            return match.group(1).strip().replace('\\"', '"').replace('\\n', '\n')
+        pattern = r'"' + field_name + r'"\s*:\s*\\?\s*"?\s*(?:,|\}|$)'
+        match = re.search(pattern, content)
+        if match:
+            return ""
+        pattern = r'"' + field_name + r'"\s*:\s*([^,\}\]\"]+)'
+        match = re.search(pattern, content)
+        if match:
+            return match.group(1).strip()
+        return ""
+
+    result = {field: extract_field(field, content) for field in ('blog_title', 'blog_content', 'headline', 'caption')}
+    hashtags_array_match = re.search(r'"hashtags"\s*:\s*\[\s*((?:"[^"]*"(?:\s*,\s*)?)*)\s*\]', content, re.DOTALL)
+    if hashtags_array_match:
+        result['hashtags'] = re.findall(r'"([^"]*)"', hashtags_array_match.group(1))
+    else:
+        hashtags_match = re.search(r'"hashtags"\s*:\s*"(.+?)"', content, re.DOTALL)
+        result['hashtags'] = hashtags_match.group(1).strip().split() if hashtags_match else []
+    return result
+
+
+def as_legacy_result(expected):
+    """기대값을 기존 추출 결과 형태로 변환 (없는 필드는 빈 값, 해시태그 문자열은 분리)"""
+    result = {field: "" for field in ('blog_title', 'blog_content', 'headline', 'caption')}
+    result.update(expected)
+    hashtags = result.get('hashtags', [])
+    result['hashtags'] = hashtags.split() if isinstance(hashtags, str) else hashtags
+    return result
+
+
+def check_corpus():
+    """코퍼스 기대값과 비교 후 실패 목록 반환"""
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    failures = [case["name"] for case in corpus if scan_json_fields(case["input"]) != case["expected"]]
+    legacy_passed = sum(legacy_extract(case["input"]) == as_legacy_result(case["expected"]) for case in corpus)
+    print(f"corpus     {len(corpus) - len(failures)}/{len(corpus)} 통과 (기존 정규식: {legacy_passed}/{len(corpus)})")
+    for name in failures:
+        print(f"  ❌ {name}")
+    return corpus, failures
+
+
+def mutate(text, rng):
+    """자르기/특수문자 삽입/구간 삭제로 깨진 입력 생성"""
+    for _ in range(rng.randint(1, 4)):
+        action = rng.random()
+        pos = rng.randint(0, len(text))
+        if action < 0.3:
+            text = text[:pos]
+        elif action < 0.8:
+            text = text[:pos] + rng.choice('"\\:,[]{}\n') + text[pos:]
+        else:
+            text = text[:pos] + text[pos + rng.randint(1, 10):]
+    return text
+
+
+def fuzz(corpus, count, seed=0):
+    """무작위 변형 입력에서 예외 없이 올바른 타입을 반환하는지 확인"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = mutate(rng.choice(corpus)["input"], rng)
+        result = scan_json_fields(text)
+        assert set(result) <= set(JSON_FIELDS), text
+        for value in result.values():
+            assert isinstance(value, (str, list)), text
+    print(f"fuzz       {count}개 변형 입력 통과")
+
+
+def make_inputs(size):
+    """시간 비교용 큰 입력
+
+    - valid / unterminated: 정상 JSON과 닫히지 않은 문자열
+    - missing+ws: 필드 없이 키와 긴 공백만 반복
+    - bare+ws: 따옴표 없는 값 앞의 긴 공백 (기존 두 번째 패턴의 \\s* 세 개가 겹쳐 공백 길이의 세제곱으로 느려짐)
+    """
+    body = "천방케어로 촉촉한 피부를 만나보세요. \\\"후기\\\"도 확인해 보세요.\\n" * (size // 40)
+    valid = json.dumps({"headline": "h", "caption": body, "hashtags": ["#a", "#b"], "blog_title": "t", "blog_content": body}, ensure_ascii=False)
+    unterminated = '{"headline": "h", "caption": "' + body
+    missing = ('"note"' + ' ' * 200 + 'x ') * (size // 210) + '{"headline": "h"'
+    bare = '{"headline":' + ' ' * min(size // 200, 500) + 'x, "caption": "c"}'
+    return [("valid", valid), ("unterminated", unterminated), ("missing+ws", missing), ("bare+ws", bare)]
+
+
+def bench(func, content, repeat):
+    """repeat회 실행 후 1회 평균 시간(ms) 반환"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fuzz", type=int, default=2000, help="퍼징 입력 수")
+    parser.add_argument("--size", type=int, default=100000, help="시간 비교 입력 크기 (글자)")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수")
+    args = parser.parse_args()
+
+    corpus, failures = check_corpus()
+    fuzz(corpus, args.fuzz)
+
+    for name, content in make_inputs(args.size):
+        legacy_ms = bench(legacy_extract, content, args.repeat)
+        scan_ms = bench(scan_json_fields, content, args.repeat)
+        print(
+            f"{name:<13} {len(content) / 1024:7.1f}K chars  "
+            f"legacy {legacy_ms:8.3f}ms  scanner {scan_ms:8.3f}ms  x{legacy_ms / scan_ms:.1f}"
+        )
+
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""수정 요청 크기 비교 (legacy vs compact)
+
+인스타그램/블로그 코퍼스 결과를 --rounds 번 수정하면서 매 수정 요청의 크기를 비교합니다.
+- legacy/ascii: 기존 형식을 requests json=으로 보낼 때 (한글이 \\uXXXX로 이스케이프됨)
+- legacy/utf8: 기존 형식을 json_codec으로 보낼 때
+- compact: build_compact_payload (기본 창/상한)
+chars는 요청에 들어간 문자열 글자 수 합계로, n8n에서 LLM에 넘길 때의 토큰 수에 비례합니다.
+
+실행: python -m benchmarks.bench_modify_payload [--rounds 20]
+"""
+import os
+import json
+import argparse
+from components import json_codec
+from components.parser import normalize_llm_response
+from components.version_store import VersionStore
+from components.modify_payload import build_modify_payload
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus", "n8n_callbacks")
+CONTEXT = {"platform": "블로그", "product": "천방케어", "tone": "친근한", "keywords": "촉촉, 재생"}
+
+
+def load_result(name):
+    """코퍼스의 섹션 형식 결과를 표시용 결과로 정규화"""
+    with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+        return normalize_llm_response({"output": json.load(f)["result"]})
+
+
+def text_chars(value):
+    """값에 포함된 문자열 글자 수 합계"""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key) + text_chars(item) for key, item in value.items())
+    if isinstance(value, list):
+        return sum(text_chars(item) for item in value)
+    return 0
+
+
+def edit(result, step):
+    """수정 결과처럼 헤드라인/캡션/본문 일부를 새 값으로 교체"""
+    result['headline'] = f"수정된 헤드라인 {step}"
+    result['caption'] = f"수정 {step}: " + result['caption'][:500]
+    if result.get('blog_content'):
+        result['blog_content'] = result['blog_content'].replace("천방케어", f"천방케어({step})", 1)
+
+
+def sizes(payload):
+    """(ascii 바이트, utf8 바이트, 글자 수)"""
+    return len(json.dumps(payload).encode("utf-8")), len(json_codec.dumps(payload)), text_chars(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20, help="수정 횟수")
+    args = parser.parse_args()
+
+    for name in ("instagram_result.json", "blog_result.json"):
+        result = load_result(name)
+        history = VersionStore([{'version': 1, 'timestamp': "00:00:00", 'data': result, 'is_original': True}])
+        totals = {"legacy/ascii": 0, "legacy/utf8": 0, "compact": 0}
+        print(f"{name}  (KB per request, chars in K)")
+        print(f"{'round':>5} {'legacy/ascii':>13} {'legacy/utf8':>12} {'compact':>9} {'chars legacy':>13} {'compact':>9}")
+        for step in range(1, args.rounds + 1):
+            user_input = f"{step}번째 수정: 좀 더 친근하게 바꿔주세요"
+            legacy_ascii, legacy_utf8, legacy_chars = sizes(build_modify_payload(user_input, result, history, CONTEXT, payload_format="legacy"))
+            _, compact_utf8, compact_chars = sizes(build_modify_payload(user_input, result, history, CONTEXT, payload_format="compact"))
+            totals["legacy/ascii"] += legacy_ascii
+            totals["legacy/utf8"] += legacy_utf8
+            totals["compact"] += compact_utf8
+            if step in (1, 2, 5, 10) or step == args.rounds:
+                print(
+                    f"{step:>5} {legacy_ascii / 1024:12.1f}K {legacy_utf8 / 1024:11.1f}K {compact_utf8 / 1024:8.1f}K "
+                    f"{legacy_chars / 1000:12.1f}K {compact_chars / 1000:8.1f}K"
+                )
+
+            # 수정 결과 반영 후 새 버전 추가
+            edit(result, step)
+            history.append({'version': len(history) + 1, 'timestamp': "00:00:00", 'data': result, 'user_request': user_input})
+
+        print(
+            f"total {totals['legacy/ascii'] / 1024:12.1f}K {totals['legacy/utf8'] / 1024:11.1f}K {totals['compact'] / 1024:8.1f}K "
+            f" (x{totals['legacy/ascii'] / totals['compact']:.1f} smaller than legacy/ascii)\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
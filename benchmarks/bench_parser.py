@@ -0,0 +1,177 @@
+"""n8n 텍스트 출력 파서 벤치마크 (기존 정규식 파서 vs 단일 패스 토크나이저)
+
+먼저 무작위로 조합한 입력(--fuzz개씩)에서 두 파서의 결과가 모두 같은지 확인합니다.
+
+실행: python -m benchmarks.bench_parser [--size 50000] [--repeat 200] [--fuzz 20000]
+"""
+import re
+import sys
+import time
+import random
+import argparse
+from components.parser import parse_blog_sections, parse_instagram_sections
+
+FOOTNOTE = "※ 천방케어는 MICROJET 기술 기반의 피부 관리 프로그램입니다.\n※ 개인에 따라 효과가 다를 수 있습니다."
+
+
+def legacy_parse_blog(content):
+    """기존 webhook.parse_blog_format의 정규식 추출 (st 출력 제외)"""
+    result = {"headline": "", "caption": "", "hashtags": [], "blog_title": "", "blog_content": ""}
+    title_match = re.search(r'\[제목\]\s*\n(.*?)(?=\n\[|$)', content, re.DOTALL)
+    if title_match:
+        result["blog_title"] = title_match.group(1).strip()
+    summary_match = re.search(r'\[3줄 요약\]\s*\n(.*?)(?=\n\[본문\])', content, re.DOTALL)
+    content_match = re.search(r'\[본문\]\s*\n(.*?)(?=\n\[태그\]|------|\n\n※|$)', content, re.DOTALL)
+    parts = []
+    if summary_match:
+        parts.append(summary_match.group(1).strip())
+    if content_match:
+        parts.append(content_match.group(1).strip())
+    if not parts and not summary_match:
+        content_only_match = re.search(r'\[본문\]\s*\n(.*?)(?=------|\n\n※|$)', content, re.DOTALL)
+        if content_only_match:
+            parts.append(content_only_match.group(1).strip())
+    if parts:
+        result["blog_content"] = result["caption"] = "\n\n".join(parts)
+    tag_match = re.search(r'\[태그\]\s*\n(.*?)(?=\n\[|------|\n\n※|$)', content, re.DOTALL)
+    if tag_match:
+        tags = tag_match.group(1).strip().replace('\n', ' ').split()
+        result["hashtags"] = [tag for tag in tags if tag.strip() and tag.startswith('#')]
+    footnote_match = re.search(r'------\s*\n(※.*?)$', content, re.DOTALL)
+    if footnote_match:
+        footnote_text = footnote_match.group(1).strip()
+        if footnote_text:
+            for field in ("blog_content", "caption"):
+                if result[field] and "천방케어는 MICROJET" not in result[field]:
+                    result[field] += f"\n\n{footnote_text}"
+    return result
+
+
+def legacy_parse_instagram(content):
+    """기존 webhook.parse_instagram_format의 정규식 추출 (st 출력 제외)"""
+    result = {"headline": "", "caption": "", "hashtags": [], "blog_title": "", "blog_content": ""}
+    hook_match = re.search(r'\[후킹문구\]\s*\n(.*?)(?=\n\[|$)', content, re.DOTALL)
+    if hook_match:
+        result["headline"] = hook_match.group(1).strip()
+    caption_match = re.search(r'\[캡션\]\s*\n(.*?)(?=\n\[|------|\n\n※)', content, re.DOTALL)
+    if caption_match:
+        result["caption"] = result["blog_content"] = caption_match.group(1).strip()
+        result["blog_title"] = result["headline"]
+    footnote_match = re.search(r'------\s*\n(※.*?)$', content, re.DOTALL)
+    if footnote_match:
+        footnote_text = footnote_match.group(1).strip()
+        if footnote_text:
+            for field in ("caption", "blog_content"):
+                if result[field] and "천방케어는 MICROJET" not in result[field]:
+                    result[field] += f"\n\n{footnote_text}"
+    hashtag_match = re.search(r'\[해시태그\]\s*\n(.*?)(?=\n\[|------|\n\n※|$)', content, re.DOTALL)
+    if hashtag_match:
+        tags = hashtag_match.group(1).strip().replace('\n', ' ').split()
+        result["hashtags"] = [tag for tag in tags if tag.strip() and tag.startswith('#')]
+    return result
+
+
+def make_blog_output(size):
+    """size 글자 이상의 블로그 형식 샘플 생성"""
+    paragraph = (
+        "천방케어 후 피부결이 눈에 띄게 달라졌다는 후기가 많습니다. "
+        "시술 직후에도 일상생활이 가능하고, 관리 주기에 맞춰 꾸준히 받으면 효과가 오래 유지됩니다.\n\n"
+    )
+    body = paragraph * (size // len(paragraph) + 1)
+    return (
+        "[제목]\n피부 고민, 천방케어로 해결하세요\n\n"
+        "[3줄 요약]\n- 빠른 회복\n- 자연스러운 개선\n- 꾸준한 관리\n\n"
+        f"[본문]\n{body}\n"
+        "[태그]\n#천방케어 #피부관리 #MICROJET #뷰티\n\n"
+        f"------\n{FOOTNOTE}\n"
+    )
+
+
+def make_instagram_output(size):
+    """size 글자 이상의 인스타그램 형식 샘플 생성"""
+    line = "오늘도 천방케어로 촉촉한 피부를 만나보세요 ✨\n"
+    caption = line * (size // len(line) + 1)
+    return (
+        "[후킹문구]\n거울 볼 때마다 기분 좋아지는 피부\n\n"
+        f"[캡션]\n{caption}\n"
+        f"------\n{FOOTNOTE}\n\n"
+        "[해시태그]\n#천방케어 #피부관리 #데일리케어\n"
+    )
+
+
+# 무작위 입력 조각: 헤더(줄바꿈 유무/공백 변형), 일반 줄, [로 시작하는 다른 줄, 구분선, 각주
+FUZZ_HEADERS = ("제목", "3줄 요약", "본문", "태그", "후킹문구", "캡션", "해시태그")
+FUZZ_LINES = (
+    "천방케어 후기", "- 빠른 회복", "#천방케어 #피부관리", "[EVENT] 이번 주 한정", "[참고] 개인차 있음",
+    "------", "--------", "-----", "※ 천방케어는 MICROJET 기술 기반입니다.", "※ 개인차가 있습니다.",
+    "", "   ", "문장 [태그] 중간", "[본문]이 아닌 줄", "#해시 태그",
+)
+
+
+def fuzz_input(rng):
+    """헤더와 줄을 무작위로 섞은 n8n 출력 형태의 텍스트"""
+    pieces = []
+    for _ in range(rng.randint(0, 14)):
+        if rng.random() < 0.4:
+            gap = rng.choice(("\n", "\n\n", " \n", "\t\n  ", "", " "))
+            pieces.append(f"[{rng.choice(FUZZ_HEADERS)}]{gap}")
+        else:
+            pieces.append(rng.choice(FUZZ_LINES) + rng.choice(("\n", "\n\n", "")))
+    text = "".join(pieces)
+    return text.rstrip("\n") if rng.random() < 0.3 else text
+
+
+def check_fuzz(count, seed=0):
+    """무작위 입력에서 기존/새 파서 결과 비교 (블로그, 인스타그램 각각 다른 입력 수 반환)"""
+    rng = random.Random(seed)
+    mismatches = {"blog": [], "instagram": []}
+    for _ in range(count):
+        content = fuzz_input(rng)
+        if legacy_parse_blog(content) != parse_blog_sections(content):
+            mismatches["blog"].append(content)
+        if legacy_parse_instagram(content) != parse_instagram_sections(content):
+            mismatches["instagram"].append(content)
+    return mismatches
+
+
+def bench(func, content, repeat):
+    """repeat회 실행 후 1회 평균 시간(ms) 반환"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50000, help="샘플 본문 크기 (글자)")
+    parser.add_argument("--repeat", type=int, default=200, help="반복 횟수")
+    parser.add_argument("--fuzz", type=int, default=20000, help="결과 비교용 무작위 입력 수")
+    args = parser.parse_args()
+
+    mismatches = check_fuzz(args.fuzz)
+    for name, contents in mismatches.items():
+        print(f"{name:<10} 무작위 입력 {args.fuzz}개 중 결과 불일치 {len(contents)}개")
+        for content in contents[:3]:
+            print(f"  ❌ {content!r}")
+    if any(mismatches.values()):
+        sys.exit(1)
+
+    cases = [
+        ("blog", make_blog_output(args.size), legacy_parse_blog, parse_blog_sections),
+        ("instagram", make_instagram_output(args.size), legacy_parse_instagram, parse_instagram_sections),
+    ]
+    for name, content, legacy, tokenized in cases:
+        # 출력이 같은지 먼저 확인
+        assert legacy(content) == tokenized(content), f"{name}: 파싱 결과가 다릅니다"
+        legacy_ms = bench(legacy, content, args.repeat)
+        tokenized_ms = bench(tokenized, content, args.repeat)
+        print(
+            f"{name:<10} {len(content.encode('utf-8')) / 1024:7.1f}KB  "
+            f"legacy {legacy_ms:8.3f}ms  tokenizer {tokenized_ms:8.3f}ms  "
+            f"x{legacy_ms / tokenized_ms:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
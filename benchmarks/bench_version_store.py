@@ -0,0 +1,94 @@
+"""버전 히스토리 메모리/시간 벤치마크 (result.copy() 리스트 vs VersionStore)
+
+블로그 결과(corpus/n8n_callbacks/blog_result.json)를 --edits 번 수정하면서
+기존 방식(매번 result.copy()를 리스트에 추가)과 VersionStore의 추가 메모리, 직렬화 크기,
+추가/조회 시간을 비교합니다. 수정 시나리오:
+- chat: 현재 수정 요청처럼 헤드라인/캡션/해시태그만 새 값으로 교체
+- rewrite: 블로그 본문 전체를 조금씩 고쳐 새 문자열로 교체
+- restore: 수정 사이사이 예전 버전으로 복원
+
+실행: python -m benchmarks.bench_version_store [--edits 20]
+
+측정 예 (orjson 설치, 블로그 결과 121.5K, 20회 수정, 유지 메모리):
+    chat     list 22.7K    delta 29.9K    delta+zlib 25.1K
+    rewrite  list 991.8K   delta 998.4K   delta+zlib 77.6K
+    restore  list 694.5K   delta 700.4K   delta+zlib 125.6K
+"""
+import os
+import json
+import time
+import pickle
+import argparse
+import tracemalloc
+from components.parser import normalize_llm_response
+from components.version_store import VersionStore
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "corpus", "n8n_callbacks", "blog_result.json")
+
+
+def load_blog_result():
+    """블로그 코퍼스를 표시용 결과로 정규화"""
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return normalize_llm_response({"output": json.load(f)["result"]})
+
+
+def edit(result, scenario, step):
+    """시나리오에 맞게 결과를 제자리에서 수정 (웹훅 응답처럼 새 문자열 생성)"""
+    if scenario == "rewrite":
+        result['blog_content'] = result['blog_content'].replace("천방케어", f"천방케어({step})", 1) + f"\n수정 {step}"
+    else:
+        result['headline'] = f"수정된 헤드라인 {step}"
+        result['caption'] = f"수정 {step}: " + result['caption'][:300]
+        result['hashtags'] = [f"#태그{step}", "#천방케어"]
+
+
+def build(history, base, scenario, edits):
+    """기존 app.py/session.py와 같은 순서로 버전 추가"""
+    result = dict(base)
+    history.append({'version': 1, 'timestamp': "00:00:00", 'data': result.copy(), 'is_original': True})
+    for step in range(1, edits + 1):
+        if scenario == "restore" and step % 3 == 0:
+            result = history[step // 2 - 1]['data'].copy()
+        else:
+            edit(result, "rewrite" if scenario == "restore" else scenario, step)
+        history.append({'version': len(history) + 1, 'timestamp': "00:00:00", 'data': result.copy(), 'user_request': f"요청 {step}"})
+    return history
+
+
+def measure(factory, base, scenario, edits):
+    """(추가 메모리 KB, pickle KB, 추가 ms, 전체 조회 ms)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    history = build(factory(), base, scenario, edits)
+    append_ms = (time.perf_counter() - started) * 1000
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for index in range(len(history)):
+        history[index]
+    read_ms = (time.perf_counter() - started) * 1000
+    return retained / 1024, len(pickle.dumps(history)) / 1024, append_ms, read_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--edits", type=int, default=20, help="수정 횟수")
+    args = parser.parse_args()
+
+    base = load_blog_result()
+    print(f"blog result {len(json.dumps(base, ensure_ascii=False).encode('utf-8')) / 1024:.1f}K, {args.edits} edits")
+    print(f"{'scenario':<9} {'store':<12} {'memory':>9} {'pickle':>9} {'append':>9} {'read':>9}")
+    stores = [
+        ("list", list),
+        ("delta", lambda: VersionStore(compress=False)),
+        ("delta+zlib", lambda: VersionStore(compress=True)),
+    ]
+    for scenario in ("chat", "rewrite", "restore"):
+        for name, factory in stores:
+            memory_kb, pickle_kb, append_ms, read_ms = measure(factory, base, scenario, args.edits)
+            print(f"{scenario:<9} {name:<12} {memory_kb:8.1f}K {pickle_kb:8.1f}K {append_ms:7.2f}ms {read_ms:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
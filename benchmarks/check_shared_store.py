@@ -0,0 +1,174 @@
+"""다중 워커 결과 공유 확인 (RESULT_STORE_BACKEND=shared)
+
+공유 저장소 서버(serve_result_store)와 API 워커 프로세스 N개를 각각 다른 포트로 띄운 뒤,
+결과 알림을 워커마다 돌아가며 보내고 모든 결과를 알림을 받지 않은 다른 워커에서
+GET /api/result/{id} 와 /wait 로 읽을 수 있는지 확인합니다.
+워커마다 포트가 달라 커널의 연결 배분과 관계없이 항상 워커 간 조회를 확인합니다.
+인증 키 없이는 공유 서버와 shared 저장소가 시작되지 않는지도 확인합니다.
+
+실행: python -m benchmarks.check_shared_store [--workers 3] [--results 30]
+      python -m pytest -q benchmarks/check_shared_store.py
+"""
+import os
+import sys
+import time
+import uuid
+import socket
+import argparse
+import subprocess
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    """사용하지 않는 로컬 포트"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def base_env(**overrides):
+    """하위 프로세스 환경변수 (Supabase 설정이 없어도 api를 import할 수 있도록 기본값 추가)"""
+    env = dict(os.environ, **overrides)
+    env.setdefault("SUPABASE_URL", "http://localhost:1")
+    env.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.benchmark")
+    return env
+
+
+def wait_healthy(api_url, timeout=60):
+    """워커가 뜰 때까지 헬스체크 (워커 pid 반환, 시간 초과 시 None)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            response = requests.get(f"{api_url}/api/health", timeout=2)
+            if response.status_code == 200:
+                return response.json()["worker"]
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.1)
+    return None
+
+
+def notification(job_id):
+    """n8n 완료 알림 형식의 인스타그램 결과"""
+    return {
+        "job_id": job_id,
+        "status": "success",
+        "result_data": {"output": f"[후킹문구]\n{job_id}\n[캡션]\n캡션 {job_id}\n[해시태그]\n#바이오폭스 #천방케어"}
+    }
+
+
+def headline(response):
+    """결과 응답의 헤드라인 (결과가 없으면 None)"""
+    if response.status_code != 200:
+        return None
+    return response.json()["normalized"]["headline"]
+
+
+def check_cross_worker_reads(workers=3, results=30):
+    """워커마다 돌아가며 알림을 보내고 다른 모든 워커에서 읽기
+
+    Returns:
+        list: 실패한 조회 (종류, job_id, 조회한 워커 주소, 상태 코드)
+    """
+    env = base_env(
+        RESULT_STORE_BACKEND="shared",
+        RESULT_STORE_ADDRESS=f"127.0.0.1:{free_port()}",
+        RESULT_STORE_AUTHKEY=uuid.uuid4().hex,
+    )
+    processes = []
+    try:
+        processes.append(subprocess.Popen([sys.executable, "-m", "components.result_store"], cwd=ROOT, env=env))
+        time.sleep(1)
+        api_urls = []
+        for _ in range(workers):
+            port = free_port()
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+                 "--log-level", "warning"],
+                cwd=ROOT, env=env
+            ))
+            api_urls.append(f"http://127.0.0.1:{port}")
+
+        pids = {wait_healthy(api_url) for api_url in api_urls}
+        assert None not in pids and len(pids) == workers, f"워커 {workers}개 중 일부가 시작되지 않았습니다: {pids}"
+        print(f"🚀 워커 {workers}개 응답")
+
+        job_ids = [str(uuid.uuid4()) for _ in range(results)]
+        for index, job_id in enumerate(job_ids):
+            response = requests.post(f"{api_urls[index % workers]}/api/result", json=notification(job_id), timeout=10)
+            response.raise_for_status()
+        print(f"📮 결과 {len(job_ids)}개를 워커마다 돌아가며 전송")
+
+        failures = []
+        for index, job_id in enumerate(job_ids):
+            for offset in range(1, workers):
+                api_url = api_urls[(index + offset) % workers]
+                response = requests.get(f"{api_url}/api/result/{job_id}", timeout=10)
+                if headline(response) != job_id:
+                    failures.append(("get", job_id, api_url, response.status_code))
+                response = requests.get(f"{api_url}/api/result/{job_id}/wait", params={"timeout": 0}, timeout=10)
+                if headline(response) != job_id:
+                    failures.append(("wait", job_id, api_url, response.status_code))
+        print(f"🔍 다른 워커 조회 {len(job_ids) * (workers - 1) * 2}회 중 실패 {len(failures)}회")
+        return failures
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def check_authkey_required():
+    """인증 키 없이 공유 서버/shared 저장소가 시작되지 않는지 확인 (문제 목록 반환)"""
+    problems = []
+    env = base_env(RESULT_STORE_ADDRESS=f"127.0.0.1:{free_port()}")
+    env.pop("RESULT_STORE_AUTHKEY", None)
+    try:
+        completed = subprocess.run([sys.executable, "-m", "components.result_store"], cwd=ROOT, env=env,
+                                   capture_output=True, timeout=30)
+        if completed.returncode == 0:
+            problems.append("공유 서버가 인증 키 없이 정상 종료했습니다.")
+    except subprocess.TimeoutExpired:
+        problems.append("공유 서버가 인증 키 없이 시작되었습니다.")
+
+    completed = subprocess.run(
+        [sys.executable, "-c", "from components.result_store import create_result_store; create_result_store('shared')"],
+        cwd=ROOT, env=env, capture_output=True, timeout=30
+    )
+    if completed.returncode == 0:
+        problems.append("shared 저장소가 인증 키 없이 생성되었습니다.")
+    return problems
+
+
+def test_cross_worker_reads():
+    failures = check_cross_worker_reads()
+    assert not failures, failures[:10]
+
+
+def test_authkey_required():
+    problems = check_authkey_required()
+    assert not problems, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=3, help="API 워커 프로세스 수 (2 이상)")
+    parser.add_argument("--results", type=int, default=30, help="보낼 결과 수")
+    args = parser.parse_args()
+
+    failures = check_cross_worker_reads(max(2, args.workers), args.results)
+    for kind, job_id, api_url, status in failures[:10]:
+        print(f"  ❌ {kind} {job_id[:8]}... @ {api_url} -> {status}")
+    problems = check_authkey_required()
+    for problem in problems:
+        print(f"  ❌ {problem}")
+
+    if failures or problems:
+        sys.exit(1)
+    print("✅ 모든 워커에서 다른 워커가 받은 결과를 읽었고, 인증 키 없이는 공유 저장소가 시작되지 않습니다.")
+
+
+if __name__ == "__main__":
+    main()
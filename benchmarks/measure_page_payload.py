@@ -0,0 +1,81 @@
+"""재실행당 페이지 페이로드 크기 측정 (정적 에셋 inline vs component)
+
+init_page + show_results(인스타그램/블로그 결과)를 AppTest로 실행하고,
+첫 실행과 이후 재실행에서 브라우저로 보내는 delta 메시지(ForwardMsg) 크기의 합을 비교합니다.
+(Streamlit 1.28 AppTest는 st.container를 요소 트리로 만들지 못해 트리 대신 메시지를 직접 집계)
+
+실행: python -m benchmarks.measure_page_payload [--reruns 5]
+"""
+import os
+import json
+import argparse
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:1")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.benchmark")
+
+from streamlit.testing.v1 import AppTest, local_script_runner
+from streamlit.testing.v1.element_tree import ElementTree
+from components import ui
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus", "n8n_callbacks")
+
+
+def results_page():
+    """측정 대상 페이지 (AppTest가 스크립트로 실행)"""
+    from components.ui import init_page, show_results
+    init_page()
+    show_results()
+
+
+def load_result(name):
+    """n8n 콜백 코퍼스의 섹션 형식 결과를 표시용 결과로 정규화"""
+    from components.parser import normalize_llm_response
+    with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+        notification = json.load(f)
+    return normalize_llm_response({"output": notification["result"]})
+
+
+# 실행마다 전송된 delta 메시지 크기 합계
+run_bytes = []
+
+
+def record_messages(messages):
+    """요소 트리 대신 delta 메시지 크기를 기록"""
+    run_bytes.append(sum(msg.ByteSize() for msg in messages if msg.HasField("delta")))
+    return ElementTree()
+
+
+def measure(mode, platform, result, reruns):
+    """(첫 실행 바이트, 재실행 평균 바이트) 반환"""
+    ui.PAGE_ASSETS_MODE = mode
+    run_bytes.clear()
+    at = AppTest.from_function(results_page, default_timeout=30)
+    at.session_state.result = result
+    at.session_state.form_data = {"platform": platform}
+    for _ in range(reruns + 1):
+        at.run()
+    return run_bytes[0], sum(run_bytes[1:]) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reruns", type=int, default=5, help="재실행 횟수")
+    args = parser.parse_args()
+    local_script_runner.parse_tree_from_messages = record_messages
+
+    pages = [
+        ("인스타그램", load_result("instagram_result.json")),
+        ("블로그", load_result("blog_result.json")),
+    ]
+    print(f"CSS {len(ui.PAGE_CSS.encode('utf-8'))} bytes (버전 {ui.PAGE_CSS_VERSION})")
+    print(f"{'page':<8} {'mode':<10} {'first':>9} {'rerun':>9}  (bytes)")
+    for platform, result in pages:
+        rows = {mode: measure(mode, platform, result, args.reruns) for mode in ("inline", "component")}
+        for mode, (first, rerun) in rows.items():
+            print(f"{platform:<8} {mode:<10} {first:9.0f} {rerun:9.0f}")
+        saved = rows["inline"][1] - rows["component"][1]
+        print(f"{platform:<8} 재실행당 {saved:.0f} bytes 감소 ({saved / rows['inline'][1]:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,23 @@
+import os
+import io
+import csv
 import streamlit as st
 import streamlit_shadcn_ui as ui
+import pandas as pd
 from components.auth import supabase_client, is_admin, logout
+from components.dispatcher import get_queue_stats
+from components.job_cache import get_cache_stats
+from components.http_client import get_http_stats
+
+# 목록 페이지 크기 / 캐시 유효 시간 (초)
+ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", "50"))
+ADMIN_LIST_CACHE_TTL = float(os.getenv("ADMIN_LIST_CACHE_TTL", "300"))
+
+# 일괄 등록 시 한 번에 upsert할 행 수
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "500"))
+
+# 일괄 등록/내보내기 파일 컬럼
+EMAIL_FILE_COLUMNS = ['email', 'name', 'shop']
 
 def admin_page():
     """관리자 페이지"""
@@ -33,54 +50,188 @@ def admin_page():
     # 새 이메일 추가 섹션
     add_email_section()
     
+    st.markdown("---")
+    
+    # 일괄 등록 / 내보내기 섹션
+    bulk_email_section()
+    
+    st.markdown("---")
+    
+    # 생성 요청 대기열/재사용 현황
+    generation_stats_section()
+    
+def generation_stats_section():
+    """생성 요청 대기열, 같은 입력 결과 재사용, HTTP 연결 재사용 현황 (이 앱 프로세스 기준)"""
+    st.header("📊 생성 요청 현황")
+    
+    queue = get_queue_stats()
+    cache = get_cache_stats()
+    http = get_http_stats()
+    avg_seconds = queue['avg_job_seconds']
+    
+    cols = st.columns(4)
+    with cols[0]:
+        ui.metric_card(
+            title="처리 중",
+            content=f"{queue['in_flight']} / {queue['max_in_flight']}",
+            description=f"대기 {queue['queued']}건 (사용자 {queue['users']}명)",
+            key="stats_in_flight"
+        )
+    with cols[1]:
+        ui.metric_card(
+            title="평균 소요 시간",
+            content=f"{avg_seconds:.0f}초" if avg_seconds else "-",
+            description="n8n 전송부터 결과 도착까지",
+            key="stats_avg_job"
+        )
+    with cols[2]:
+        ui.metric_card(
+            title="결과 재사용률",
+            content=f"{cache['hit_rate']:.0%}",
+            description=f"재사용 {cache['hits']} · 합류 {cache['coalesced']} · 신규 {cache['misses']}",
+            key="stats_cache_hit_rate"
+        )
+    with cols[3]:
+        ui.metric_card(
+            title="보관 중인 요청",
+            content=f"{cache['entries']}건",
+            description=f"진행 중 {cache['running']} · 재사용 안 함 {cache['bypassed']}",
+            key="stats_cache_entries"
+        )
+    
+    # n8n/결과 API 요청의 연결 재사용 (새 연결이 늘어나면 연결 풀 크기 부족)
+    cols = st.columns(4)
+    with cols[0]:
+        ui.metric_card(
+            title="연결 재사용률",
+            content=f"{http['reuse_ratio']:.0%}",
+            description=f"재사용 {http['reused_connections']} · 새 연결 {http['new_connections']}",
+            key="stats_http_reuse"
+        )
+    with cols[1]:
+        ui.metric_card(
+            title="HTTP 요청",
+            content=f"{http['requests']}건",
+            description=f"재시도 {http['retries']} · 실패 {http['failures']}",
+            key="stats_http_requests"
+        )
+
+def _quote(value):
+    """PostgREST 논리 필터 값 인용 (쉼표/괄호 등 예약 문자 보호)"""
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+def _build_list_query(columns, search=None, cursor=None, count=None):
+    """allowed_emails 목록 조회 쿼리 구성 (검색/키셋 커서 조건을 서버에서 처리)"""
+    query = supabase_client.table('allowed_emails').select(columns, count=count)
+    
+    conditions = []
+    if search:
+        pattern = _quote(f"*{search}*")
+        conditions.append(f"or(email.ilike.{pattern},name.ilike.{pattern},shop.ilike.{pattern})")
+    if cursor:
+        # (created_at, id) 기준 키셋 페이지네이션 - 일괄 등록으로 created_at이 같아도 누락 없음
+        created_at, last_id = cursor
+        conditions.append(
+            f"or(created_at.gt.{_quote(created_at)},"
+            f"and(created_at.eq.{_quote(created_at)},id.gt.{_quote(last_id)}))"
+        )
+    if conditions:
+        query.params = query.params.add('and', f"({','.join(conditions)})")
+    return query
+
+@st.cache_data(ttl=ADMIN_LIST_CACHE_TTL, show_spinner=False)
+def load_allowed_emails_page(search=None, cursor=None, page_size=ADMIN_PAGE_SIZE):
+    """허용된 이메일 한 페이지 조회 (add_email/delete_email 시 캐시 초기화)
+    
+    Returns:
+        dict: rows(현재 페이지), next_cursor(다음 페이지 커서 또는 None)
+    """
+    query = _build_list_query('id,email,name,shop,created_at', search=search, cursor=cursor)
+    # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+    response = query.order('created_at,id').limit(page_size + 1).execute()
+    rows = response.data or []
+    
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+    return {"rows": rows, "next_cursor": next_cursor}
+
+def clear_allowed_emails_cache():
+    """이메일 목록/개수 캐시 초기화 (목록 변경 후 호출)"""
+    load_allowed_emails_page.clear()
+    get_allowed_emails_count.clear()
+
 def display_allowed_emails():
-    """허용된 이메일 목록 표시"""
+    """허용된 이메일 목록 표시 (검색 + 키셋 페이지네이션)"""
     try:
-        # Supabase MCP를 통해 허용된 이메일 목록 가져오기
-        response = supabase_client.table('allowed_emails').select('*').order('created_at').execute()
+        st.subheader("현재 허용된 이메일 목록")
         
-        if response.data:
-            st.subheader("현재 허용된 이메일 목록")
-            
-            # 헤더 표시
-            col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 1.5, 1])
-            with col1:
-                st.markdown("**📧 이메일**")
-            with col2:
-                st.markdown("**👤 이름**")
-            with col3:
-                st.markdown("**🏪 샵**")
-            with col4:
-                st.markdown("**📅 등록일**")
-            with col5:
-                st.markdown("**🗑️ 삭제**")
-            
-            st.markdown("---")
-            
-            # 데이터 표시
-            for i, email_record in enumerate(response.data):
-                col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 1.5, 1])
-                
-                with col1:
-                    st.text(email_record['email'])
-                
-                with col2:
-                    name = email_record.get('name', '') or '-'
-                    st.text(name)
-                
-                with col3:
-                    shop = email_record.get('shop', '') or '-'
-                    st.text(shop)
-                
-                with col4:
-                    st.text(email_record['created_at'][:10])  # 날짜만 표시
-                
-                with col5:
-                    if ui.button("삭제", key=f"delete_{email_record['id']}"):
-                        delete_email(email_record['id'], email_record['email'], 
-                                   email_record.get('name'), email_record.get('shop'))
-        else:
-            st.info("현재 허용된 이메일이 없습니다.")
+        # 검색 (이메일/이름/샵명)
+        search = ui.input(placeholder="이메일, 이름, 샵명 검색", key="admin_email_search")
+        search = (search or "").strip()
+        
+        # 검색어가 바뀌면 첫 페이지로
+        if st.session_state.get('admin_email_search_applied') != search:
+            st.session_state.admin_email_search_applied = search
+            st.session_state.admin_email_cursors = [None]
+        cursors = st.session_state.setdefault('admin_email_cursors', [None])
+        
+        total = get_allowed_emails_count(search or None)
+        page = load_allowed_emails_page(search or None, cursors[-1])
+        rows = page['rows']
+        
+        if not rows:
+            if search:
+                st.info("검색 결과가 없습니다.")
+            else:
+                st.info("현재 허용된 이메일이 없습니다.")
+            return
+        
+        start = (len(cursors) - 1) * ADMIN_PAGE_SIZE
+        st.caption(f"총 {total}개 중 {start + 1}-{start + len(rows)}번째")
+        
+        # 현재 페이지만 표 하나로 표시
+        table_data = pd.DataFrame([
+            {
+                "📧 이메일": record['email'],
+                "👤 이름": record.get('name') or '-',
+                "🏪 샵": record.get('shop') or '-',
+                "📅 등록일": (record.get('created_at') or '')[:10]  # 날짜만 표시
+            }
+            for record in rows
+        ])
+        ui.table(data=table_data, maxHeight=600, key="allowed_emails_table")
+        
+        # 페이지 이동
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            if len(cursors) > 1 and ui.button("◀ 이전", key="admin_prev_page"):
+                cursors.pop()
+                st.rerun()
+        with next_col:
+            if page['next_cursor'] and ui.button("다음 ▶", key="admin_next_page"):
+                cursors.append(page['next_cursor'])
+                st.rerun()
+        
+        # 삭제
+        records_by_label = {
+            f"{record['email']} ({record.get('name') or '-'} / {record.get('shop') or '-'})": record
+            for record in rows
+        }
+        del_col1, del_col2 = st.columns([4, 1])
+        with del_col1:
+            selected = st.selectbox(
+                "삭제할 이메일",
+                options=list(records_by_label.keys()),
+                key="admin_delete_select",
+                label_visibility="collapsed"
+            )
+        with del_col2:
+            if ui.button("🗑️ 삭제", key="admin_delete_btn") and selected:
+                record = records_by_label[selected]
+                delete_email(record['id'], record['email'], record.get('name'), record.get('shop'))
             
     except Exception as e:
         st.error(f"이메일 목록을 불러오는 중 오류가 발생했습니다: {str(e)}")
@@ -123,6 +274,176 @@ def add_email_section():
                 else:
                     st.error("이메일을 입력해주세요.")
 
+def bulk_email_section():
+    """CSV/XLSX 일괄 등록 및 CSV 내보내기 섹션"""
+    st.subheader("일괄 등록 / 내보내기")
+    
+    with ui.card(key="bulk_email_card"):
+        st.markdown("**📥 일괄 등록** - `email`, `name`(선택), `shop`(선택) 컬럼이 있는 CSV 또는 XLSX 파일")
+        uploaded_file = st.file_uploader(
+            "이메일 파일 업로드",
+            type=["csv", "xlsx"],
+            key="bulk_email_upload",
+            label_visibility="collapsed"
+        )
+        
+        if uploaded_file is not None:
+            try:
+                rows = read_email_file(uploaded_file)
+            except Exception as e:
+                st.error(f"파일을 읽는 중 오류가 발생했습니다: {str(e)}")
+                rows = None
+            
+            if rows is not None:
+                valid_rows, results = validate_email_rows(rows)
+                st.caption(f"전체 {len(rows)}행 중 등록 가능 {len(valid_rows)}행")
+                
+                if ui.button("일괄 등록", key="bulk_import_btn"):
+                    if valid_rows:
+                        results += bulk_upsert_emails(valid_rows)
+                        clear_allowed_emails_cache()
+                    show_bulk_results(results)
+        
+        st.markdown("**📤 내보내기** - 허용된 이메일 전체를 CSV로 저장 (감사용)")
+        if ui.button("CSV 만들기", key="export_emails_btn"):
+            try:
+                st.download_button(
+                    label="📄 CSV 다운로드",
+                    data=export_allowed_emails_csv(),
+                    file_name="allowed_emails.csv",
+                    mime="text/csv",
+                    key="export_emails_download"
+                )
+            except Exception as e:
+                st.error(f"내보내기 중 오류가 발생했습니다: {str(e)}")
+
+def read_email_file(uploaded_file):
+    """업로드된 CSV/XLSX 파일을 행 목록으로 변환
+    
+    Returns:
+        list: 파일 순서대로 {'row', 'email', 'name', 'shop'} 딕셔너리
+    """
+    if uploaded_file.name.lower().endswith('.xlsx'):
+        df = pd.read_excel(uploaded_file, dtype=str)
+    else:
+        df = pd.read_csv(uploaded_file, dtype=str, encoding='utf-8-sig')
+    
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    if 'email' not in df.columns:
+        raise ValueError("email 컬럼이 없습니다.")
+    
+    df = df.reindex(columns=EMAIL_FILE_COLUMNS).fillna('')
+    return [
+        {'row': index + 2, **record}  # 헤더 다음 줄부터 1행
+        for index, record in enumerate(df.to_dict('records'))
+    ]
+
+def validate_email_rows(rows):
+    """이메일 형식 검증 및 파일 내 중복 제거 (서버 요청 없이 로컬 처리)
+    
+    Returns:
+        tuple: (등록할 행 목록, 제외된 행의 결과 목록)
+    """
+    valid_rows = []
+    results = []
+    seen = set()
+    
+    for row in rows:
+        email = str(row.get('email') or '').lower().strip()
+        if not email or '@' not in email or '.' not in email.split('@')[1]:
+            results.append({'row': row['row'], 'email': email, 'result': '❌ 형식 오류'})
+            continue
+        if email in seen:
+            results.append({'row': row['row'], 'email': email, 'result': '⏭️ 파일 내 중복'})
+            continue
+        seen.add(email)
+        
+        record = {'row': row['row'], 'email': email}
+        for field in ('name', 'shop'):
+            value = str(row.get(field) or '').strip()
+            if value:
+                record[field] = value
+        valid_rows.append(record)
+    
+    return valid_rows, results
+
+def bulk_upsert_emails(rows, chunk_size=BULK_IMPORT_CHUNK_SIZE):
+    """이메일을 묶음 단위로 upsert (email 기준) 후 행별 결과 반환"""
+    results = []
+    
+    # PostgREST 일괄 upsert는 모든 행의 컬럼이 같아야 하므로 컬럼 구성별로 묶음
+    # (비어 있는 name/shop으로 기존 값을 덮어쓰지 않도록)
+    groups = {}
+    for row in rows:
+        columns = tuple(field for field in EMAIL_FILE_COLUMNS if field in row)
+        groups.setdefault(columns, []).append(row)
+    
+    for group_rows in groups.values():
+        for start in range(0, len(group_rows), chunk_size):
+            chunk = group_rows[start:start + chunk_size]
+            emails = [row['email'] for row in chunk]
+            try:
+                existing_response = supabase_client.table('allowed_emails').select('email').in_('email', emails).execute()
+                existing = {record['email'] for record in existing_response.data or []}
+                
+                payload = [{key: value for key, value in row.items() if key != 'row'} for row in chunk]
+                supabase_client.table('allowed_emails').upsert(payload, on_conflict='email').execute()
+                
+                for row in chunk:
+                    status = '🔄 갱신' if row['email'] in existing else '✅ 추가'
+                    results.append({'row': row['row'], 'email': row['email'], 'result': status})
+            except Exception as e:
+                for row in chunk:
+                    results.append({'row': row['row'], 'email': row['email'], 'result': f"❌ 오류: {str(e)}"})
+    
+    return results
+
+def show_bulk_results(results):
+    """일괄 등록 행별 결과 표시"""
+    results = sorted(results, key=lambda item: item['row'])
+    summary = {}
+    for item in results:
+        label = item['result'].split(':')[0]
+        summary[label] = summary.get(label, 0) + 1
+    st.success(" / ".join(f"{label} {count}건" for label, count in summary.items()))
+    
+    ui.table(
+        data=pd.DataFrame([
+            {"행": item['row'], "📧 이메일": item['email'], "결과": item['result']}
+            for item in results
+        ]),
+        maxHeight=400,
+        key="bulk_results_table"
+    )
+
+def iter_allowed_emails_csv(page_size=1000):
+    """허용된 이메일 전체를 키셋 페이지 단위로 읽어 CSV 조각으로 생성"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EMAIL_FILE_COLUMNS + ['created_at'])
+    yield buffer.getvalue()
+    
+    cursor = None
+    while True:
+        query = _build_list_query('id,email,name,shop,created_at', cursor=cursor)
+        rows = query.order('created_at,id').limit(page_size).execute().data or []
+        if not rows:
+            break
+        
+        buffer.seek(0)
+        buffer.truncate()
+        for record in rows:
+            writer.writerow([record.get(column) or '' for column in EMAIL_FILE_COLUMNS + ['created_at']])
+        yield buffer.getvalue()
+        
+        if len(rows) < page_size:
+            break
+        cursor = (rows[-1]['created_at'], rows[-1]['id'])
+
+def export_allowed_emails_csv():
+    """허용된 이메일 CSV (엑셀 호환 UTF-8 BOM 포함)"""
+    return ('\ufeff' + ''.join(iter_allowed_emails_csv())).encode('utf-8')
+
 def add_email(email, name=None, shop=None):
     """새 이메일 추가"""
     try:
@@ -155,6 +476,7 @@ def add_email(email, name=None, shop=None):
                 success_msg += f" (샵: {shop.strip()})"
             
             st.success(success_msg)
+            clear_allowed_emails_cache()
             # 입력 필드 초기화를 위해 페이지 새로고침
             st.rerun()
         else:
@@ -182,6 +504,7 @@ def delete_email(email_id, email, name=None, shop=None):
                 success_msg += f" (샵: {shop})"
             
             st.success(success_msg)
+            clear_allowed_emails_cache()
             st.rerun()
         else:
             st.error("이메일 삭제에 실패했습니다.")
@@ -189,10 +512,11 @@ def delete_email(email_id, email, name=None, shop=None):
     except Exception as e:
         st.error(f"이메일 삭제 중 오류가 발생했습니다: {str(e)}")
 
-def get_allowed_emails_count():
-    """허용된 이메일 개수 반환"""
+@st.cache_data(ttl=ADMIN_LIST_CACHE_TTL, show_spinner=False)
+def get_allowed_emails_count(search=None):
+    """허용된 이메일 개수 반환 (서버 측 count, 행 데이터는 받지 않음)"""
     try:
-        response = supabase_client.table('allowed_emails').select('id').execute()
-        return len(response.data) if response.data else 0
+        response = _build_list_query('id', search=search, count='exact').limit(1).execute()
+        return response.count or 0
     except:
         return 0
\ No newline at end of file
@@ -1,17 +1,18 @@
 import streamlit as st
 import streamlit_shadcn_ui as ui
-import supabase
-import os
-from dotenv import load_dotenv
+from components.supabase_client import get_supabase_client
+from components.token_validator import TokenValidator, SUPABASE_JWT_SECRET
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+# Supabase 인증 클라이언트 (작업 상태 조회 클라이언트와 분리)
+supabase_client = get_supabase_client()
 
-# Supabase 클라이언트 설정
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+def fetch_user(token):
+    """Supabase에서 토큰의 사용자 조회 (네트워크 검증)"""
+    response = supabase_client.auth.get_user(token)
+    return response.user if response else None
 
-supabase_client = supabase.create_client(SUPABASE_URL, SUPABASE_KEY)
+# 토큰 검증기 (로컬 JWT 검증 + 토큰별 캐시, 필요할 때만 네트워크 확인)
+token_validator = TokenValidator(fetch_user, secret=SUPABASE_JWT_SECRET)
 
 def init_auth_session():
     """세션 상태 초기화 및 자동 로그인 복원"""
@@ -38,6 +39,12 @@ def init_auth_session():
         session = supabase_client.auth.get_session()
         
         if session and session.access_token:
+            # 이미 같은 토큰으로 인증된 상태면 사용자 재조회 생략 (캐시/로컬 검증)
+            if (st.session_state.authenticated
+                    and st.session_state.token == session.access_token
+                    and token_validator.validate(session.access_token)):
+                return
+            
             # 세션이 있으면 사용자 정보 가져오기
             try:
                 user_response = supabase_client.auth.get_user(session.access_token)
@@ -116,6 +123,7 @@ def logout():
     """로그아웃 처리"""
     try:
         supabase_client.auth.sign_out()
+        token_validator.invalidate(st.session_state.get('token'))
         st.session_state.user = None
         st.session_state.token = None
         st.session_state.authenticated = False
@@ -132,16 +140,13 @@ def is_authenticated():
     """인증 상태 확인"""
     # 세션에서 토큰이 있는지 확인
     if st.session_state.authenticated and st.session_state.token:
-        try:
-            # 토큰 유효성 검증
-            response = supabase_client.auth.get_user(st.session_state.token)
-            if response.user:
-                return True
-        except:
-            # 토큰이 유효하지 않으면 인증 상태 초기화
-            st.session_state.authenticated = False
-            st.session_state.user = None
-            st.session_state.token = None
+        # 토큰 유효성 검증 (캐시/로컬 검증 우선)
+        if token_validator.validate(st.session_state.token):
+            return True
+        # 토큰이 유효하지 않으면 인증 상태 초기화
+        st.session_state.authenticated = False
+        st.session_state.user = None
+        st.session_state.token = None
     return False
 
 def is_admin():
@@ -0,0 +1,79 @@
+import os
+import uuid
+import time
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# 한 번에 만들 수 있는 최대 작업 수
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "12"))
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def variant_label(form_data):
+    """작업 구분용 이름 (예: 블로그(후기형V1) · 30대)"""
+    platform = form_data.get('platform', '')
+    if form_data.get('blog_type'):
+        platform = f"{platform}({form_data['blog_type']})"
+    return f"{platform} · {form_data.get('age', '')}"
+
+
+def expand_batch(form_data, targets, age_groups):
+    """하나의 입력을 (플랫폼, 블로그 유형) x 연령대 조합의 작업들로 펼침
+
+    Args:
+        form_data (dict): 기본 폼 데이터 (공통 입력)
+        targets (list): (플랫폼, 블로그 유형 또는 None) 목록
+        age_groups (list): 연령대 목록
+
+    Returns:
+        list: 중복을 뺀 작업별 폼 데이터 (최대 BATCH_MAX_JOBS개)
+    """
+    variants = []
+    seen = set()
+    for platform, blog_type in targets:
+        for age in age_groups:
+            variant = {key: value for key, value in form_data.items() if key != 'blog_type'}
+            variant.update(platform=platform, age=age)
+            if platform == "블로그" and blog_type:
+                variant["blog_type"] = blog_type
+            key = (platform, variant.get("blog_type"), age)
+            if key not in seen:
+                seen.add(key)
+                variants.append(variant)
+    return variants[:BATCH_MAX_JOBS]
+
+
+def new_job_group(variants):
+    """작업 묶음 생성 (세션 상태에 그대로 보관)"""
+    return {
+        "group_id": str(uuid.uuid4()),
+        "created_at": time.time(),
+        "jobs": [
+            {
+                "label": variant_label(variant),
+                "form_data": variant,
+                "job_id": None,
+                "status": JOB_PENDING,
+                "result": None,
+                "error": None,
+            }
+            for variant in variants
+        ],
+    }
+
+
+def pending_jobs(group):
+    """아직 결과를 기다리는 작업 목록"""
+    return [job for job in group["jobs"] if job["status"] == JOB_PENDING]
+
+
+def group_progress(group):
+    """(끝난 작업 수, 전체 작업 수)"""
+    jobs = group["jobs"]
+    return sum(1 for job in jobs if job["status"] != JOB_PENDING), len(jobs)
@@ -0,0 +1,264 @@
+"""브라우저 없이 콘텐츠를 대량 생성하는 배치 실행기
+
+CSV/JSONL 파일의 입력(폼 데이터)을 n8n에 동시 처리 한도 안에서 전송하고,
+결과 API(/api/results/wait)로 완료를 기다려 정규화한 결과를 JSONL로 한 줄씩 기록합니다.
+Streamlit 세션 상태를 사용하지 않으므로 야간 작업 등에서 그대로 실행할 수 있습니다.
+n8n 완료 알림을 받는 API 서버(api.py)가 실행 중이어야 합니다.
+
+실행: python -m components.batch_runner briefs.csv -o results.jsonl [--concurrency 8] [--ages 20대,30대] [--targets 인스타그램,블로그:후기형V1] [--resume]
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+import requests
+from datetime import datetime
+from dotenv import load_dotenv
+from components import dispatcher, json_codec, batch
+from components.job_client import RESULT_WAIT_TIMEOUT, result_from_record, wait_results
+
+# 환경변수 로드
+load_dotenv()
+
+# 결과 API가 한 번에 기다려 주는 최대 작업 수 (api.py와 같은 설정)
+RESULT_WAIT_MAX_JOB_IDS = int(os.getenv("RESULT_WAIT_MAX_JOB_IDS", "50"))
+
+# 동시에 처리할 작업 수 / 작업당 최대 대기 시간 (초)
+BATCH_RUNNER_CONCURRENCY = int(os.getenv("BATCH_RUNNER_CONCURRENCY", str(dispatcher.DISPATCH_MAX_IN_FLIGHT)))
+BATCH_RUNNER_JOB_TIMEOUT = float(os.getenv("BATCH_RUNNER_JOB_TIMEOUT", str(dispatcher.DISPATCH_IN_FLIGHT_TIMEOUT)))
+
+# 대기열 공정 배분에 쓰는 사용자 식별자
+BATCH_RUNNER_USER = "batch-runner"
+
+# 입력 파일에서 폼 데이터로 쓰는 항목 (나머지는 무시, id는 결과에 그대로 기록)
+BRIEF_FIELDS = ("platform", "age", "gender", "concern", "message", "phone", "region", "shop_name", "blog_type")
+
+
+def load_briefs(path):
+    """CSV(머리글 행 필요) 또는 JSONL 파일에서 입력 목록 읽기
+
+    JSONL 한 줄은 폼 데이터 자체이거나 {"id": ..., "data": {...}} 형식입니다.
+
+    Returns:
+        list: {"id", "form_data"} 목록
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [json_codec.loads(line) for line in f if line.strip()]
+
+    briefs = []
+    for index, row in enumerate(rows, start=1):
+        data = row.get("data") if isinstance(row.get("data"), dict) else row
+        form_data = {key: str(data[key]).strip() for key in BRIEF_FIELDS if data.get(key) not in (None, "")}
+        form_data.setdefault("platform", "인스타그램")
+        if form_data["platform"] != "블로그":
+            form_data.pop("blog_type", None)
+        briefs.append({"id": row.get("id") or str(index), "form_data": form_data})
+    return briefs
+
+
+def parse_targets(text):
+    """--targets 값 (예: 인스타그램,블로그:후기형V1)을 (플랫폼, 블로그 유형) 목록으로 변환"""
+    targets = []
+    for item in text.split(","):
+        platform, _, blog_type = item.strip().partition(":")
+        if platform:
+            targets.append((platform, blog_type or None))
+    return targets
+
+
+def expand_briefs(briefs, targets=None, age_groups=None):
+    """입력마다 플랫폼/연령대 조합을 펼침 (batch.expand_batch와 같은 규칙, 입력별 최대 BATCH_MAX_JOBS개)"""
+    if not targets and not age_groups:
+        return briefs
+    expanded = []
+    for brief in briefs:
+        form_data = brief["form_data"]
+        variants = batch.expand_batch(
+            form_data,
+            targets or [(form_data["platform"], form_data.get("blog_type"))],
+            age_groups or [form_data.get("age", "")]
+        )
+        for variant in variants:
+            expanded.append({"id": f"{brief['id']}:{batch.variant_label(variant)}", "form_data": variant})
+    return expanded
+
+
+def completed_ids(path):
+    """이전 실행에서 성공한 입력 id (--resume)"""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json_codec.loads(line)
+            except ValueError:
+                # 중단되며 잘린 마지막 줄
+                continue
+            if row.get("status") == batch.JOB_DONE:
+                done.add(row.get("id"))
+    return done
+
+
+def run_batch(briefs, output, concurrency=None, job_timeout=None, webhook_url=None, on_result=None):
+    """입력 목록을 동시 처리 한도 안에서 생성하고 결과를 완료 순서대로 JSONL에 기록
+
+    Args:
+        briefs (list): load_briefs/expand_briefs 결과 ({"id", "form_data"})
+        output (file): 결과를 쓸 바이너리 파일 객체 (한 줄에 하나, 줄마다 flush)
+        concurrency (int): 동시에 기다리는 작업 수 (없으면 BATCH_RUNNER_CONCURRENCY)
+        job_timeout (float): 작업당 최대 대기 시간 (초, 없으면 BATCH_RUNNER_JOB_TIMEOUT)
+        webhook_url (str): n8n 웹훅 URL (없으면 N8N_WEBHOOK_URL)
+        on_result (callable): 결과 한 줄(dict)마다 호출
+
+    Returns:
+        dict: {"total", "done", "failed", "elapsed"}
+    """
+    concurrency = max(1, min(concurrency or BATCH_RUNNER_CONCURRENCY, RESULT_WAIT_MAX_JOB_IDS))
+    job_timeout = job_timeout or BATCH_RUNNER_JOB_TIMEOUT
+    webhook_url = webhook_url or os.getenv("N8N_WEBHOOK_URL")
+    if not webhook_url:
+        raise ValueError("웹훅 URL이 설정되지 않았습니다. (N8N_WEBHOOK_URL)")
+
+    started_at = time.time()
+    backlog = list(reversed(briefs))
+    # job_id -> {"brief", "started_at"}
+    active = {}
+    summary = {"total": len(briefs), "done": 0, "failed": 0}
+
+    def emit(job_id, brief, status, result=None, error=None):
+        row = {
+            "id": brief["id"],
+            "label": batch.variant_label(brief["form_data"]),
+            "job_id": job_id,
+            "status": status,
+            "form_data": brief["form_data"],
+            "result": result,
+            "error": error,
+            "elapsed": round(time.time() - active.pop(job_id)["started_at"], 1),
+            "finished_at": datetime.now().isoformat(),
+        }
+        output.write(json_codec.dumps(row) + b"\n")
+        output.flush()
+        summary[status] += 1
+        icon = "✅" if status == batch.JOB_DONE else "❌"
+        print(f"{icon} [{summary['done'] + summary['failed']}/{summary['total']}] {row['label']} ({row['id']}) {error or ''}")
+        if on_result:
+            on_result(row)
+
+    while backlog or active:
+        # 빈 자리만큼 전송 (대기열 한도는 동시 처리 수만큼만 사용)
+        while backlog and len(active) < concurrency:
+            brief = backlog[-1]
+            try:
+                job_id = dispatcher.submit_webhook(
+                    webhook_url,
+                    {"type": "generate", "data": brief["form_data"]},
+                    user_id=BATCH_RUNNER_USER,
+                    max_user_queue=concurrency
+                )
+            except dispatcher.QueueFullError:
+                break
+            backlog.pop()
+            active[job_id] = {"brief": brief, "started_at": time.time()}
+
+        # 전송 실패 / 시간 초과 작업 정리
+        accepted = True
+        now = time.time()
+        for job_id, job in list(active.items()):
+            delivery = dispatcher.get_delivery(job_id)
+            if delivery and delivery["status"] == dispatcher.DELIVERY_FAILED:
+                emit(job_id, job["brief"], batch.JOB_FAILED, error=delivery.get("error") or "요청 전송에 실패했습니다.")
+            elif now - job["started_at"] > job_timeout:
+                # 아직 대기열에 있으면 나중에 n8n으로 전송되지 않도록 제거
+                if dispatcher.cancel_job(job_id):
+                    error = f"{job_timeout:.0f}초 동안 전송 순서가 오지 않아 취소했습니다."
+                else:
+                    error = f"{job_timeout:.0f}초 동안 결과가 도착하지 않았습니다."
+                emit(job_id, job["brief"], batch.JOB_FAILED, error=error)
+            elif delivery and delivery["status"] != dispatcher.DELIVERY_ACCEPTED:
+                accepted = False
+
+        if not active:
+            if backlog:
+                time.sleep(1)
+            continue
+
+        # 하나라도 도착하면 바로 반환 (전송 중인 작업이 있으면 짧게 대기해 실패를 빨리 감지)
+        # 가장 먼저 시간 초과되는 작업의 기한을 넘기지 않도록 대기 시간 제한
+        wait_started = time.time()
+        deadline = min(job["started_at"] for job in active.values()) + job_timeout
+        wait_timeout = max(0.5, min(RESULT_WAIT_TIMEOUT if accepted else 2, deadline - wait_started))
+        try:
+            records = wait_results(list(active), wait_timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ 결과 API 확인 실패, 잠시 후 다시 시도합니다: {str(e)}")
+            records = {}
+
+        for job_id, record in records.items():
+            if job_id not in active:
+                continue
+            try:
+                result = result_from_record(record)
+            except Exception as e:
+                result = None
+                print(f"⚠️ 결과 처리 중 오류: {job_id[:8]}... ({str(e)})")
+            # n8n 처리 자리 반환 (다음 대기 요청 전송)
+            dispatcher.complete_job(job_id)
+            if result is None:
+                emit(job_id, active[job_id]["brief"], batch.JOB_FAILED, error="결과 데이터가 없습니다.")
+            else:
+                emit(job_id, active[job_id]["brief"], batch.JOB_DONE, result=result)
+
+        # 오류로 즉시 반환된 경우 과도한 재요청 방지
+        elapsed = time.time() - wait_started
+        if not records and elapsed < 1:
+            time.sleep(1 - elapsed)
+
+    summary["elapsed"] = round(time.time() - started_at, 1)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BIOFOX 콘텐츠 배치 생성 (CSV/JSONL 입력 -> JSONL 결과)")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("-o", "--output", required=True, help="결과 JSONL 파일")
+    parser.add_argument("--concurrency", type=int, default=BATCH_RUNNER_CONCURRENCY, help="동시에 처리할 작업 수")
+    parser.add_argument("--job-timeout", type=float, default=BATCH_RUNNER_JOB_TIMEOUT, help="작업당 최대 대기 시간 (초)")
+    parser.add_argument("--targets", help="입력마다 생성할 플랫폼 (예: 인스타그램,블로그:후기형V1)")
+    parser.add_argument("--ages", help="입력마다 생성할 연령대 (예: 20대,30대)")
+    parser.add_argument("--resume", action="store_true", help="결과 파일에 이미 성공한 입력은 건너뛰고 이어서 기록")
+    args = parser.parse_args()
+
+    briefs = expand_briefs(
+        load_briefs(args.input),
+        parse_targets(args.targets) if args.targets else None,
+        [age.strip() for age in args.ages.split(",") if age.strip()] if args.ages else None
+    )
+    if args.resume:
+        done = completed_ids(args.output)
+        briefs = [brief for brief in briefs if brief["id"] not in done]
+        print(f"⏭️ 이미 생성된 {len(done)}개를 건너뜁니다.")
+
+    print(f"🚀 배치 생성 시작: {len(briefs)}개 (동시 {args.concurrency}개)")
+    try:
+        with open(args.output, "ab" if args.resume else "wb") as output:
+            summary = run_batch(briefs, output, concurrency=args.concurrency, job_timeout=args.job_timeout)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n🛑 중단되었습니다. --resume으로 이어서 실행할 수 있습니다.")
+        sys.exit(130)
+
+    print(f"🏁 완료: 성공 {summary['done']}개, 실패 {summary['failed']}개 ({summary['elapsed']}초)")
+    sys.exit(0 if not summary["failed"] else 2)
+
+
+if __name__ == "__main__":
+    main()
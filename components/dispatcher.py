@@ -0,0 +1,342 @@
+import os
+import math
+import time
+import uuid
+import threading
+import requests
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from dotenv import load_dotenv
+from components import http_client, json_codec, job_cache
+
+# 환경변수 로드
+load_dotenv()
+
+# 전송 스레드 수 / 최대 시도 횟수
+DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "4"))
+DISPATCH_MAX_ATTEMPTS = int(os.getenv("DISPATCH_MAX_ATTEMPTS", "3"))
+
+# 전송 기록 보관 시간 (초)
+DELIVERY_RETENTION = float(os.getenv("DELIVERY_RETENTION", "3600"))
+
+# n8n에서 동시에 처리할 작업 수 (전송부터 결과 도착까지 한 자리 차지)
+DISPATCH_MAX_IN_FLIGHT = int(os.getenv("DISPATCH_MAX_IN_FLIGHT", "8"))
+# 대기열 한도 (전체 / 사용자별), 넘으면 QueueFullError
+DISPATCH_MAX_QUEUE = int(os.getenv("DISPATCH_MAX_QUEUE", "50"))
+DISPATCH_MAX_QUEUE_PER_USER = int(os.getenv("DISPATCH_MAX_QUEUE_PER_USER", "3"))
+# 결과 도착(complete_job)이 없을 때 자리를 회수하는 시간 (초)
+DISPATCH_IN_FLIGHT_TIMEOUT = float(os.getenv("DISPATCH_IN_FLIGHT_TIMEOUT", "300"))
+# 완료 기록이 없을 때 예상 대기 시간 계산에 쓰는 작업당 소요 시간 (초)
+DISPATCH_DEFAULT_JOB_SECONDS = float(os.getenv("DISPATCH_DEFAULT_JOB_SECONDS", "90"))
+
+# 전송 상태
+DELIVERY_QUEUED = "queued"
+DELIVERY_SENDING = "sending"
+DELIVERY_ACCEPTED = "accepted"
+DELIVERY_FAILED = "failed"
+DELIVERY_CANCELLED = "cancelled"
+
+_executor = ThreadPoolExecutor(max_workers=DISPATCH_WORKERS, thread_name_prefix="n8n-dispatch")
+
+# job_id -> 전송 상태 기록
+_deliveries = {}
+_deliveries_lock = threading.Lock()
+
+# 사용자 -> 대기 중인 (job_id, webhook_url, request_data), 앞쪽 사용자부터 한 건씩 돌아가며 전송
+_queues = OrderedDict()
+# 처리 중인 job_id -> 전송 시작 시각
+_in_flight = {}
+# 완료된 작업의 평균 소요 시간 (지수 이동 평균, 초)
+_avg_job_seconds = None
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음 (eta: 다시 시도할 때까지 예상 대기 시간, 초)"""
+
+    def __init__(self, message, eta):
+        super().__init__(message)
+        self.eta = eta
+
+
+def submit_webhook(webhook_url, data, webhook_type="generate", user_id=None, max_user_queue=None):
+    """웹훅 요청을 전송 대기열에 등록하고 job_id를 즉시 반환
+
+    처리 중인 작업이 DISPATCH_MAX_IN_FLIGHT개 미만이면 바로 전송하고,
+    아니면 사용자별 대기열에서 순서를 기다립니다 (사용자마다 한 건씩 번갈아 전송).
+
+    Args:
+        webhook_url (str): n8n 웹훅 URL
+        data (dict): 요청 데이터 (job_id는 자동으로 추가)
+        webhook_type (str): 요청 종류 (generate, modify)
+        user_id (str): 공정한 순서 배분에 쓰는 사용자 식별자
+        max_user_queue (int): 사용자별 대기열 한도 (없으면 DISPATCH_MAX_QUEUE_PER_USER, 일괄 생성용)
+
+    Returns:
+        str: 클라이언트에서 생성한 job_id
+
+    Raises:
+        QueueFullError: 전체 또는 사용자별 대기열이 가득 찬 경우
+    """
+    job_id = str(uuid.uuid4())
+    request_data = {
+        "job_id": job_id,  # 클라이언트에서 생성한 job_id
+        **data
+    }
+
+    now = time.time()
+    with _deliveries_lock:
+        _prune(now)
+        _reclaim(now)
+        queued = sum(len(queue) for queue in _queues.values())
+        if queued >= DISPATCH_MAX_QUEUE:
+            raise QueueFullError("대기 중인 요청이 너무 많습니다.", _eta(queued + 1))
+        user_queue = _queues.get(user_id)
+        user_limit = DISPATCH_MAX_QUEUE_PER_USER if max_user_queue is None else max_user_queue
+        if user_queue is not None and len(user_queue) >= user_limit:
+            raise QueueFullError("이미 대기 중인 요청이 있습니다.", _eta(_position(user_queue[-1][0]) + 1))
+
+        _deliveries[job_id] = {
+            "job_id": job_id,
+            "webhook_type": webhook_type,
+            "user_id": user_id,
+            "status": DELIVERY_QUEUED,
+            "attempts": 0,
+            "error": None,
+            "queued_at": now,
+            "updated_at": now,
+        }
+        _queues.setdefault(user_id, deque()).append((job_id, webhook_url, request_data))
+        ready = _take_ready(now)
+
+    _start(ready)
+    return job_id
+
+
+def get_delivery(job_id):
+    """전송 상태 조회 (없으면 None)
+
+    대기열에서 기다리는 중이면 position(1부터)과 eta(예상 대기 시간, 초)를 함께 반환합니다.
+    """
+    now = time.time()
+    with _deliveries_lock:
+        # 조회 중에도 오래된 자리를 회수해 대기열이 멈추지 않도록 함
+        _reclaim(now)
+        ready = _take_ready(now)
+        delivery = _deliveries.get(job_id)
+        if delivery:
+            delivery = dict(delivery)
+            if delivery["status"] == DELIVERY_QUEUED and job_id not in _in_flight:
+                delivery["position"] = _position(job_id)
+                delivery["eta"] = _eta(delivery["position"])
+
+    _start(ready)
+    return delivery
+
+
+def complete_job(job_id, result=None):
+    """작업 결과가 도착했음을 알리고 처리 중 자리를 반환 (다음 대기 작업 전송)
+
+    result를 주면 같은 생성 요청에 재사용하도록 job_cache에 보관합니다.
+    """
+    global _avg_job_seconds
+    if result:
+        job_cache.store_result(job_id, result)
+    now = time.time()
+    with _deliveries_lock:
+        started_at = _in_flight.pop(job_id, None)
+        if started_at is not None:
+            elapsed = now - started_at
+            _avg_job_seconds = elapsed if _avg_job_seconds is None else _avg_job_seconds * 0.8 + elapsed * 0.2
+        ready = _take_ready(now)
+
+    _start(ready)
+
+
+def cancel_job(job_id):
+    """작업 취소 - 아직 대기열에 있으면 전송하지 않고 제거, 이미 전송됐으면 처리 중 자리만 반환
+
+    Returns:
+        bool: 전송 전에 대기열에서 제거했으면 True
+    """
+    job_cache.forget(job_id)
+    now = time.time()
+    with _deliveries_lock:
+        removed = False
+        for user_id, queue in _queues.items():
+            for item in queue:
+                if item[0] == job_id:
+                    queue.remove(item)
+                    removed = True
+                    break
+            if removed:
+                if not queue:
+                    del _queues[user_id]
+                break
+        _in_flight.pop(job_id, None)
+        if removed and job_id in _deliveries:
+            _deliveries[job_id].update(status=DELIVERY_CANCELLED, updated_at=now)
+        ready = _take_ready(now)
+
+    _start(ready)
+    return removed
+
+
+def accepted_jobs():
+    """n8n이 접수해 결과를 기다리는 처리 중 job_id 목록 (오래된 순)"""
+    with _deliveries_lock:
+        return [
+            job_id for job_id in _in_flight
+            if _deliveries.get(job_id, {}).get("status") == DELIVERY_ACCEPTED
+        ]
+
+
+def get_queue_stats():
+    """대기열/처리 중 작업 수와 평균 소요 시간"""
+    with _deliveries_lock:
+        return {
+            "queued": sum(len(queue) for queue in _queues.values()),
+            "users": len(_queues),
+            "in_flight": len(_in_flight),
+            "max_in_flight": DISPATCH_MAX_IN_FLIGHT,
+            "avg_job_seconds": _avg_job_seconds,
+        }
+
+
+def _take_ready(now):
+    # 빈 자리만큼 사용자별 대기열에서 번갈아 꺼냄 (_deliveries_lock 안에서 호출)
+    ready = []
+    while len(_in_flight) < DISPATCH_MAX_IN_FLIGHT and _queues:
+        user_id, queue = next(iter(_queues.items()))
+        item = queue.popleft()
+        if queue:
+            _queues.move_to_end(user_id)
+        else:
+            del _queues[user_id]
+        _in_flight[item[0]] = now
+        ready.append(item)
+    return ready
+
+
+def _start(ready):
+    # 꺼낸 요청을 전송 스레드에 넘김 (잠금 밖에서 호출)
+    for item in ready:
+        _executor.submit(_deliver, *item)
+
+
+def _position(job_id):
+    # 사용자별로 번갈아 전송할 때 job_id보다 먼저 전송될 작업 수 + 1 (_deliveries_lock 안에서 호출)
+    users = list(_queues)
+    for user_index, user_id in enumerate(users):
+        queue = _queues[user_id]
+        for index, item in enumerate(queue):
+            if item[0] == job_id:
+                ahead = index
+                for other_index, other_user in enumerate(users):
+                    if other_user != user_id:
+                        ahead += min(len(_queues[other_user]), index + (1 if other_index < user_index else 0))
+                return ahead + 1
+    return 0
+
+
+def _eta(position):
+    # position번째 대기 작업이 전송될 때까지 예상 시간 (초, _deliveries_lock 안에서 호출)
+    free = DISPATCH_MAX_IN_FLIGHT - len(_in_flight)
+    if position <= free:
+        return 0
+    job_seconds = _avg_job_seconds or DISPATCH_DEFAULT_JOB_SECONDS
+    return math.ceil((position - free) / DISPATCH_MAX_IN_FLIGHT) * job_seconds
+
+
+def _reclaim(now):
+    # 결과 도착 알림 없이 오래된 처리 중 자리 회수 (_deliveries_lock 안에서 호출)
+    expired = [job_id for job_id, started_at in _in_flight.items() if now - started_at > DISPATCH_IN_FLIGHT_TIMEOUT]
+    for job_id in expired:
+        del _in_flight[job_id]
+        job_cache.forget(job_id)
+        print(f"⚠️ 결과 도착 알림 없이 처리 중 자리 회수: {job_id[:8]}...")
+
+
+def _release(job_id):
+    # 전송 실패한 작업의 처리 중 자리 반환 (소요 시간 평균에는 넣지 않음)
+    job_cache.forget(job_id)
+    with _deliveries_lock:
+        _in_flight.pop(job_id, None)
+        ready = _take_ready(time.time())
+    _start(ready)
+
+
+def _deliver(job_id, webhook_url, request_data):
+    """웹훅 전송 (백그라운드 스레드에서 실행, 연결 오류/5xx 시 재시도)
+
+    요청을 보낸 뒤 응답 대기 시간이 초과되면 n8n이 이미 받았을 수 있으므로
+    다시 보내지 않고 접수된 것으로 처리합니다 (결과는 결과 API 대기로 확인).
+    """
+    headers = {'Content-Type': 'application/json'}
+    # 한글을 \uXXXX로 이스케이프하지 않은 UTF-8 JSON (재시도에도 같은 본문 사용)
+    body = json_codec.dumps(request_data)
+
+    for attempt in range(DISPATCH_MAX_ATTEMPTS):
+        _update(job_id, status=DELIVERY_SENDING, attempts=attempt + 1)
+        try:
+            response = http_client.post(
+                webhook_url,
+                endpoint="n8n_webhook",
+                data=body,
+                headers=headers,
+                retries=0
+            )
+        except requests.exceptions.ReadTimeout:
+            # 중복 생성/중복 결과 알림을 막기 위해 재전송하지 않음
+            _update(job_id, status=DELIVERY_ACCEPTED, accepted_at=time.time(), error=None)
+            print(f"⏳ 응답 대기 시간 초과, 접수된 것으로 처리: {job_id[:8]}... ({datetime.now().strftime('%H:%M:%S')})")
+            return
+        except requests.exceptions.ConnectionError as e:
+            # 연결 실패/연결 시간 초과 (ConnectTimeout 포함)만 재시도
+            error = f"웹훅 연결 오류: {str(e)}"
+        except Exception as e:
+            _update(job_id, status=DELIVERY_FAILED, error=f"웹훅 호출 중 예외 발생: {str(e)}")
+            _release(job_id)
+            print(f"❌ 요청 전송 실패: {job_id[:8]}... ({str(e)})")
+            return
+        else:
+            # 응답 확인 (200 또는 202 모두 허용)
+            if response.status_code in [200, 202]:
+                try:
+                    response.json()
+                except ValueError:
+                    _update(job_id, status=DELIVERY_FAILED, error=f"응답 처리 중 오류 (응답 텍스트: {response.text[:200]})")
+                    _release(job_id)
+                    return
+                _update(job_id, status=DELIVERY_ACCEPTED, accepted_at=time.time(), error=None)
+                print(f"✅ 요청 접수: {job_id[:8]}... ({datetime.now().strftime('%H:%M:%S')})")
+                return
+
+            error = f"웹훅 호출 오류: {response.status_code} (응답: {response.text[:200]})"
+            if response.status_code not in http_client.RETRY_STATUS_CODES:
+                # 4xx 등은 재시도해도 같은 결과
+                _update(job_id, status=DELIVERY_FAILED, error=error)
+                _release(job_id)
+                return
+
+        _update(job_id, error=error)
+        if attempt + 1 < DISPATCH_MAX_ATTEMPTS:
+            time.sleep(http_client.backoff_delay(attempt))
+
+    _update(job_id, status=DELIVERY_FAILED)
+    _release(job_id)
+    print(f"❌ 요청 전송 실패: {job_id[:8]}... ({error})")
+
+
+def _update(job_id, **fields):
+    with _deliveries_lock:
+        delivery = _deliveries.get(job_id)
+        if delivery is not None:
+            delivery.update(fields, updated_at=time.time())
+
+
+def _prune(now):
+    # 오래된 전송 기록 정리 (_deliveries_lock 안에서 호출)
+    expired = [job_id for job_id, delivery in _deliveries.items() if now - delivery["updated_at"] > DELIVERY_RETENTION]
+    for job_id in expired:
+        del _deliveries[job_id]
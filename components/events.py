@@ -0,0 +1,57 @@
+import os
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# 진단용 debug 메시지 표시 여부 (파싱 결과 길이/타입 등)
+EVENT_DEBUG = os.getenv("EVENT_DEBUG", "false").lower() == "true"
+
+# 메시지 수준 (st.info/success/warning/error와 같은 이름 + debug)
+LEVELS = ("debug", "info", "success", "warning", "error")
+
+
+def print_sink(level, message):
+    """기본 출력 - 콘솔에 출력 (API 서버, 배치 실행기 등 Streamlit 밖에서 사용)"""
+    if level == "debug" and not EVENT_DEBUG:
+        return
+    print(message)
+
+
+_sink = print_sink
+
+
+def set_sink(sink):
+    """메시지를 받을 함수 sink(level, message) 교체 (None이면 기본 출력, 이전 sink 반환)"""
+    global _sink
+    previous = _sink
+    _sink = sink or print_sink
+    return previous
+
+
+def emit(level, message):
+    """현재 sink로 메시지 전달 (sink 오류는 호출한 쪽으로 전파하지 않음)"""
+    try:
+        _sink(level, message)
+    except Exception as e:
+        print(f"⚠️ 메시지 전달 실패: {str(e)} ({message})")
+
+
+def debug(message):
+    emit("debug", message)
+
+
+def info(message):
+    emit("info", message)
+
+
+def success(message):
+    emit("success", message)
+
+
+def warning(message):
+    emit("warning", message)
+
+
+def error(message):
+    emit("error", message)
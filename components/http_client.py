@@ -0,0 +1,144 @@
+import os
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# 연결 풀 / 재시도 설정
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8"))
+
+# 엔드포인트별 기본 타임아웃 (초)
+ENDPOINT_TIMEOUTS = {
+    "n8n_webhook": float(os.getenv("N8N_WEBHOOK_TIMEOUT", "30")),
+    "result_api": float(os.getenv("RESULT_API_TIMEOUT", "5")),
+    "default": float(os.getenv("HTTP_DEFAULT_TIMEOUT", "10")),
+}
+
+# 재시도 대상 상태 코드 (서버 오류)
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# 응답 대기 시간 초과/5xx에도 다시 보내도 되는 메서드 (POST는 서버가 이미 처리했을 수 있음)
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "retries": 0,
+    "failures": 0,
+}
+
+
+def get_session():
+    """프로세스 전체에서 공유하는 keep-alive HTTP 세션 반환"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # 재시도는 request()에서 직접 처리 (지터가 있는 지수 백오프)
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=0
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"User-Agent": "BIOFOX-AdGenerator/1.0"})
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt):
+    """지수 백오프 + 전체 지터 (attempt는 0부터)"""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(method, url, endpoint="default", timeout=None, retries=None, **kwargs):
+    """공유 세션으로 HTTP 요청 (연결 실패 시 재시도, GET/HEAD는 응답 시간 초과/5xx에도 재시도)
+
+    POST 등은 요청이 서버에 도착하지 않은 연결 실패(ConnectionError/ConnectTimeout)만 재시도합니다.
+
+    Args:
+        method (str): HTTP 메서드
+        url (str): 요청 URL
+        endpoint (str): ENDPOINT_TIMEOUTS의 키 (기본 타임아웃 선택)
+        timeout (float): 타임아웃 직접 지정 (없으면 엔드포인트 기본값)
+        retries (int): 최대 재시도 횟수 (없으면 HTTP_MAX_RETRIES)
+
+    Returns:
+        requests.Response: 마지막 응답 (재시도 후에도 5xx면 그 응답을 반환)
+
+    Raises:
+        requests.exceptions.RequestException: 재시도 후에도 연결에 실패한 경우
+    """
+    if timeout is None:
+        timeout = ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS["default"])
+    if retries is None:
+        retries = HTTP_MAX_RETRIES
+
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    session = get_session()
+    for attempt in range(retries + 1):
+        _count("requests")
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            # ConnectTimeout은 ConnectionError이기도 하므로 여기서 남는 것은 응답 대기 시간 초과
+            retryable = idempotent or isinstance(e, requests.exceptions.ConnectionError)
+            if attempt >= retries or not retryable:
+                _count("failures")
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries or not idempotent:
+                return response
+            response.close()
+
+        _count("retries")
+        time.sleep(backoff_delay(attempt))
+
+
+def get(url, **kwargs):
+    """GET 요청"""
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST 요청"""
+    return request("POST", url, **kwargs)
+
+
+def get_http_stats():
+    """요청/재시도/연결 재사용 카운터 반환"""
+    with _stats_lock:
+        stats = dict(_stats)
+
+    # urllib3 연결 풀별로 새로 연 연결 수를 합산
+    new_connections = 0
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    new_connections += pool.num_connections
+
+    sent = stats["requests"]
+    stats["new_connections"] = new_connections
+    stats["reused_connections"] = max(0, sent - new_connections)
+    stats["reuse_ratio"] = round(stats["reused_connections"] / sent, 3) if sent else 0.0
+    return stats
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
@@ -0,0 +1,134 @@
+import os
+import copy
+import time
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from components import json_codec
+
+# 환경변수 로드
+load_dotenv()
+
+# 같은 생성 요청 재사용 여부 / 결과 보관 시간 (초, 0이면 진행 중인 작업 합류만) / 최대 보관 수
+JOB_CACHE_ENABLED = os.getenv("JOB_CACHE_ENABLED", "true").lower() == "true"
+JOB_CACHE_TTL = float(os.getenv("JOB_CACHE_TTL", "3600"))
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "500"))
+
+# 요청 키 -> {"job_id", "result", "expires_at"} (result가 None이면 진행 중)
+_entries = OrderedDict()
+# job_id -> 요청 키
+_job_keys = {}
+_lock = threading.Lock()
+
+_stats = {"hits": 0, "coalesced": 0, "misses": 0, "bypassed": 0}
+
+
+def cache_key(webhook_type, data):
+    """요청 내용의 정규화 해시 (키 순서, 문자열 앞뒤 공백과 무관)"""
+    def canonical(value):
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return {str(key): canonical(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [canonical(item) for item in value]
+        return value
+
+    return json_codec.content_hash({"webhook_type": webhook_type, "data": canonical(data)})
+
+
+def lookup(key):
+    """같은 요청의 job_id 조회
+
+    Returns:
+        tuple: ("result", job_id) 보관 중인 결과가 있음, ("running", job_id) 같은 요청이 진행 중, 없으면 None
+    """
+    now = time.time()
+    with _lock:
+        _prune(now)
+        entry = _entries.get(key)
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        if entry["result"] is not None:
+            _stats["hits"] += 1
+            return "result", entry["job_id"]
+        _stats["coalesced"] += 1
+        return "running", entry["job_id"]
+
+
+def record_bypass():
+    """캐시를 사용하지 않은 요청 수 집계 (설정 또는 사용자 선택)"""
+    with _lock:
+        _stats["bypassed"] += 1
+
+
+def register(key, job_id):
+    """새로 전송한 요청을 진행 중으로 등록 (같은 요청이 이 job_id에 합류)"""
+    with _lock:
+        _entries[key] = {"job_id": job_id, "result": None, "expires_at": None}
+        _job_keys[job_id] = key
+        while len(_entries) > JOB_CACHE_MAX_ENTRIES:
+            _drop(next(iter(_entries)))
+
+
+def store_result(job_id, result):
+    """완료된 결과 보관 (JOB_CACHE_TTL 동안 같은 요청에 재사용)
+
+    이미 결과가 보관된 작업(캐시에서 꺼내 쓴 결과를 다시 완료 처리한 경우)은
+    처음 보관한 만료 시각을 그대로 유지합니다.
+    """
+    with _lock:
+        key = _job_keys.get(job_id)
+        if key is None or key not in _entries or _entries[key]["job_id"] != job_id:
+            return
+        if _entries[key]["result"] is not None:
+            return
+        if JOB_CACHE_TTL <= 0 or not result:
+            _drop(key)
+            return
+        _entries[key].update(result=copy.deepcopy(result), expires_at=time.time() + JOB_CACHE_TTL)
+
+
+def get_result(job_id):
+    """job_id로 보관 중인 결과의 복사본 조회 (없거나 만료되면 None, 세션마다 따로 수정할 수 있음)"""
+    with _lock:
+        key = _job_keys.get(job_id)
+        entry = _entries.get(key) if key else None
+        if entry is None or entry["result"] is None or entry["expires_at"] <= time.time():
+            return None
+        return copy.deepcopy(entry["result"])
+
+
+def forget(job_id):
+    """실패하거나 중단된 작업 제거 (다음 같은 요청은 새로 전송)"""
+    with _lock:
+        key = _job_keys.get(job_id)
+        if key is not None and key in _entries and _entries[key]["job_id"] == job_id:
+            _drop(key)
+
+
+def get_cache_stats():
+    """캐시 적중/합류/미적중 수와 적중률"""
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_entries)
+        stats["running"] = sum(1 for entry in _entries.values() if entry["result"] is None)
+    lookups = stats["hits"] + stats["coalesced"] + stats["misses"]
+    stats["hit_rate"] = (stats["hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+    return stats
+
+
+def _drop(key):
+    # 항목과 job_id 연결 제거 (_lock 안에서 호출)
+    entry = _entries.pop(key, None)
+    if entry is not None:
+        _job_keys.pop(entry["job_id"], None)
+
+
+def _prune(now):
+    # 만료된 결과 정리 (_lock 안에서 호출)
+    expired = [key for key, entry in _entries.items() if entry["expires_at"] is not None and entry["expires_at"] <= now]
+    for key in expired:
+        _drop(key)
@@ -0,0 +1,182 @@
+import os
+import time
+import threading
+import requests
+from dotenv import load_dotenv
+from components import http_client, dispatcher, json_codec, job_cache
+from components.http_client import ENDPOINT_TIMEOUTS
+from components.parser import process_llm_response
+
+# 환경변수 강제 재로드
+load_dotenv(override=True)
+
+# 결과 API 설정
+RESULT_API_URL = os.getenv("RESULT_API_URL", "http://localhost:8001")
+RESULT_WAIT_TIMEOUT = float(os.getenv("RESULT_WAIT_TIMEOUT", "25"))
+# 결과 API가 한 번에 기다려 주는 최대 작업 수 (api.py와 같은 설정)
+RESULT_WAIT_MAX_JOB_IDS = int(os.getenv("RESULT_WAIT_MAX_JOB_IDS", "50"))
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def submit_request(webhook_url, data, webhook_type="generate", use_cache=True, user_id=None, max_user_queue=None):
+    """생성/수정 요청을 전송 대기열에 등록 (같은 생성 요청이면 기존 job_id 재사용)
+
+    Returns:
+        tuple: (job_id, kind) - kind는 "result"(보관된 결과), "running"(진행 중인 요청에 합류), "sent"(새로 전송)
+
+    Raises:
+        dispatcher.QueueFullError: 대기열이 가득 찬 경우
+    """
+    # 같은 생성 요청 재사용 (수정 요청은 히스토리마다 다르므로 제외)
+    cache_key = None
+    if webhook_type == "generate":
+        if use_cache and job_cache.JOB_CACHE_ENABLED:
+            cache_key = job_cache.cache_key(webhook_type, data)
+            hit = job_cache.lookup(cache_key)
+            if hit:
+                kind, job_id = hit
+                return job_id, kind
+        else:
+            job_cache.record_bypass()
+
+    # 백그라운드 전송 대기열에 등록 (job_id는 클라이언트에서 생성)
+    job_id = dispatcher.submit_webhook(webhook_url, data, webhook_type, user_id=user_id, max_user_queue=max_user_queue)
+    if cache_key:
+        job_cache.register(cache_key, job_id)
+    start_completion_watcher()
+    return job_id, "sent"
+
+
+def start_completion_watcher():
+    """처리 중 작업의 결과 도착을 화면과 별개로 감시하는 스레드 시작 (프로세스당 한 번)
+
+    사용자가 탭을 닫아 결과를 보지 않아도 결과가 도착하면 바로 n8n 처리 자리를 반환하고
+    같은 요청 재사용을 위해 결과를 보관합니다 (DISPATCH_IN_FLIGHT_TIMEOUT까지 기다리지 않음).
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = threading.Thread(target=_watch_completions, name="job-completion-watcher", daemon=True)
+            _watcher.start()
+
+
+def _watch_completions():
+    while True:
+        job_ids = dispatcher.accepted_jobs()[:RESULT_WAIT_MAX_JOB_IDS]
+        if not job_ids:
+            time.sleep(1)
+            continue
+        try:
+            records = wait_results(job_ids)
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ 결과 도착 감시 실패, 잠시 후 다시 시도합니다: {str(e)}")
+            time.sleep(5)
+            continue
+        for job_id, record in records.items():
+            try:
+                result = result_from_record(record)
+            except Exception as e:
+                result = None
+                print(f"⚠️ 결과 처리 중 오류: {job_id[:8]}... ({str(e)})")
+            # 화면에서도 complete_job을 호출하지만 자리 반환/결과 보관은 한 번만 반영됨
+            dispatcher.complete_job(job_id, result)
+
+
+def result_from_record(record):
+    """결과 API 기록에서 표시용 결과 추출 (결과 데이터가 없으면 None)"""
+    # API 서버가 받을 때 정규화한 결과를 그대로 사용
+    if record.get('normalized') is not None:
+        return record['normalized']
+    # 정규화되지 않은 결과는 여기서 파싱
+    if record.get('result_data'):
+        return process_llm_response(record['result_data'])
+    if record.get('result'):
+        return process_llm_response({"content": record['result']})
+    return None
+
+
+def wait_result(job_id, wait_timeout=None, etag=None):
+    """결과 API에서 작업 결과 대기 (long-poll)
+
+    Args:
+        etag (str): 이미 받은 결과의 ETag (같으면 본문 없이 304)
+
+    Returns:
+        tuple: (상태 코드, 결과 기록 또는 None, 응답 ETag)
+
+    Raises:
+        requests.exceptions.RequestException: API 서버에 연결할 수 없는 경우
+    """
+    if wait_timeout is None:
+        wait_timeout = RESULT_WAIT_TIMEOUT
+    response = http_client.get(
+        f"{RESULT_API_URL}/api/result/{job_id}/wait",
+        endpoint="result_api",
+        params={"timeout": wait_timeout},
+        headers={"If-None-Match": etag} if etag else {},
+        timeout=wait_timeout + ENDPOINT_TIMEOUTS["result_api"]
+    )
+    record = json_codec.loads(response.content) if response.status_code == 200 else None
+    return response.status_code, record, response.headers.get("ETag")
+
+
+def wait_results(job_ids, wait_timeout=None):
+    """결과 API에서 job_ids 중 완료된 작업의 기록 조회 (하나라도 도착하면 반환하는 long-poll)
+
+    Returns:
+        dict: 완료된 job_id -> 결과 기록
+
+    Raises:
+        requests.exceptions.RequestException: 연결 실패 또는 200이 아닌 응답
+    """
+    if wait_timeout is None:
+        wait_timeout = RESULT_WAIT_TIMEOUT
+    if not job_ids:
+        return {}
+    response = http_client.get(
+        f"{RESULT_API_URL}/api/results/wait",
+        endpoint="result_api",
+        params={"job_ids": ",".join(job_ids), "timeout": wait_timeout},
+        timeout=wait_timeout + ENDPOINT_TIMEOUTS["result_api"]
+    )
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(f"API 호출 오류: {response.status_code}", response=response)
+    return json_codec.loads(response.content).get("results", {})
+
+
+def fetch_stream(job_id, since=0, wait_timeout=None):
+    """결과 API에서 생성 중인 콘텐츠 이벤트 확인 (long-poll)
+
+    Returns:
+        dict: {"events", "next", "done", "completed"} (API 서버를 사용할 수 없으면 None)
+    """
+    if wait_timeout is None:
+        wait_timeout = RESULT_WAIT_TIMEOUT
+    try:
+        response = http_client.get(
+            f"{RESULT_API_URL}/api/result/{job_id}/stream",
+            endpoint="result_api",
+            params={"since": since, "timeout": wait_timeout},
+            timeout=wait_timeout + ENDPOINT_TIMEOUTS["result_api"]
+        )
+        if response.status_code == 200:
+            return json_codec.loads(response.content)
+        return None
+    except requests.exceptions.RequestException:
+        return None
+
+
+def post_job_spans(job_id, platform, spans):
+    """작업의 클라이언트 측 단계 시각을 API /api/metrics로 전송 (실패하면 출력만)"""
+    try:
+        http_client.post(
+            f"{RESULT_API_URL}/api/metrics/{job_id}",
+            endpoint="result_api",
+            data=json_codec.dumps({"platform": platform, "spans": spans}),
+            headers={'Content-Type': 'application/json'},
+            retries=0
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ 작업 지연 기록 전송 실패: {job_id[:8]}... ({str(e)})")
@@ -0,0 +1,65 @@
+import os
+import json
+import hashlib
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# JSON 코덱 선택 (auto: orjson이 설치되어 있으면 사용, stdlib: 표준 json 강제)
+JSON_CODEC = os.getenv("JSON_CODEC", "auto")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 실제 사용 중인 코덱 이름
+BACKEND = "orjson" if orjson is not None and JSON_CODEC != "stdlib" else "stdlib"
+
+
+def loads(data):
+    """JSON 문자열/바이트 디코딩
+
+    Raises:
+        json.JSONDecodeError: 올바른 JSON이 아닌 경우 (orjson 오류도 이 타입의 하위 클래스)
+    """
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """JSON 바이트로 인코딩 (한글은 이스케이프하지 않음, datetime 등은 문자열로)"""
+    if BACKEND == "orjson":
+        return orjson.dumps(obj, default=str)
+    return dumps_retained(obj)
+
+
+def dumps_retained(obj, sort_keys=False):
+    """계속 보관되는 객체를 JSON 바이트로 인코딩 (코덱과 관계없이 표준 json)
+
+    orjson은 인코딩한 문자열 객체마다 UTF-8 사본을 캐시해 두므로,
+    세션/버전 히스토리에 남는 객체를 orjson으로 인코딩하면 그 문자열들의 메모리가 약 2배가 됩니다.
+    """
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=str).encode("utf-8")
+
+
+def decode_model(model, data):
+    """JSON을 디코딩한 뒤 pydantic 모델로 검증
+
+    pydantic의 model_validate_json보다 빠른 코덱으로 먼저 디코딩합니다.
+
+    Raises:
+        json.JSONDecodeError: 올바른 JSON이 아닌 경우
+        pydantic.ValidationError: 모델 검증에 실패한 경우
+    """
+    return model.model_validate(loads(data))
+
+
+def content_hash(obj):
+    """객체 내용의 sha256 해시 (키 순서와 무관, ETag 등에 사용)
+
+    해시 대상은 세션/버전 히스토리에 계속 보관되는 결과가 많아 dumps_retained로 인코딩합니다.
+    """
+    return hashlib.sha256(dumps_retained(obj, sort_keys=True)).hexdigest()
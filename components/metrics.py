@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# 작업별 기록을 보관할 최대 작업 수 (오래된 작업부터 제거)
+METRICS_MAX_JOBS = int(os.getenv("METRICS_MAX_JOBS", "2000"))
+
+# 작업 단계 (요청 전송 -> n8n 접수 -> 완료 콜백 -> 첫 결과 조회 -> 파싱 -> 화면 표시)
+JOB_STAGES = ("submit", "ack", "callback", "first_poll", "parse", "render")
+
+# 백분위를 계산하는 단계 구간 (이름, 시작 단계, 끝 단계)
+STAGE_INTERVALS = [
+    ("end_to_end", "submit", "render"),
+    ("submit_to_ack", "submit", "ack"),
+    ("ack_to_callback", "ack", "callback"),
+    ("callback_to_first_poll", "callback", "first_poll"),
+    ("first_poll_to_parse", "first_poll", "parse"),
+    ("parse_to_render", "parse", "render"),
+]
+
+# 플랫폼 정보가 없는 작업
+UNKNOWN_PLATFORM = "unknown"
+
+
+def percentiles(values):
+    """지연 시간(초) 목록의 백분위 요약 (밀리초, nearest-rank)"""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(p):
+        return round(ordered[max(0, -(-len(ordered) * p // 100) - 1)] * 1000, 1)
+
+    return {
+        "count": len(ordered),
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": round(ordered[-1] * 1000, 1),
+    }
+
+
+class JobMetrics:
+    """job_id별 단계 시각(epoch 초)과 처리 시간을 모아 플랫폼별 지연 백분위를 계산
+
+    스레드 안전하며, 프로세스(워커)마다 따로 집계됩니다.
+    """
+
+    def __init__(self, max_jobs=METRICS_MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _timeline(self, job_id):
+        """작업 기록 반환 (없으면 생성, 한도를 넘으면 가장 오래된 작업 제거)"""
+        timeline = self._jobs.get(job_id)
+        if timeline is None:
+            timeline = {"platform": None, "marks": {}, "durations": {}}
+            self._jobs[job_id] = timeline
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return timeline
+
+    def record(self, job_id, stage, at=None, first_only=False):
+        """단계 시각 기록
+
+        Args:
+            job_id (str): 작업 ID
+            stage (str): JOB_STAGES 중 하나
+            at (float): epoch 초 (없으면 현재 시각)
+            first_only (bool): 이미 기록된 단계면 유지 (첫 조회 등)
+        """
+        if stage not in JOB_STAGES:
+            raise ValueError(f"알 수 없는 단계: {stage}")
+        with self._lock:
+            marks = self._timeline(job_id)["marks"]
+            if not (first_only and stage in marks):
+                marks[stage] = time.time() if at is None else at
+
+    def record_duration(self, job_id, name, seconds):
+        """단계 내부 처리 시간 기록 (예: 서버 정규화)"""
+        with self._lock:
+            self._timeline(job_id)["durations"][name] = seconds
+
+    def record_spans(self, job_id, spans, platform=None, durations=None):
+        """클라이언트가 보낸 단계 시각/처리 시간을 한 번에 기록 (서버 기록 단계는 덮어쓰지 않음)"""
+        unknown = [stage for stage in spans if stage not in JOB_STAGES]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {', '.join(unknown)}")
+        with self._lock:
+            timeline = self._timeline(job_id)
+            if platform:
+                timeline["platform"] = platform
+            for stage, at in spans.items():
+                timeline["marks"].setdefault(stage, at)
+            timeline["durations"].update(durations or {})
+
+    def get(self, job_id):
+        """작업 기록과 단계 구간(초) 반환 (없으면 None)"""
+        with self._lock:
+            timeline = self._jobs.get(job_id)
+            if timeline is None:
+                return None
+            timeline = {
+                "platform": timeline["platform"],
+                "marks": dict(timeline["marks"]),
+                "durations": dict(timeline["durations"]),
+            }
+        timeline["intervals"] = {
+            name: timeline["marks"][end] - timeline["marks"][start]
+            for name, start, end in STAGE_INTERVALS
+            if start in timeline["marks"] and end in timeline["marks"]
+        }
+        return timeline
+
+    def summary(self):
+        """플랫폼별 단계 구간/처리 시간 백분위 (밀리초)"""
+        with self._lock:
+            jobs = [(timeline["platform"] or UNKNOWN_PLATFORM, dict(timeline["marks"]), dict(timeline["durations"]))
+                    for timeline in self._jobs.values()]
+
+        samples = {}
+        for platform, marks, durations in jobs:
+            entry = samples.setdefault(platform, {"jobs": 0, "intervals": {}, "durations": {}})
+            entry["jobs"] += 1
+            for name, start, end in STAGE_INTERVALS:
+                if start in marks and end in marks:
+                    entry["intervals"].setdefault(name, []).append(marks[end] - marks[start])
+            for name, seconds in durations.items():
+                entry["durations"].setdefault(name, []).append(seconds)
+
+        return {
+            platform: {
+                "jobs": entry["jobs"],
+                "intervals": {name: percentiles(values) for name, values in entry["intervals"].items()},
+                "durations": {name: percentiles(values) for name, values in entry["durations"].items()},
+            }
+            for platform, entry in samples.items()
+        }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._jobs)
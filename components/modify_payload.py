@@ -0,0 +1,157 @@
+import os
+from dotenv import load_dotenv
+from components import json_codec
+
+# 환경변수 로드
+load_dotenv()
+
+# 수정 요청 형식 (legacy: 기존 형식 그대로, compact: 내용은 해시로 한 번만 전송)
+# compact는 n8n 수정 워크플로가 해시 참조(content_ref)를 풀 수 있게 바뀐 뒤에만 사용
+MODIFY_PAYLOAD_FORMAT = os.getenv("MODIFY_PAYLOAD_FORMAT", "legacy")
+# 현재 버전 외에 내용까지 보낼 최근 버전 수 (원본은 항상 포함)
+MODIFY_HISTORY_WINDOW = int(os.getenv("MODIFY_HISTORY_WINDOW", "3"))
+# compact 요청 크기 상한 (JSON 바이트), 넘으면 오래된 버전 내용부터 제외
+MODIFY_PAYLOAD_MAX_BYTES = int(os.getenv("MODIFY_PAYLOAD_MAX_BYTES", "262144"))
+
+# 내용 해시 길이 (16진수 글자 수)
+CONTENT_REF_LENGTH = 16
+
+
+def payload_size(payload):
+    """전송될 JSON 크기 (바이트)"""
+    return len(json_codec.dumps(payload))
+
+
+def build_modify_payload(user_input, result, history, context, payload_format=None, window=None, max_bytes=None):
+    """n8n 수정 요청 데이터 생성
+
+    Args:
+        user_input (str): 이번 수정 요청
+        result (dict): 현재 결과
+        history (VersionStore): 버전 히스토리
+        context (dict): 원본 폼 데이터
+        payload_format (str): compact 또는 legacy (없으면 MODIFY_PAYLOAD_FORMAT)
+        window (int): 내용까지 보낼 최근 버전 수 (compact)
+        max_bytes (int): 요청 크기 상한 (compact)
+
+    Returns:
+        dict: 웹훅으로 보낼 요청 데이터
+    """
+    payload_format = payload_format or MODIFY_PAYLOAD_FORMAT
+    if payload_format == "legacy":
+        return build_legacy_payload(user_input, result, history, context)
+    return build_compact_payload(
+        user_input, result, history, context,
+        MODIFY_HISTORY_WINDOW if window is None else window,
+        MODIFY_PAYLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    )
+
+
+def build_legacy_payload(user_input, result, history, context):
+    """기존 형식의 수정 요청 (모든 버전 내용과 현재 결과를 필드마다 반복 전송)"""
+    # 전체 수정 히스토리 구성
+    versions = list(history)
+    modification_history = []
+    for version in versions:
+        modification_history.append({
+            "version": version['version'],
+            "timestamp": version['timestamp'],
+            "content": version['data'],
+            "user_request": version.get('user_request'),
+            "is_original": version.get('is_original', False)
+        })
+
+    # 원본 콘텐츠 찾기 (첫 번째 버전)
+    original_content = None
+    if modification_history and modification_history[0].get('is_original'):
+        original_content = modification_history[0]['content']
+
+    return {
+        "type": "modify",
+        "is_modification": True,  # 수정 요청임을 명시하는 플래그
+        "data": {
+            "current_request": user_input,  # 현재 수정 요청
+            "modification_request": user_input,  # 수정 요청 내용 (명확한 변수명)
+
+            # 전체 히스토리 정보
+            "modification_history": modification_history,  # 전체 수정 히스토리
+            "original_content": original_content,  # 맨 처음 원본
+            "current_content": result,  # 현재 결과
+
+            # 기존 호환성 유지
+            "original_result": result,  # 이전 출력 결과
+            "previous_output": {
+                "headline": result.get('headline', ''),
+                "caption": result.get('caption', ''),
+                "hashtags": result.get('hashtags', []),
+                "blog_title": result.get('blog_title', ''),
+                "blog_content": result.get('blog_content', '')
+            },
+            "user_request": user_input,  # 사용자의 수정 요청
+            "context": context,  # 원본 폼 데이터
+            "version_history": versions  # 버전 히스토리
+        }
+    }
+
+
+def build_compact_payload(user_input, result, history, context, window, max_bytes):
+    """간결한 수정 요청
+
+    - 현재 결과는 current_content로 한 번만 전송
+    - 히스토리는 버전 정보와 내용 해시(content_ref)만 전송하고, 내용은 contents[해시]에 한 번씩만 포함
+    - 내용은 원본과 최근 window개 버전만 포함하고, max_bytes를 넘으면 오래된 버전 내용부터 제외
+    """
+    metadata = history.metadata()
+    refs = [content_hash[:CONTENT_REF_LENGTH] for content_hash in history.content_hashes()]
+    current_ref = json_codec.content_hash(result)[:CONTENT_REF_LENGTH]
+
+    modification_history = [
+        {
+            "version": meta['version'],
+            "timestamp": meta['timestamp'],
+            "content_ref": ref,
+            "user_request": meta.get('user_request'),
+            "is_original": meta.get('is_original', False)
+        }
+        for meta, ref in zip(metadata, refs)
+    ]
+    original_ref = refs[0] if metadata and metadata[0].get('is_original') else None
+
+    # 내용을 포함할 버전 (제외할 순서대로: 오래된 최근 버전 -> 원본)
+    included = []
+    if original_ref is not None:
+        included.append(0)
+    included.extend(index for index in range(max(0, len(refs) - window), len(refs)) if index != 0)
+    included.sort(key=lambda index: (index == 0, index))
+
+    contents = {}
+    for index in included:
+        ref = refs[index]
+        if ref != current_ref and ref not in contents:
+            contents[ref] = history[index]['data']
+
+    payload = {
+        "type": "modify",
+        "is_modification": True,  # 수정 요청임을 명시하는 플래그
+        "payload_format": "compact",
+        "data": {
+            "current_request": user_input,  # 현재 수정 요청
+            "modification_request": user_input,
+            "user_request": user_input,
+            "current_content": result,  # 현재 결과 (한 번만 전송)
+            "current_ref": current_ref,
+            "original_ref": original_ref,  # 맨 처음 원본의 내용 해시
+            "modification_history": modification_history,  # 버전 정보 + 내용 해시
+            "contents": contents,  # 내용 해시 -> 내용 (현재 결과 제외)
+            "context": context  # 원본 폼 데이터
+        }
+    }
+
+    # 크기 상한을 넘으면 오래된 버전 내용부터 제외
+    size = payload_size(payload)
+    while size > max_bytes and contents:
+        contents.pop(next(iter(contents)))
+        size = payload_size(payload)
+    if size > max_bytes:
+        print(f"⚠️ 수정 요청이 크기 상한을 넘습니다: {size} > {max_bytes} bytes")
+    return payload
@@ -0,0 +1,600 @@
+import re
+from bisect import bisect_left
+from json.decoder import scanstring
+from components import json_codec, events
+
+# n8n 텍스트 출력의 섹션 헤더
+BLOG_SECTIONS = ('제목', '3줄 요약', '본문', '태그')
+INSTAGRAM_SECTIONS = ('후킹문구', '캡션', '해시태그')
+
+# 각주 구분선 / 각주 시작 문자 / 각주 중복 확인 키워드
+FOOTNOTE_RULE = '------'
+FOOTNOTE_MARK = '※'
+FOOTNOTE_KEYWORD = '천방케어는 MICROJET'
+
+# 스트리밍 섹션 경계 토큰: [섹션] 헤더, 각주 구분선, 빈 줄 뒤의 ※ 각주
+# 첫 글자를 문자 클래스로 두어 정규식 엔진이 후보 위치만 빠르게 찾도록 함
+_TOKEN_RE = re.compile(
+    r'[\[\n-](?:'
+    r'(?<=\[)(?P<section>' + '|'.join(re.escape(name) for name in BLOG_SECTIONS + INSTAGRAM_SECTIONS) + r')\][ \t\r]*\n'
+    r'|(?<=-)(?P<rule>' + FOOTNOTE_RULE[1:] + r')'
+    r'|(?<=\n)\n(?=' + FOOTNOTE_MARK + r'))'
+)
+
+# 전체 텍스트 파싱용 경계 토큰 (기존 섹션별 정규식과 같은 규칙)
+# - section: [섹션] 헤더 (뒤 공백에 줄바꿈 필요, gap 끝이 본문 시작)
+# - line: [로 시작하는 줄 (line_name: [태그]/[본문] 줄)
+# - rule: 각주 구분선 (------ 이상 연속된 -)
+# - note: 빈 줄 뒤의 ※ 각주
+# 헤더 뒤 공백은 소비하지 않아 그 안의 빈 줄 + ※ 경계도 찾음 (경계 위치는 첫 글자 위치)
+_BOUNDARY_RE = re.compile(
+    r'[\[\n-](?:'
+    r'(?<=\[)(?P<section>' + '|'.join(re.escape(name) for name in BLOG_SECTIONS + INSTAGRAM_SECTIONS) + r')\](?=(?P<gap>\s*\n))'
+    r'|(?<=\n)(?P<line>)(?=\[(?:(?P<line_name>태그|본문)\])?)'
+    r'|(?<=-)(?P<rule>' + FOOTNOTE_RULE[1:] + r'-*)'
+    r'|(?<=\n)(?P<note>)(?=\n' + FOOTNOTE_MARK + r'))'
+)
+# 구분선 바로 다음 줄의 ※ 각주 (끝까지)
+_FOOTNOTE_RE = re.compile(r'\s*\n(' + FOOTNOTE_MARK + r'.*)', re.DOTALL)
+
+# 섹션별 끝 경계 (END: 텍스트 끝)
+# 후킹문구/제목/태그는 [로 시작하는 줄에서 끝나고, [본문]은 [태그] 줄에서만 끝남
+# [3줄 요약]은 [본문] 줄, [캡션]은 다음 경계가 있어야만 인정 (기존 파서와 동일)
+END = 'end'
+SECTION_ENDS = {
+    '제목': ('line', END),
+    '3줄 요약': ('본문',),
+    '본문': ('태그', 'rule', 'note', END),
+    '태그': ('line', 'rule', 'note', END),
+    '후킹문구': ('line', END),
+    '캡션': ('line', 'rule', 'note'),
+    '해시태그': ('line', 'rule', 'note', END),
+}
+
+
+def empty_result():
+    """빈 광고 결과 (process_llm_response와 같은 형태)"""
+    return {
+        "headline": "",
+        "caption": "",
+        "hashtags": [],
+        "blog_title": "",
+        "blog_content": ""
+    }
+
+
+def split_sections(content):
+    """텍스트를 한 번 훑어서 섹션별 본문과 각주로 분리
+
+    각 섹션은 첫 번째 헤더에서 시작해 SECTION_ENDS의 경계 중 가장 가까운 곳에서 끝납니다.
+    끝 경계를 찾지 못한 섹션(끝까지 허용하지 않는 [3줄 요약], [캡션])은 결과에서 빠지고,
+    경계가 헤더 뒤 첫 줄바꿈 이후의 빈 줄 안에만 있으면 빈 섹션이 됩니다.
+
+    Args:
+        content (str): n8n 텍스트 출력
+
+    Returns:
+        tuple: ({섹션 이름: 본문}, 각주 텍스트)
+    """
+    starts = {}
+    # 경계 종류별 위치 (오름차순)
+    bounds = {'line': [], '태그': [], '본문': [], 'rule': [], 'note': []}
+    footnote = ""
+
+    for match in _BOUNDARY_RE.finditer(content):
+        if match.group('section') is not None:
+            starts.setdefault(match.group('section'), (match.start('gap'), match.end('gap')))
+        elif match.group('line') is not None:
+            bounds['line'].append(match.start())
+            if match.group('line_name'):
+                bounds[match.group('line_name')].append(match.start())
+        elif match.group('rule') is not None:
+            bounds['rule'].append(match.start())
+            if not footnote:
+                footnote_match = _FOOTNOTE_RE.match(content, match.end())
+                if footnote_match:
+                    footnote = footnote_match.group(1).strip()
+        else:
+            bounds['note'].append(match.start())
+
+    sections = {}
+    for name, (gap_start, start) in starts.items():
+        stop = _first_stop(bounds, SECTION_ENDS[name], start, len(content))
+        if stop is not None:
+            sections[name] = content[start:stop].strip()
+        elif _first_stop(bounds, SECTION_ENDS[name], content.index('\n', gap_start) + 1, len(content)) is not None:
+            sections[name] = ""
+
+    return sections, footnote
+
+
+def _first_stop(bounds, kinds, start, end):
+    # start 이후 가장 가까운 끝 경계 위치 (없으면 None)
+    stops = [end] if END in kinds else []
+    for kind in kinds:
+        if kind != END:
+            positions = bounds[kind]
+            index = bisect_left(positions, start)
+            if index < len(positions):
+                stops.append(positions[index])
+    return min(stops) if stops else None
+
+
+def parse_hashtags(text):
+    """공백/줄바꿈으로 구분된 해시태그 중 #으로 시작하는 것만 반환"""
+    return [tag for tag in text.split() if tag.startswith('#')]
+
+
+def _append_footnote(result, footnote, fields):
+    # 이미 각주가 들어 있지 않은 필드에만 각주 추가
+    if not footnote:
+        return
+    for field in fields:
+        if result[field] and FOOTNOTE_KEYWORD not in result[field]:
+            result[field] += f"\n\n{footnote}"
+
+
+def parse_blog_sections(content):
+    """블로그 형식 파싱 ([제목], [3줄 요약], [본문], [태그] 구조)
+
+    Args:
+        content (str): 파싱할 블로그 텍스트 콘텐츠
+
+    Returns:
+        dict: 파싱된 블로그 데이터
+    """
+    sections, footnote = split_sections(content)
+    result = empty_result()
+
+    # 블로그에서는 headline을 비워둠 (블로그 타이틀만 사용)
+    result["blog_title"] = sections.get('제목', "")
+
+    # [3줄 요약] + [본문] 합치기 (찾은 섹션은 비어 있어도 포함 - 기존 파서와 동일)
+    parts = [sections[name] for name in ('3줄 요약', '본문') if name in sections]
+    if parts:
+        result["blog_content"] = "\n\n".join(parts)
+        result["caption"] = result["blog_content"]  # 인스타그램용으로도 사용
+
+    result["hashtags"] = parse_hashtags(sections.get('태그', ""))
+    _append_footnote(result, footnote, ("blog_content", "caption"))
+    return result
+
+
+def parse_instagram_sections(content):
+    """인스타그램 형식 파싱 ([후킹문구], [캡션], [해시태그] 구조)
+
+    Args:
+        content (str): 파싱할 텍스트 콘텐츠
+
+    Returns:
+        dict: 파싱된 광고 데이터
+    """
+    sections, footnote = split_sections(content)
+    result = empty_result()
+
+    result["headline"] = sections.get('후킹문구', "")
+
+    if '캡션' in sections:
+        result["caption"] = sections['캡션']
+        # 블로그용으로도 사용 (후킹문구를 블로그 제목으로)
+        result["blog_content"] = result["caption"]
+        result["blog_title"] = result["headline"]
+
+    _append_footnote(result, footnote, ("caption", "blog_content"))
+    result["hashtags"] = parse_hashtags(sections.get('해시태그', ""))
+    return result
+
+
+# JSON 형태 응답에서 추출하는 필드
+JSON_FIELDS = ('headline', 'caption', 'hashtags', 'blog_title', 'blog_content')
+
+# 문자열 본문 (이스케이프를 건너뛰며 다음 따옴표 앞까지)
+_STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'[ \t\r\n]*')
+_WHITESPACE = ' \t\r\n'
+# 따옴표 없는 값의 끝
+_BARE_VALUE_END_RE = re.compile(r'[,\}\]"]')
+# 이 문자 앞의 따옴표만 문자열 끝으로 인정 (본문 속 따옴표 허용)
+_STRING_CLOSERS = ',:}]'
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '"': '"', '\\': '\\', '/': '/'}
+_ESCAPE_RE = re.compile(r'\\(u[0-9a-fA-F]{4}|.)', re.DOTALL)
+# ```json 코드 블록
+_FENCED_JSON_RE = re.compile(r'```json\s*\n(.+?)\n```', re.DOTALL)
+
+
+def _skip_whitespace(text, pos, end):
+    if pos < end and text[pos] in _WHITESPACE:
+        pos = _WHITESPACE_RE.match(text, pos, end).end()
+    return pos
+
+
+def _decode_string(raw):
+    # 이스케이프 해석 (깨진 이스케이프는 그대로 둠)
+    try:
+        value, close = scanstring(raw + '"', 0, False)
+        if close == len(raw) + 1:
+            return value
+    except ValueError:
+        pass
+    return _ESCAPE_RE.sub(
+        lambda m: chr(int(m.group(1)[1:], 16)) if len(m.group(1)) == 5 else _ESCAPES.get(m.group(1), m.group(1)),
+        raw
+    )
+
+
+def _read_string(text, pos, end):
+    # pos는 여는 따옴표 다음 위치. (해석한 문자열, 닫는 따옴표 다음 위치) 반환
+    # 뒤에 , : } ] 또는 끝이 오지 않는 따옴표는 본문 속 따옴표로 보고 계속 읽음
+
+    # 올바른 JSON 문자열은 C 구현으로 바로 해석
+    try:
+        value, close = scanstring(text, pos, False)
+    except ValueError:
+        pass
+    else:
+        if close <= end:
+            after = _skip_whitespace(text, close, end)
+            if after >= end or text[after] in _STRING_CLOSERS:
+                return value, close
+
+    start = pos
+    while True:
+        pos = _STRING_BODY_RE.match(text, pos, end).end()
+        if pos >= end:
+            # 닫히지 않은 문자열은 끝까지
+            return _decode_string(text[start:end]), end
+        after = _skip_whitespace(text, pos + 1, end)
+        if after >= end or text[after] in _STRING_CLOSERS:
+            return _decode_string(text[start:pos]), pos + 1
+        pos += 1
+
+
+def _read_value(text, pos, end):
+    # ':' 다음 값 읽기. (값, 다음 위치) 반환 - 문자열/문자열 배열/따옴표 없는 값
+    pos = _skip_whitespace(text, pos, end)
+    if pos >= end:
+        return "", end
+
+    char = text[pos]
+    if char == '"':
+        value, pos = _read_string(text, pos + 1, end)
+        return value.strip(), pos
+
+    if char == '[':
+        items = []
+        pos += 1
+        while True:
+            pos = _skip_whitespace(text, pos, end)
+            if pos >= end:
+                return items, end
+            char = text[pos]
+            if char == ']':
+                return items, pos + 1
+            if char == '}':
+                # 닫히지 않은 배열 뒤에 객체가 끝난 경우
+                return items, pos
+            if char == ',':
+                pos += 1
+            elif char == '"':
+                value, pos = _read_string(text, pos + 1, end)
+                items.append(value.strip())
+            else:
+                match = _BARE_VALUE_END_RE.search(text, pos, end)
+                value_end = match.start() if match else end
+                value = text[pos:value_end].strip()
+                if value:
+                    items.append(value)
+                pos = value_end
+
+    if char in '{,}':
+        # 객체/빈 값은 빈 문자열로 처리 (객체 안은 계속 훑음)
+        return "", pos
+
+    match = _BARE_VALUE_END_RE.search(text, pos, end)
+    value_end = match.start() if match else end
+    value = text[pos:value_end].strip()
+    if value in ('null', '\\'):
+        value = ""
+    return value, value_end
+
+
+def scan_json_fields(content, fields=JSON_FIELDS):
+    """깨진 JSON에도 견디는 단일 패스 필드 추출
+
+    닫히지 않은 문자열, 이스케이프된 따옴표, 본문 속 따옴표, 뒤에 붙은 잡음,
+    ```json 코드 블록을 처리합니다. 같은 필드가 여러 번 나오면 첫 번째 값을 사용합니다.
+
+    Args:
+        content (str): JSON 형태의 LLM 출력
+        fields (tuple): 추출할 필드 이름
+
+    Returns:
+        dict: 찾은 필드만 담은 {필드: 문자열 또는 문자열 리스트}
+    """
+    start, end = 0, len(content)
+    fence = content.find('```json')
+    if fence >= 0:
+        start = fence + len('```json')
+        fence_end = content.find('```', start)
+        if fence_end >= 0:
+            end = fence_end
+
+    wanted = set(fields)
+    found = {}
+    pos = start
+    while wanted:
+        pos = content.find('"', pos, end)
+        if pos < 0:
+            break
+        key, pos = _read_string(content, pos + 1, end)
+        after = _skip_whitespace(content, pos, end)
+        if after < end and content[after] == ':':
+            value, pos = _read_value(content, after + 1, end)
+            if key in wanted:
+                found[key] = value
+                wanted.discard(key)
+    return found
+
+
+def normalize_llm_response(response_data):
+    """웹훅 응답을 화면에 바로 표시할 수 있는 결과로 변환 (streamlit 없이 사용 가능)
+
+    Args:
+        response_data (dict or list): 웹훅 응답 데이터
+
+    Returns:
+        dict: 파싱된 광고 데이터 (헤드라인, 캡션, 해시태그, 블로그 제목, 블로그 내용)
+    """
+    # 응답이 리스트인 경우 첫 번째 항목 사용
+    if isinstance(response_data, list) and len(response_data) > 0:
+        response_data = response_data[0]
+
+    # 1. 응답에서 콘텐츠 추출
+    content = response_data.get('output')
+    if content and isinstance(content, str):
+        # 블로그 형식 ([제목], [3줄 요약], [본문], [태그]), 그 외는 인스타그램 형식
+        if '[제목]' in content and '[본문]' in content:
+            return parse_blog_sections(content)
+        return parse_instagram_sections(content)
+
+    if 'content' in response_data:
+        content = response_data['content']
+    elif 'data' in response_data and isinstance(response_data['data'], dict):
+        # API 응답이 data 키에 내용을 포함하는 경우
+        return response_data['data']
+
+    # 콘텐츠가 없는 경우 빈 결과 반환
+    if not content:
+        return empty_result()
+
+    result = {}
+
+    # 2. JSON 콘텐츠 추출 시도 (```json ... ```)
+    json_match = _FENCED_JSON_RE.search(content)
+    if json_match:
+        try:
+            parsed_json = json_codec.loads(json_match.group(1).strip())
+        except ValueError:
+            parsed_json = None
+        if isinstance(parsed_json, dict):
+            for field in ['headline', 'blog_title', 'caption', 'blog_content']:
+                if field in parsed_json:
+                    result[field] = parsed_json[field]
+
+            hashtags = parsed_json.get('hashtags')
+            if isinstance(hashtags, str):
+                hashtags_text = hashtags.strip()
+                if '#' in hashtags_text:
+                    result['hashtags'] = hashtags_text.split()
+                else:
+                    result['hashtags'] = [f"#{tag.strip()}" for tag in hashtags_text.split()]
+            elif isinstance(hashtags, list):
+                result['hashtags'] = hashtags
+
+    # 3. 깨진 JSON에도 견디는 스캐너로 비어있는 필드만 채움
+    scanned = scan_json_fields(content)
+    for field in ['blog_title', 'blog_content', 'headline', 'caption']:
+        if field not in result:
+            value = scanned.get(field, "")
+            result[field] = value if isinstance(value, str) else " ".join(value)
+
+    if 'hashtags' not in result:
+        hashtags = scanned.get('hashtags', [])
+        # 문자열 형태의 해시태그는 공백으로 분리
+        result['hashtags'] = hashtags.split() if isinstance(hashtags, str) else hashtags
+
+    return result
+
+
+def parse_blog_format(content):
+    """블로그 형식 파싱 ([제목], [3줄 요약], [본문], [태그] 구조)
+
+    Args:
+        content (str): 파싱할 블로그 텍스트 콘텐츠
+
+    Returns:
+        dict: 파싱된 블로그 데이터
+    """
+    try:
+        result = parse_blog_sections(content)
+        if result["blog_content"]:
+            events.debug(f"📄 블로그 본문 길이: {len(result['blog_content'])}")
+        return result
+
+    except Exception as e:
+        events.error(f"블로그 형식 파싱 오류: {str(e)}")
+        # 오류 발생 시 빈 결과 반환
+        return empty_result()
+
+
+def parse_instagram_format(content):
+    """새로운 텍스트 형식 파싱 ([후킹문구], [캡션], [해시태그] 구조)
+
+    Args:
+        content (str): 파싱할 텍스트 콘텐츠
+
+    Returns:
+        dict: 파싱된 광고 데이터
+    """
+    try:
+        return parse_instagram_sections(content)
+
+    except Exception as e:
+        events.error(f"새로운 텍스트 형식 파싱 오류: {str(e)}")
+        # 오류 발생 시 빈 결과 반환
+        return empty_result()
+
+
+def process_llm_response(response_data):
+    """웹훅 응답을 파싱하여 응용 프로그램에 맞는 형식으로 변환 (오류는 events로 전달)
+
+    Args:
+        response_data (dict or list): 웹훅 응답 데이터
+
+    Returns:
+        dict: 파싱된 광고 데이터 (헤드라인, 캡션, 해시태그, 블로그 제목, 블로그 내용)
+    """
+    try:
+        events.debug(f"🔍 응답 데이터 타입: {type(response_data)}")
+        return normalize_llm_response(response_data)
+
+    except Exception as e:
+        events.error(f"⚠️ 응답 처리 중 오류 발생: {str(e)}")
+        # 오류 발생 시 원래 데이터 반환
+        return response_data
+
+
+# 청크 경계에 걸친 토큰을 놓치지 않도록 다음 청크가 올 때까지 다시 훑는 끝부분 길이
+STREAM_HOLDBACK = 32
+
+
+class StreamingSectionParser:
+    """청크 단위로 도착하는 텍스트에서 완성된 섹션과 문단을 바로 내보내는 증분 파서
+
+    feed()/finish()는 새로 완성된 이벤트 목록을 반환합니다.
+    - {"type": "section", "name": 섹션 이름, "text": 섹션 전체}: 다음 경계가 보여 끝난 섹션
+      (본문/캡션은 문단 이벤트로 내용을 이미 보냈으므로 text는 빈 문자열)
+    - {"type": "paragraph", "name": 섹션 이름, "text": 문단}: 본문/캡션에서 빈 줄로 끝난 문단
+
+    상태는 기본 자료형뿐이라 to_state()/from_state()로 결과 저장소에 저장할 수 있습니다.
+    to_state()는 이벤트로 이미 내보낸 앞부분을 빼고 아직 확정하지 않은 끝부분만 담습니다.
+    최종 결과는 finish() 후 result()로 기존 파서와 같은 형태로 받습니다
+    (처음부터 모든 조각을 받은 파서만 가능, from_state()로 복원한 파서는 ValueError).
+    """
+
+    # 문단 단위로 먼저 내보내는 긴 섹션
+    PARAGRAPH_SECTIONS = ('본문', '캡션')
+
+    def __init__(self):
+        self.buffer = ""
+        self.scan_pos = 0
+        self.current = None
+        self.section_start = 0
+        self.paragraph_pos = 0
+        # 닫힌 섹션 이름 (같은 섹션이 다시 나오면 첫 번째만 사용)
+        self.closed_sections = []
+        # to_state()에서 잘라낸 앞부분 길이
+        self.dropped = 0
+        self.finished = False
+
+    @classmethod
+    def from_state(cls, state):
+        """to_state()로 저장한 상태에서 파서 복원"""
+        parser = cls()
+        parser.__dict__.update(state)
+        return parser
+
+    def to_state(self):
+        """저장 가능한 상태 딕셔너리 반환 (아직 확정하지 않은 끝부분과 위치만, 조각 수와 관계없이 작음)"""
+        if self.current is None or self.current in self.closed_sections:
+            start = self.scan_pos
+        elif self.current in self.PARAGRAPH_SECTIONS:
+            start = min(self.paragraph_pos, self.scan_pos)
+        else:
+            # 짧은 섹션(제목, 해시태그 등)은 닫을 때 전체 텍스트가 필요
+            start = self.section_start
+        state = dict(self.__dict__)
+        state.update(
+            buffer=self.buffer[start:],
+            scan_pos=self.scan_pos - start,
+            section_start=max(0, self.section_start - start),
+            paragraph_pos=max(0, self.paragraph_pos - start),
+            closed_sections=list(self.closed_sections),
+            dropped=self.dropped + start
+        )
+        return state
+
+    def feed(self, chunk):
+        """텍스트 조각 추가 후 새로 완성된 이벤트 반환"""
+        if self.finished:
+            raise ValueError("이미 종료된 스트림입니다.")
+        self.buffer += chunk
+        return self._scan(final=False)
+
+    def finish(self):
+        """스트림 종료 - 남은 섹션을 닫고 마지막 이벤트 반환"""
+        if self.finished:
+            return []
+        events = self._scan(final=True)
+        self.finished = True
+        return events
+
+    def result(self):
+        """전체 텍스트의 최종 파싱 결과 (process_llm_response와 같은 형태)"""
+        if self.dropped:
+            raise ValueError("앞부분을 잘라낸 상태에서 복원한 파서는 전체 결과를 만들 수 없습니다.")
+        if '[제목]' in self.buffer and '[본문]' in self.buffer:
+            return parse_blog_sections(self.buffer)
+        return parse_instagram_sections(self.buffer)
+
+    def _scan(self, final):
+        events = []
+        buffer = self.buffer
+        # 끝부분은 다음 조각과 이어질 수 있으므로 종료 전까지 확정하지 않음
+        limit = len(buffer) if final else max(self.scan_pos, len(buffer) - STREAM_HOLDBACK)
+        pos = self.scan_pos
+
+        for match in _TOKEN_RE.finditer(buffer, self.scan_pos):
+            if match.end() > limit:
+                limit = match.start()
+                break
+            self._emit_paragraphs(match.start(), events)
+            self._close_section(match.start(), events)
+
+            self.current = match.group('section')
+            self.section_start = self.paragraph_pos = pos = match.end()
+
+        self.scan_pos = max(pos, limit)
+        self._emit_paragraphs(self.scan_pos, events)
+        if final:
+            self._close_section(len(buffer), events)
+            self.current = None
+        return events
+
+    def _emit_paragraphs(self, end, events):
+        # 현재 섹션에서 end 앞까지 빈 줄로 끝난 문단 내보내기
+        if self.current not in self.PARAGRAPH_SECTIONS or self.current in self.closed_sections:
+            return
+        while True:
+            index = self.buffer.find("\n\n", self.paragraph_pos, end + 1)
+            if index < 0:
+                return
+            text = self.buffer[self.paragraph_pos:index].strip()
+            self.paragraph_pos = index + 2
+            if text:
+                events.append({"type": "paragraph", "name": self.current, "text": text})
+
+    def _close_section(self, end, events):
+        # 같은 섹션이 다시 나오면 첫 번째만 사용
+        if self.current is None or self.current in self.closed_sections:
+            return
+        if self.current in self.PARAGRAPH_SECTIONS:
+            text = self.buffer[self.paragraph_pos:end].strip()
+            if text:
+                events.append({"type": "paragraph", "name": self.current, "text": text})
+            # 내용은 문단 이벤트로 보냈으므로 섹션 앞부분을 보관하지 않음
+            text = ""
+        else:
+            text = self.buffer[self.section_start:end].strip()
+        self.closed_sections.append(self.current)
+        events.append({"type": "section", "name": self.current, "text": text})
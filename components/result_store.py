@@ -0,0 +1,484 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from multiprocessing.managers import BaseManager
+
+
+class ResultStore:
+    """작업 결과 저장소 인터페이스
+
+    api.py는 이 인터페이스만 사용하므로 백엔드(메모리, 디스크 등)를 교체할 수 있습니다.
+    """
+
+    backend = "base"
+
+    def get(self, job_id):
+        """결과 조회 (없거나 만료되었으면 None)"""
+        raise NotImplementedError
+
+    def set(self, job_id, record):
+        """결과 저장"""
+        raise NotImplementedError
+
+    def sweep(self):
+        """만료된 항목 정리 후 정리된 개수 반환"""
+        return 0
+
+    def stats(self):
+        """저장소 상태 카운터 반환"""
+        return {"backend": self.backend}
+
+    def close(self):
+        """저장소 종료 처리"""
+        pass
+
+
+def estimate_size(record):
+    """레코드의 대략적인 메모리 크기 (JSON 직렬화 바이트 수)"""
+    try:
+        return len(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(record).encode("utf-8"))
+
+
+class MemoryResultStore(ResultStore):
+    """메모리 기반 결과 저장소 (LRU + TTL)
+
+    Args:
+        max_entries (int): 최대 보관 항목 수
+        max_bytes (int): 최대 보관 바이트 수 (레코드 JSON 크기 기준)
+        ttl (float): 항목 유효 시간 (초)
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries=1000, max_bytes=50 * 1024 * 1024, ttl=3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # job_id -> (record, size, expires_at), 오래 사용하지 않은 순서
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, job_id):
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            record, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(job_id)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(job_id)
+            self.hits += 1
+            return record
+
+    def set(self, job_id, record):
+        size = estimate_size(record)
+        with self._lock:
+            if job_id in self._entries:
+                self._remove(job_id)
+
+            self._entries[job_id] = (record, size, time.monotonic() + self.ttl)
+            self._bytes += size
+
+            # 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+            # (새로 넣은 항목은 한도보다 크더라도 유지)
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def sweep(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, (_, _, expires_at) in self._entries.items() if expires_at <= now]
+            for job_id in expired:
+                self._remove(job_id)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, job_id):
+        _, size, _ = self._entries.pop(job_id)
+        self._bytes -= size
+
+
+class SQLiteResultStore(ResultStore):
+    """SQLite(WAL) 기반 결과 저장소 - 서버 재시작 후에도 결과 유지
+
+    쓰기는 JSON으로 직렬화해 메모리 대기열에 넣고 즉시 반환하며, 백그라운드 스레드가
+    flush_interval 간격(또는 batch_size 도달 시)으로 한 트랜잭션에 모아 커밋합니다.
+    커밋 전 결과도 대기열에서 바로 조회됩니다 (조회할 때마다 새 객체를 반환하므로
+    호출한 쪽이 결과를 수정해도 저장된 값이나 커밋 중인 값은 바뀌지 않습니다).
+
+    Args:
+        path (str): 데이터베이스 파일 경로
+        max_entries (int): 최대 보관 항목 수 (정리 시 오래된 항목부터 삭제)
+        ttl (float): 항목 유효 시간 (초)
+        flush_interval (float): 배치 커밋 주기 (초)
+        batch_size (int): 즉시 커밋을 유발하는 대기열 크기
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path="results.db", max_entries=100000, ttl=3600,
+                 flush_interval=0.05, batch_size=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "job_id TEXT PRIMARY KEY, "
+            "record TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_expires_at ON results (expires_at)")
+        self._db_lock = threading.Lock()
+
+        # 커밋 대기 중인 쓰기: job_id -> (직렬화한 record, stored_at, expires_at)
+        self._pending = {}
+        # 커밋 중인 배치 (커밋이 끝날 때까지 조회 가능하도록 유지)
+        self._flushing = {}
+        # 대기열과 통계 카운터 보호
+        self._pending_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="result-store-flusher", daemon=True)
+        self._flusher.start()
+
+    def get(self, job_id):
+        now = time.time()
+        with self._pending_lock:
+            entry = self._pending.get(job_id) or self._flushing.get(job_id)
+            if entry is not None and entry[2] > now:
+                self.hits += 1
+                return json.loads(entry[0])
+
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT record, expires_at FROM results WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        with self._pending_lock:
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, job_id, record):
+        now = time.time()
+        # 호출한 쪽이 record를 계속 수정해도 커밋 중인 값이 바뀌지 않도록 여기서 직렬화
+        text = json.dumps(record, ensure_ascii=False, default=str)
+        with self._pending_lock:
+            self._pending[job_id] = (text, now, now + self.ttl)
+            pending_count = len(self._pending)
+        if pending_count >= self.batch_size:
+            self._flush_requested.set()
+
+    def flush(self):
+        """대기열의 쓰기를 한 트랜잭션으로 커밋"""
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            batch = self._pending
+            self._pending = {}
+            self._flushing = batch
+
+        rows = [(job_id, text, stored_at, expires_at) for job_id, (text, stored_at, expires_at) in batch.items()]
+        try:
+            with self._db_lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (job_id, record, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+        except Exception:
+            # 실패한 배치는 (그 사이 들어온 최신 값을 덮어쓰지 않도록) 대기열로 되돌림
+            with self._db_lock:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+            with self._pending_lock:
+                for job_id, entry in batch.items():
+                    self._pending.setdefault(job_id, entry)
+                self._flushing = {}
+            raise
+
+        with self._pending_lock:
+            self._flushing = {}
+            self.flushes += 1
+            self.flushed_rows += len(rows)
+        return len(rows)
+
+    def sweep(self):
+        now = time.time()
+        with self._pending_lock:
+            expired_pending = [job_id for job_id, (_, _, expires_at) in self._pending.items() if expires_at <= now]
+            for job_id in expired_pending:
+                del self._pending[job_id]
+
+        with self._db_lock:
+            expired = self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+            # 최대 항목 수를 넘는 오래된 항목 정리
+            evicted = self._conn.execute(
+                "DELETE FROM results WHERE job_id IN ("
+                "SELECT job_id FROM results ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+
+        with self._pending_lock:
+            self.expirations += expired + len(expired_pending)
+            self.evictions += evicted
+        return expired + len(expired_pending) + evicted
+
+    def stats(self):
+        with self._db_lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        with self._pending_lock:
+            return {
+                "backend": self.backend,
+                "path": self.path,
+                "entries": entries,
+                "pending_writes": len(self._pending),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "flushes": self.flushes,
+                "flushed_rows": self.flushed_rows,
+            }
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_requested.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ 결과 저장소 커밋 오류: {str(e)}")
+
+
+class _ResultStoreServer(BaseManager):
+    """결과 저장소 공유 서버"""
+
+
+class _ResultStoreClient(BaseManager):
+    """결과 저장소 공유 서버 접속용 클라이언트"""
+
+
+_ResultStoreClient.register("get_store")
+
+
+def parse_store_address(address):
+    """'host:port' 또는 유닉스 소켓 경로를 multiprocessing 주소로 변환"""
+    if "/" in address:
+        return address
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+class SharedResultStore(ResultStore):
+    """별도 프로세스의 결과 저장소를 로컬 소켓으로 공유하는 클라이언트
+
+    uvicorn 워커가 여러 개일 때 모든 워커가 같은 저장소를 보도록 합니다.
+    서버는 `python -m components.result_store` 로 실행합니다.
+    서버와 pickle로 통신하므로 인증 키를 아는 프로세스는 서버에서 코드를 실행할 수 있습니다.
+    인증 키는 기본값 없이 RESULT_STORE_AUTHKEY로 받습니다 (start_servers.py는 실행마다 새로 생성).
+
+    Args:
+        address (str): 'host:port' 또는 유닉스 소켓 경로
+        authkey (bytes): 서버 인증 키
+    """
+
+    backend = "shared"
+
+    def __init__(self, address, authkey):
+        if not authkey:
+            raise ValueError("공유 결과 저장소 인증 키가 없습니다. (RESULT_STORE_AUTHKEY)")
+        self.address = address
+        self.authkey = authkey
+        self._store = None
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        return self._call("get", job_id)
+
+    def set(self, job_id, record):
+        self._call("set", job_id, record)
+
+    def sweep(self):
+        return self._call("sweep")
+
+    def stats(self):
+        stats = self._call("stats")
+        stats["shared_backend"] = stats.get("backend")
+        stats["backend"] = self.backend
+        stats["address"] = self.address
+        return stats
+
+    def _connect(self):
+        client = _ResultStoreClient(address=parse_store_address(self.address), authkey=self.authkey)
+        client.connect()
+        return client.get_store()
+
+    def _call(self, method, *args):
+        # 서버가 재시작된 경우를 대비해 한 번 재접속 후 재시도
+        for attempt in range(2):
+            with self._lock:
+                if self._store is None:
+                    self._store = self._connect()
+                store = self._store
+            try:
+                return getattr(store, method)(*args)
+            except (ConnectionError, EOFError, OSError):
+                with self._lock:
+                    self._store = None
+                if attempt:
+                    raise
+
+
+def shared_store_authkey():
+    """RESULT_STORE_AUTHKEY 값 (설정되지 않았으면 ValueError - 공개된 기본 키로 서버를 열지 않음)"""
+    authkey = os.getenv("RESULT_STORE_AUTHKEY", "")
+    if not authkey:
+        raise ValueError("공유 결과 저장소 인증 키가 없습니다. (RESULT_STORE_AUTHKEY)")
+    return authkey.encode("utf-8")
+
+
+def serve_result_store(store, address, authkey):
+    """결과 저장소를 로컬 소켓으로 공유하는 서버 실행 (종료될 때까지 블록)"""
+    if not authkey:
+        raise ValueError("공유 결과 저장소 인증 키가 없습니다. (RESULT_STORE_AUTHKEY)")
+    _ResultStoreServer.register(
+        "get_store",
+        callable=lambda: store,
+        exposed=("get", "set", "sweep", "stats")
+    )
+    server = _ResultStoreServer(address=parse_store_address(address), authkey=authkey).get_server()
+    print(f"🗄️ 결과 저장소 공유 서버 시작: {address} ({store.backend})")
+    try:
+        server.serve_forever()
+    finally:
+        store.close()
+
+
+def create_result_store(backend=None):
+    """환경변수 설정에 맞는 결과 저장소 생성
+
+    RESULT_STORE_BACKEND: 저장소 종류 (memory, sqlite, shared)
+    RESULT_STORE_MAX_ENTRIES: 최대 항목 수
+    RESULT_STORE_MAX_BYTES: 최대 바이트 수 (memory)
+    RESULT_STORE_TTL: 항목 유효 시간 (초)
+    RESULT_STORE_PATH: 데이터베이스 파일 경로 (sqlite)
+    RESULT_STORE_FLUSH_INTERVAL: 배치 커밋 주기 (초, sqlite)
+    RESULT_STORE_BATCH_SIZE: 즉시 커밋 대기열 크기 (sqlite)
+    RESULT_STORE_ADDRESS: 공유 서버 주소 'host:port' 또는 소켓 경로 (shared)
+    RESULT_STORE_AUTHKEY: 공유 서버 인증 키 (shared, 필수)
+    RESULT_STORE_SHARED_BACKEND: 공유 서버가 사용할 저장소 종류 (memory, sqlite)
+    """
+    if backend is None:
+        backend = os.getenv("RESULT_STORE_BACKEND", "memory")
+    backend = backend.lower()
+    max_entries = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "1000"))
+    max_bytes = int(os.getenv("RESULT_STORE_MAX_BYTES", str(50 * 1024 * 1024)))
+    ttl = float(os.getenv("RESULT_STORE_TTL", "3600"))
+
+    if backend == "memory":
+        return MemoryResultStore(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+    if backend == "sqlite":
+        return SQLiteResultStore(
+            path=os.getenv("RESULT_STORE_PATH", "results.db"),
+            max_entries=max_entries,
+            ttl=ttl,
+            flush_interval=float(os.getenv("RESULT_STORE_FLUSH_INTERVAL", "0.05")),
+            batch_size=int(os.getenv("RESULT_STORE_BATCH_SIZE", "100"))
+        )
+
+    if backend == "shared":
+        return SharedResultStore(
+            address=os.getenv("RESULT_STORE_ADDRESS", "127.0.0.1:8765"),
+            authkey=shared_store_authkey()
+        )
+
+    raise ValueError(f"알 수 없는 결과 저장소 종류입니다: {backend}")
+
+
+# 공유 서버 실행 (uvicorn 다중 워커용)
+if __name__ == "__main__":
+    shared_backend = os.getenv("RESULT_STORE_SHARED_BACKEND", "memory")
+    if shared_backend.lower() == "shared":
+        raise SystemExit("공유 서버의 저장소 종류로 shared를 사용할 수 없습니다.")
+    try:
+        authkey = shared_store_authkey()
+    except ValueError as e:
+        raise SystemExit(f"❌ {str(e)}")
+    serve_result_store(
+        create_result_store(shared_backend),
+        os.getenv("RESULT_STORE_ADDRESS", "127.0.0.1:8765"),
+        authkey
+    )
@@ -1,5 +1,6 @@
 import streamlit as st
 from datetime import datetime
+from components.version_store import VersionStore
 
 def init_session_state():
     """세션 상태 초기화"""
@@ -15,9 +16,9 @@ def init_session_state():
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     
-    # 버전 관리
+    # 버전 관리 (필드별 변경분만 보관)
     if 'version_history' not in st.session_state:
-        st.session_state.version_history = []
+        st.session_state.version_history = VersionStore()
     
     # 폼 데이터 저장
     if 'form_data' not in st.session_state:
@@ -42,16 +43,16 @@ def restore_version(version):
     if not 'version_history' in st.session_state or version < 1 or version > len(st.session_state.version_history):
         return
     
-    # 선택한 버전의 데이터로 복원
+    # 선택한 버전의 데이터로 복원 (조회할 때마다 새 딕셔너리가 만들어짐)
     version_data = st.session_state.version_history[version-1]['data']
-    st.session_state.result = version_data.copy()
+    st.session_state.result = version_data
     
     # 새 버전으로 추가
     new_version = len(st.session_state.version_history) + 1
     st.session_state.version_history.append({
         'version': new_version,
         'timestamp': datetime.now().strftime("%H:%M:%S"),
-        'data': version_data.copy()
+        'data': version_data
     })
     
     st.success(f"버전 {version}에서 복원되었습니다.")
@@ -1,18 +1,81 @@
 import os
 import uuid
 import json
-from supabase import create_client
+import threading
+import httpx
+import supabase as supabase_py
+from postgrest import SyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+from postgrest.utils import SyncClient
 from dotenv import load_dotenv
+from components import events
 
 # 환경변수 로드
 load_dotenv()
 
-# Supabase 클라이언트 생성
-supabase = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_KEY")
+# 연결 풀 설정
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "10"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+
+# 캐시를 우회하는 조회에 붙이는 헤더
+FRESH_READ_HEADERS = {"Cache-Control": "no-cache", "Pragma": "no-cache"}
+
+# 프로세스 전체에서 공유하는 keep-alive 연결 풀
+_transport = httpx.HTTPTransport(
+    limits=httpx.Limits(
+        max_connections=SUPABASE_POOL_SIZE,
+        max_keepalive_connections=SUPABASE_POOL_SIZE,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY
+    )
 )
 
+class PooledPostgrestClient(SyncPostgrestClient):
+    """공유 연결 풀을 사용하는 데이터(PostgREST) 전용 클라이언트
+    
+    로그인하지 않고 항상 서비스 키로 요청하므로, 다른 사용자의 로그인/로그아웃에 영향을 받지 않습니다.
+    """
+    
+    def create_session(self, base_url, headers, timeout):
+        return SyncClient(base_url=base_url, headers=headers, timeout=timeout, transport=_transport)
+
+_auth_client = None
+_data_client = None
+_client_lock = threading.Lock()
+
+def get_supabase_client():
+    """로그인/관리자 화면에서 쓰는 Supabase 클라이언트 (인증 세션을 가짐)
+    
+    로그인하면 이 클라이언트의 데이터 요청은 로그인한 사용자 토큰으로 나갑니다.
+    작업 상태 조회에는 get_data_client()를 사용합니다.
+    """
+    global _auth_client
+    if _auth_client is None:
+        with _client_lock:
+            if _auth_client is None:
+                _auth_client = supabase_py.create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    return _auth_client
+
+def get_data_client():
+    """작업 상태 조회용 데이터 클라이언트 (인증 클라이언트와 분리, 공유 연결 풀 사용)"""
+    global _data_client
+    if _data_client is None:
+        with _client_lock:
+            if _data_client is None:
+                key = os.getenv("SUPABASE_KEY")
+                _data_client = PooledPostgrestClient(
+                    f"{os.getenv('SUPABASE_URL')}/rest/v1",
+                    headers={**DEFAULT_POSTGREST_CLIENT_HEADERS, "apiKey": key, "Authorization": f"Bearer {key}"}
+                )
+    return _data_client
+
+def fresh_read(query):
+    """조회 요청에 캐시 우회 헤더 추가 (클라이언트를 새로 만들지 않고 최신 데이터 조회)"""
+    query.headers.update(FRESH_READ_HEADERS)
+    return query
+
+# 작업 상태 조회 클라이언트 (공유 연결 풀)
+supabase = get_data_client()
+
 def create_job(data):
     """새 작업 생성 및 job_id 반환"""
     job_id = str(uuid.uuid4())
@@ -39,49 +102,38 @@ def get_job_status(job_id):
         print(f"작업 상태 확인 오류: {str(e)}")
         return None
 
-def get_job_result(job_id):
-    """작업 결과 확인"""
+def get_job_result(job_id, fresh=True):
+    """작업 결과 확인
+    
+    Args:
+        job_id (str): 작업 ID
+        fresh (bool): 캐시를 우회해 최신 데이터를 조회할지 여부
+    """
     try:
-        import streamlit as st
-        from supabase import create_client
-        import os
-        
-        # 새로운 Supabase 클라이언트 생성 (캐싱 이슈 방지)
-        fresh_supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
-        
-        # 최신 데이터 조회
-        all_response = fresh_supabase.table("job_status").select("*").eq("job_id", job_id).execute()
-        st.info(f"🔍 job_id {job_id[:8]}...로 검색한 결과: {len(all_response.data)}개")
+        # 최신 데이터 조회 (공유 클라이언트 재사용)
+        query = supabase.table("job_status").select("*").eq("job_id", job_id)
+        if fresh:
+            query = fresh_read(query)
+        all_response = query.execute()
+        events.debug(f"🔍 job_id {job_id[:8]}...로 검색한 결과: {len(all_response.data)}개")
         
         if all_response.data:
             record = all_response.data[0]
-            st.info(f"📊 실시간 레코드 상태: {record.get('status')} (완료시간: {record.get('completed_at')})")
+            events.debug(f"📊 실시간 레코드 상태: {record.get('status')} (완료시간: {record.get('completed_at')})")
             
             # completed 상태인지 확인
             if record.get('status') == 'completed':
-                st.success("✅ 완료된 작업을 찾았습니다!")
-                st.info(f"📄 result 크기: {len(str(record.get('result', '')))}")
-                st.info(f"📊 result_data 타입: {type(record.get('result_data'))}")
+                events.success("✅ 완료된 작업을 찾았습니다!")
+                events.debug(f"📄 result 크기: {len(str(record.get('result', '')))}")
+                events.debug(f"📊 result_data 타입: {type(record.get('result_data'))}")
                 return record
             else:
-                st.warning(f"⏳ 작업이 아직 {record.get('status')} 상태입니다.")
-                # 강제로 다시 새로고침 (더 자주)
-                st.markdown("""
-                <script>
-                    setTimeout(function() {
-                        window.location.reload();
-                    }, 3000);
-                </script>
-                """, unsafe_allow_html=True)
+                events.warning(f"⏳ 작업이 아직 {record.get('status')} 상태입니다.")
                 return None
         else:
-            st.error("❌ 해당 job_id를 찾을 수 없습니다.")
+            events.error("❌ 해당 job_id를 찾을 수 없습니다.")
             return None
             
     except Exception as e:
-        import streamlit as st
-        st.error(f"작업 결과 확인 오류: {str(e)}")
-        return None
\ No newline at end of file
+        events.error(f"작업 결과 확인 오류: {str(e)}")
+        return None
@@ -0,0 +1,176 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import threading
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# Supabase 프로젝트 JWT 시크릿 (Settings > API > JWT Secret). 없으면 네트워크 검증만 사용
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+
+# 검증 결과 캐시 유효 시간 (초)
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))
+# 만료가 이 시간(초) 이내로 남으면 네트워크로 다시 확인
+TOKEN_EXPIRY_MARGIN = float(os.getenv("TOKEN_EXPIRY_MARGIN", "60"))
+# 로컬 검증만으로 버티는 최대 시간 (초) - 이후 네트워크로 폐기 여부 확인
+TOKEN_REVOCATION_CHECK_INTERVAL = float(os.getenv("TOKEN_REVOCATION_CHECK_INTERVAL", "300"))
+# 캐시 최대 항목 수
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "1000"))
+
+
+class InvalidTokenError(ValueError):
+    """유효하지 않은 JWT"""
+
+
+class UnverifiableTokenError(ValueError):
+    """로컬에서 검증할 수 없는 JWT (HS256이 아닌 서명 - 네트워크로 확인)"""
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def decode_jwt(token, secret, leeway=0):
+    """HS256 JWT 서명과 만료를 확인하고 클레임 반환
+
+    Raises:
+        InvalidTokenError: 형식/서명/만료가 올바르지 않은 경우
+        UnverifiableTokenError: 시크릿으로 확인할 수 없는 서명 알고리즘 (RS256/ES256 등)
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        claims = json.loads(_b64decode(payload_b64))
+        signature = _b64decode(signature_b64)
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidTokenError("JWT 형식이 올바르지 않습니다.")
+
+    if header.get("alg") != "HS256":
+        raise UnverifiableTokenError(f"로컬에서 검증할 수 없는 서명 알고리즘입니다: {header.get('alg')}")
+
+    expected = hmac.new(secret.encode("utf-8"), f"{header_b64}.{payload_b64}".encode("ascii"), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidTokenError("JWT 서명이 올바르지 않습니다.")
+
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)) or exp + leeway <= time.time():
+        raise InvalidTokenError("JWT가 만료되었습니다.")
+
+    return claims
+
+
+class TokenValidator:
+    """액세스 토큰 검증기 (로컬 JWT 검증 + 짧은 토큰별 캐시)
+
+    캐시 또는 로컬 서명 검증으로 대부분의 확인을 네트워크 없이 처리하고,
+    만료가 가까워졌거나 마지막 네트워크 확인 후 revocation_check_interval이 지난
+    경우에만 fetch_user(token)로 Supabase에 확인합니다.
+
+    Args:
+        fetch_user (callable): 토큰으로 사용자를 조회하는 함수 (실패 시 None 반환 또는 예외)
+        secret (str): JWT 시크릿 (없으면 로컬 검증 없이 캐시만 사용)
+    """
+
+    def __init__(self, fetch_user, secret=None, cache_ttl=TOKEN_CACHE_TTL,
+                 expiry_margin=TOKEN_EXPIRY_MARGIN,
+                 revocation_check_interval=TOKEN_REVOCATION_CHECK_INTERVAL,
+                 max_entries=TOKEN_CACHE_MAX_ENTRIES):
+        self.fetch_user = fetch_user
+        self.secret = secret
+        self.cache_ttl = cache_ttl
+        self.expiry_margin = expiry_margin
+        self.revocation_check_interval = revocation_check_interval
+        self.max_entries = max_entries
+
+        # sha256(token) -> {"valid_until", "checked_at", "exp"}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.local_verifications = 0
+        self.network_checks = 0
+
+    def validate(self, token):
+        """토큰이 유효하면 True"""
+        if not token:
+            return False
+
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry["valid_until"] > now:
+                self.cache_hits += 1
+                return True
+
+        # 로컬 서명 검증 (만료 임박 또는 폐기 확인 주기 전까지만)
+        claims = None
+        if self.secret:
+            try:
+                claims = decode_jwt(token, self.secret)
+            except UnverifiableTokenError:
+                # 비대칭 키로 서명된 토큰 등은 네트워크 확인으로 처리
+                claims = None
+            except InvalidTokenError:
+                self.invalidate(token)
+                return False
+
+        if claims:
+            exp = claims["exp"]
+            checked_at = entry["checked_at"] if entry else 0
+            if exp - now > self.expiry_margin and now - checked_at < self.revocation_check_interval:
+                self.local_verifications += 1
+                self._store(key, now, checked_at, exp)
+                return True
+
+        # 네트워크 확인
+        self.network_checks += 1
+        try:
+            user = self.fetch_user(token)
+        except Exception:
+            user = None
+        if not user:
+            self.invalidate(token)
+            return False
+
+        exp = claims["exp"] if claims else None
+        self._store(key, now, now, exp)
+        return True
+
+    def invalidate(self, token):
+        """토큰 캐시 제거 (로그아웃 등)"""
+        if not token:
+            return
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def stats(self):
+        """캐시 상태 카운터 반환"""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "local_verifications": self.local_verifications,
+                "network_checks": self.network_checks,
+            }
+
+    def _store(self, key, now, checked_at, exp):
+        valid_until = now + self.cache_ttl
+        if exp is not None:
+            valid_until = min(valid_until, exp - self.expiry_margin)
+        with self._lock:
+            if len(self._cache) >= self.max_entries and key not in self._cache:
+                # 만료된 항목 정리 후에도 가득 차면 가장 먼저 만료될 항목 제거
+                expired = [k for k, v in self._cache.items() if v["valid_until"] <= now]
+                for k in expired:
+                    del self._cache[k]
+                if len(self._cache) >= self.max_entries:
+                    del self._cache[min(self._cache, key=lambda k: self._cache[k]["valid_until"])]
+            self._cache[key] = {"valid_until": valid_until, "checked_at": checked_at, "exp": exp}
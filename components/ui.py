@@ -1,9 +1,51 @@
 import streamlit as st
 import streamlit_shadcn_ui as ui
+import streamlit.components.v1 as st_components
+import os
 import re
 import json
+import hashlib
 import pyperclip
 from datetime import datetime
+from dotenv import load_dotenv
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from components import json_codec, job_cache, batch, events
+from components.version_store import VersionStore
+
+# 환경변수 로드
+load_dotenv()
+
+# 블로그 콘텐츠 유형 (화면 표시 -> 내부 코드)
+BLOG_TYPE_OPTIONS = {
+    "후기형 (1인칭) - 감정공감형": "후기형V1",
+    "후기형 (1인칭) - 지적호기심형": "후기형V2",
+    "걱정 유발형 - 두괄식": "걱정유발형",
+    "체험단형 (3인칭) - 과정 중심": "체험단형V1",
+    "체험단형 (3인칭) - 결과 중심": "체험단형V2"
+}
+
+# 일괄 생성 대상 (화면 표시 -> (플랫폼, 블로그 유형))
+BATCH_TARGET_OPTIONS = {
+    "인스타그램": ("인스타그램", None),
+    **{f"블로그 · {label}": ("블로그", code) for label, code in BLOG_TYPE_OPTIONS.items()}
+}
+
+AGE_GROUPS = ["10대", "20대", "30대", "40대", "50대", "60대", "70대", "80대+"]
+
+# 정적 에셋(CSS/메타 태그) 전달 방식 (component: 세션당 한 번 <head>에 삽입, inline: 재실행마다 <style> 전송)
+PAGE_ASSETS_MODE = os.getenv("PAGE_ASSETS_MODE", "component")
+
+PAGE_TITLE = "BIOFOX 폭시"
+PAGE_ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_assets")
+
+with open(os.path.join(PAGE_ASSETS_DIR, "biofox.css"), encoding="utf-8") as _css_file:
+    PAGE_CSS = _css_file.read()
+
+# CSS가 바뀌면 브라우저 캐시를 무효화하기 위한 버전
+PAGE_CSS_VERSION = hashlib.sha256(PAGE_CSS.encode("utf-8")).hexdigest()[:12]
+
+# index.html이 부모 문서 <head>에 메타 태그와 biofox.css <link>를 추가 (컴포넌트 파일은 올바른 MIME 타입으로 제공됨)
+_page_assets = st_components.declare_component("biofox_page_assets", path=PAGE_ASSETS_DIR)
 
 def show_waiting_ui(job_id):
     """결과 대기 중 UI 표시"""
@@ -43,28 +85,55 @@ def show_waiting_ui(job_id):
             작업 ID: {job_id[:8]}...
         </p>
     </div>
-    
-    <style>
-        @keyframes progress {{
-            0% {{
-                margin-left: -30%;
-            }}
-            100% {{
-                margin-left: 100%;
-            }}
-        }}
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # 자동 새로고침
-    st.markdown("""
-    <script>
-        setTimeout(function() {
-            window.location.reload();
-        }, 5000);
-    </script>
     """, unsafe_allow_html=True)
 
+def show_delivery_status(delivery):
+    """백그라운드 웹훅 전송 상태 표시"""
+    status = delivery['status']
+    attempts = delivery.get('attempts', 0)
+    if status == 'accepted':
+        st.caption(f"✅ 요청이 접수되었습니다. (시도 {attempts}회)")
+    elif status == 'queued' and delivery.get('position'):
+        eta = delivery.get('eta') or 0
+        eta_text = f"약 {max(1, round(eta / 60))}분" if eta else "곧"
+        st.caption(f"⏳ 요청이 많아 대기 중입니다. (대기 순서 {delivery['position']}번째, {eta_text} 후 전송 예정)")
+    elif status == 'sending' and attempts > 1:
+        st.caption(f"🔁 요청 재전송 중... (시도 {attempts}회, 직전 오류: {delivery.get('error')})")
+    elif status in ('queued', 'sending'):
+        st.caption("📤 요청 전송 중...")
+
+def show_partial_result(events):
+    """생성 중인 콘텐츠를 완성된 섹션/문단 단위로 표시"""
+    st.markdown("#### ✍️ 생성 중인 콘텐츠")
+    for event in events:
+        name = event['name']
+        if event['type'] == 'paragraph':
+            st.markdown(event['text'])
+        elif name in ('본문', '캡션'):
+            # 문단 이벤트로 이미 표시됨
+            continue
+        elif name in ('제목', '후킹문구'):
+            st.markdown(f"### {event['text']}")
+        elif name in ('태그', '해시태그'):
+            st.caption(event['text'])
+        else:
+            st.info(event['text'])
+
+def show_job_group_progress(group):
+    """일괄 생성 작업별 진행 상태 표시 (완료된 작업부터 표시)"""
+    done, total = batch.group_progress(group)
+    st.progress(done / total if total else 1.0, text=f"📦 일괄 생성 {done}/{total}개 완료")
+    for job in group['jobs']:
+        if job['status'] == batch.JOB_DONE:
+            st.caption(f"✅ {job['label']}")
+        elif job['status'] == batch.JOB_FAILED:
+            st.caption(f"❌ {job['label']} - {job['error']}")
+        elif job.get('delivery'):
+            st.caption(f"⏳ {job['label']}")
+            show_delivery_status(job['delivery'])
+        else:
+            st.caption(f"⏳ {job['label']}")
+
 def generate_download_content(result, platform):
     """다운로드용 텍스트 콘텐츠 생성"""
     content_lines = []
@@ -145,26 +214,13 @@ def show_input_form():
         with blog_type_col2:
             blog_type_display = st.selectbox(
                 "블로그 콘텐츠 유형",
-                options=[
-                    "후기형 (1인칭) - 감정공감형",
-                    "후기형 (1인칭) - 지적호기심형",
-                    "걱정 유발형 - 두괄식",
-                    "체험단형 (3인칭) - 과정 중심",
-                    "체험단형 (3인칭) - 결과 중심"
-                ],
+                options=list(BLOG_TYPE_OPTIONS),
                 key="blog_type_select_outside",
                 label_visibility="collapsed"
             )
             
             # 화면 표시용을 내부 코드용으로 변환
-            blog_type_mapping = {
-                "후기형 (1인칭) - 감정공감형": "후기형V1",
-                "후기형 (1인칭) - 지적호기심형": "후기형V2", 
-                "걱정 유발형 - 두괄식": "걱정유발형",
-                "체험단형 (3인칭) - 과정 중심": "체험단형V1",
-                "체험단형 (3인칭) - 결과 중심": "체험단형V2"
-            }
-            blog_type = blog_type_mapping.get(blog_type_display, blog_type_display)
+            blog_type = BLOG_TYPE_OPTIONS.get(blog_type_display, blog_type_display)
         st.markdown("---")
     
     # 나머지 입력 요소들은 폼 안에서 처리
@@ -179,7 +235,7 @@ def show_input_form():
             with age_col2:
                 age_group = st.selectbox(
                     "타겟 연령대",
-                    options=["10대", "20대", "30대", "40대", "50대", "60대", "70대", "80대+"],
+                    options=AGE_GROUPS,
                     key="age_group_select",
                     label_visibility="collapsed"
                 )
@@ -292,6 +348,24 @@ def show_input_form():
         </div>
         """, unsafe_allow_html=True)
         
+        # 일괄 생성 - 같은 입력으로 다른 플랫폼/블로그 유형/연령대 결과를 동시에 생성
+        with st.expander(f"📦 일괄 생성 (최대 {batch.BATCH_MAX_JOBS}개 동시 생성)"):
+            st.caption("위에서 고른 플랫폼/연령대에 더해, 아래에서 고른 조합을 모두 함께 생성합니다.")
+            extra_targets = st.multiselect(
+                "추가 플랫폼 / 블로그 유형",
+                options=list(BATCH_TARGET_OPTIONS),
+                key="batch_targets_select"
+            )
+            extra_ages = st.multiselect(
+                "추가 연령대",
+                options=AGE_GROUPS,
+                key="batch_ages_select"
+            )
+        
+        # 같은 입력이면 최근 결과 재사용 (새로운 문구가 필요하면 해제)
+        if job_cache.JOB_CACHE_ENABLED:
+            st.checkbox("♻️ 같은 입력이면 최근 생성 결과 재사용", value=True, key="reuse_cached_result")
+        
         col_submit = st.columns([1, 1, 1])
         with col_submit[1]:
             submit_button = st.form_submit_button(
@@ -319,87 +393,111 @@ def show_input_form():
             # 세션 상태에 저장
             st.session_state.form_data = form_data
             
+            # 일괄 생성 조합 (선택한 조합이 하나뿐이면 일반 생성)
+            targets = [(platform, form_data.get("blog_type"))]
+            targets += [BATCH_TARGET_OPTIONS[label] for label in extra_targets]
+            variants = batch.expand_batch(form_data, targets, [age_group] + [age for age in extra_ages if age != age_group])
+            st.session_state.batch_variants = variants if len(variants) > 1 else None
+            
             # 결과 생성 함수 호출
             return form_data
             
     return None
 
+# 캡션 속 해시태그 강조
+_HASHTAG_RE = re.compile(r'#(\w+)')
+_HASHTAG_SPAN = r'<span style="color: #1DA1F2; font-weight: 600;">#\1</span>'
+
+# 세션별로 보관하는 렌더링 결과 수 (버전 전환 대비)
+RENDER_CACHE_SIZE = 8
+
+def highlight_caption(caption):
+    """줄바꿈을 <br>로 바꾸고 해시태그를 강조한 캡션 HTML (re.sub 한 번으로 처리)"""
+    return _HASHTAG_RE.sub(_HASHTAG_SPAN, caption.replace('\n', '<br>'))
+
+def dedupe_hashtags(hashtags):
+    """해시태그 정리 (공백 제거, # 붙이기, 순서를 유지한 중복 제거)"""
+    tags = []
+    seen = set()
+    for tag in hashtags:
+        if not isinstance(tag, str):
+            continue
+        tag = tag.strip()
+        if not tag:
+            continue
+        if not tag.startswith('#'):
+            tag = f'#{tag}'
+        if tag not in seen:
+            seen.add(tag)
+            tags.append(tag)
+    return tags
+
+def clean_blog_content(raw_content):
+    """블로그 본문 표시용 텍스트 (비어 있으면 None)"""
+    if not raw_content or raw_content == '\\' or str(raw_content).strip() == '':
+        return None
+    
+    # JSON 문자열로 감싸진 경우 본문만 꺼냄
+    if isinstance(raw_content, str) and ('{' in raw_content or '[' in raw_content):
+        try:
+            json_data = json.loads(raw_content)
+            if isinstance(json_data, dict) and 'blog_content' in json_data:
+                raw_content = json_data['blog_content']
+        except ValueError:
+            pass
+    
+    # 이스케이프된 줄바꿈/따옴표/백슬래시 처리
+    return str(raw_content).replace('\\n', '\n').replace('\\"', '"').replace('\\\\', '\\')
+
+def render_result(result):
+    """결과 표시에 필요한 HTML/텍스트를 한 번에 생성"""
+    rendered = {}
+    
+    caption = result.get('caption')
+    if isinstance(caption, str):
+        rendered['caption_html'] = highlight_caption(caption)
+        rendered['caption_plain_html'] = caption.replace('\n', '<br>')
+    
+    hashtags = result.get('hashtags')
+    if isinstance(hashtags, list):
+        rendered['hashtags_html'] = ''.join(
+            f'<span class="hashtag">{tag if isinstance(tag, str) else ""}</span>' for tag in hashtags
+        )
+        rendered['tags'] = dedupe_hashtags(hashtags)
+        rendered['tags_html'] = '<div class="hashtag-container">' + ''.join(
+            f'<span class="hashtag">{tag.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")}</span>'
+            for tag in rendered['tags']
+        ) + '</div>'
+    
+    # 블로그 제목 - JSON에서 이스케이프된 앞 백슬래시 제거
+    title = result.get('blog_title')
+    title = "" if title is None else str(title)
+    rendered['blog_title'] = title[1:] if title.startswith('\\') else title
+    
+    rendered['blog_content'] = clean_blog_content(result.get('blog_content'))
+    return rendered
+
+def get_rendered_result(result):
+    """결과 내용 해시별로 한 번만 렌더링 (다른 위젯으로 인한 재실행에서는 캐시 사용)"""
+    cache = st.session_state.setdefault('render_cache', {})
+    key = json_codec.content_hash(result)
+    if key not in cache:
+        if len(cache) >= RENDER_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = render_result(result)
+    return cache[key]
+
 def show_results():
     """광고 생성 결과 표시"""
     if not st.session_state.get('result'):
         return
     
     result = st.session_state.result
+    rendered = get_rendered_result(result)
     
     # 플랫폼 정보 가져오기 (기본값은 인스타그램)
     platform = st.session_state.get('form_data', {}).get('platform', '인스타그램')
     
-    # CSS 스타일 적용 - 전체 페이지에 적용되는 스타일
-    st.markdown("""
-    <style>
-        .ad-container {
-            border: 1px solid #e1e4e8;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 20px;
-            background-color: white;
-            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);
-        }
-        .ad-headline {
-            font-size: 1.3em;
-            font-weight: bold;
-            margin-bottom: 15px;
-            color: #333;
-            line-height: 1.4;
-        }
-        .ad-caption, .blog-content {
-            white-space: pre-wrap;
-            line-height: 1.6;
-            color: #444;
-            max-height: 1000px;
-            min-height: 400px;
-            overflow-y: auto;
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-radius: 5px;
-            font-size: 1.05em;
-            overflow-x: hidden;
-        }
-        .blog-title {
-            font-size: 1.5em;
-            font-weight: bold;
-            margin-bottom: 15px;
-            color: #333;
-            line-height: 1.4;
-            padding: 10px 15px;
-            background-color: #f0f4f8;
-            border-radius: 5px;
-        }
-        .hashtags {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            margin-top: 15px;
-        }
-        .hashtag {
-            background-color: #e1f5fe;
-            color: #0277bd;
-            padding: 5px 10px;
-            border-radius: 15px;
-            font-size: 0.9em;
-        }
-        .copy-btn {
-            margin-top: 10px;
-        }
-        .version-selector {
-            margin-bottom: 20px;
-            padding: 10px;
-            background-color: #f1f3f4;
-            border-radius: 8px;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
     # 상단 버튼들
     btn_col1, btn_col2, btn_col3 = st.columns([1, 1, 1])
     
@@ -409,7 +507,7 @@ def show_results():
             st.session_state.result = None
             st.session_state.chat_enabled = False
             st.session_state.messages = []
-            st.session_state.version_history = []
+            st.session_state.version_history = VersionStore()
             st.session_state.form_data = {}
             st.rerun()
     
@@ -466,17 +564,20 @@ def show_results():
         with st.container():
             st.markdown("<div class='version-selector'>", unsafe_allow_html=True)
             
-            versions = [f"버전 {v['version']} ({v['timestamp']})" for v in st.session_state.version_history]
-            current_version = f"버전 {st.session_state.version_history[-1]['version']} ({st.session_state.version_history[-1]['timestamp']})"
+            history = st.session_state.version_history.metadata()
+            versions = [f"버전 {v['version']} ({v['timestamp']})" for v in history]
+            current_version = f"버전 {history[-1]['version']} ({history[-1]['timestamp']})"
             
             col1, col2 = st.columns([1, 3])
             with col1:
                 st.markdown("#### 버전 관리")
             
             with col2:
+                # 기본 선택은 최신 버전 (다른 버전을 고를 때만 복원)
                 selected_version = st.selectbox(
                     "버전 선택",
                     options=versions,
+                    index=len(versions) - 1,
                     key="selected_version_select"
                 )
             
@@ -487,6 +588,8 @@ def show_results():
             # 선택한 버전이 현재 버전과 다른 경우 해당 버전 표시
             if selected_version != len(versions):
                 from app import restore_version
+                # 복원 후 추가되는 새 최신 버전이 선택되도록 선택값 초기화
+                del st.session_state.selected_version_select
                 restore_version(selected_version)
             
             st.markdown("</div>", unsafe_allow_html=True)
@@ -517,17 +620,8 @@ def show_results():
         # 인스타그램 캡션 표시
         if 'caption' in result:
             with st.container():
-                # 캡션 텍스트 처리
-                # 1. 줄바꾸을 HTML <br>태그로 변환
-                # 2. 해시태그 강조
-                formatted_caption = result['caption'].replace('\n', '<br>')
-                
-                # 해시태그 강조 (#태그 스타일 적용)
-                for tag in re.findall(r'#(\w+)', formatted_caption):
-                    formatted_caption = formatted_caption.replace(
-                        f'#{tag}', 
-                        f'<span style="color: #1DA1F2; font-weight: 600;">#{tag}</span>'
-                    )
+                # 줄바꿈/해시태그 강조가 적용된 캡션 (내용별로 캐시)
+                formatted_caption = rendered.get('caption_html', '')
                 
                 st.markdown("""
                 <div class="ad-container">
@@ -550,11 +644,8 @@ def show_results():
         # 해시태그 표시
         if 'hashtags' in result and result['hashtags']:
             with st.container():
-                # 해시태그 안전하게 처리
-                hashtags_html = ""
-                if isinstance(result['hashtags'], list):
-                    # 각 해시태그를 전체 태그로 처리
-                    hashtags_html = ''.join([f'<span class="hashtag">{tag if isinstance(tag, str) else ""}</span>' for tag in result['hashtags']])
+                # 해시태그 HTML (내용별로 캐시)
+                hashtags_html = rendered.get('hashtags_html', "")
                 
                 st.markdown("""
                 <div class="ad-container">
@@ -579,15 +670,7 @@ def show_results():
         # 블로그 제목 표시
         if 'blog_title' in result:
             with st.container():
-                # 블로그 제목을 안전하게 처리
-                blog_title = ""
-                if 'blog_title' in result and result['blog_title'] is not None:
-                    # 이스케이프 문자 처리
-                    title = str(result['blog_title'])
-                    # JSON에서 이스케이프된 문자열 처리
-                    if title.startswith('\\'): 
-                        title = title[1:]
-                    blog_title = title
+                blog_title = rendered['blog_title']
                 
                 st.markdown("""
                 <div class="ad-container">
@@ -613,11 +696,10 @@ def show_results():
                 # 제목 표시
                 st.markdown("### 📄 블로그 본문")
                 
-                # 원본 데이터 가져오기
-                raw_content = result['blog_content']
+                # 표시용 본문 (내용별로 캐시)
+                content = rendered['blog_content']
                 
-                # 데이터가 JSON 문자열이거나 단일 백슬래시만 있는 경우
-                if raw_content == '\\' or raw_content == '' or not raw_content or str(raw_content).strip() == '':
+                if content is None:
                     # 웹훅에서 원본 데이터 확인
                     st.warning("⚠️ 블로그 본문 데이터가 누락되었습니다.")
                     
@@ -632,43 +714,11 @@ def show_results():
                     else:
                         st.error("❌ 표시할 콘텐츠가 없습니다. 다시 생성해주세요.")
                 else:
-                    # 1. 일반 텍스트로 처리
-                    try:
-                        # JSON 문자열인 경우 처리 시도
-                        import json
-                        try:
-                            # JSON 파싱 시도
-                            if isinstance(raw_content, str) and ('{' in raw_content or '[' in raw_content):
-                                json_data = json.loads(raw_content)
-                                if isinstance(json_data, dict) and 'blog_content' in json_data:
-                                    raw_content = json_data['blog_content']
-                        except:
-                            pass
-                            
-                        # 문자열 처리
-                        content = str(raw_content)
-                        # 줄바꿈 처리
-                        content = content.replace('\\n', '\n')
-                        # 따옴표 처리
-                        content = content.replace('\\"', '"')
-                        # 일반 백슬래시 처리
-                        content = content.replace('\\\\', '\\')
-                        
-                        # 최종 표시 형식
-                        st.text_area("", 
-                                    value=content,
-                                    height=400, 
-                                    label_visibility="collapsed",
-                                    key="blog_content_text")
-                        
-                    except Exception as e:
-                        st.error(f"블로그 본문 표시 오류: {str(e)}")
-                        # 원본 데이터 그대로 표시
-                        st.text_area("", 
-                                    value=str(raw_content),
-                                    height=400, 
-                                    label_visibility="collapsed",
-                                    key="blog_content_raw")
+                    st.text_area("", 
+                                value=content,
+                                height=400, 
+                                label_visibility="collapsed",
+                                key="blog_content_text")
                 
                 # 복사 버튼
                 col1, col2 = st.columns([3, 1])
@@ -676,7 +726,7 @@ def show_results():
                     copy_content = st.button("복사", key="copy_content_btn_text")
                     if copy_content:
                         try:
-                            content_to_copy = content if 'content' in locals() else str(raw_content)
+                            content_to_copy = content if content is not None else str(result['blog_content'])
                             pyperclip.copy(content_to_copy)
                             st.success("블로그 본문이 복사되었습니다!")
                         except Exception as e:
@@ -690,7 +740,7 @@ def show_results():
                     <h3>📄 블로그 본문</h3>
                     <div class="blog-content">{0}</div>
                 </div>
-                """.format(result['caption'].replace('\n', '<br>')), unsafe_allow_html=True)
+                """.format(rendered.get('caption_plain_html', '')), unsafe_allow_html=True)
                 
                 # 복사 버튼
                 col1, col2 = st.columns([3, 1])
@@ -706,61 +756,15 @@ def show_results():
     # 태그 표시 (블로그에서만 표시)
     if platform == '블로그' and 'hashtags' in result and result['hashtags']:
         with st.container():
-            # CSS 스타일 추가
-            st.markdown("""
-            <style>
-            .hashtag-container {
-                margin-top: 15px;
-                margin-bottom: 15px;
-            }
-            .hashtag {
-                background-color: #f0f2f6;
-                color: #0066cc;
-                padding: 5px 10px;
-                margin-right: 8px;
-                margin-bottom: 8px;
-                border-radius: 15px;
-                display: inline-block;
-                font-size: 0.9em;
-            }
-            </style>
-            """, unsafe_allow_html=True)
-            
             # 해시태그 안전하게 처리
             st.markdown("### 🏷️ 태그")
             
             # 태그 표시 영역
             tag_area = st.container()
             with tag_area:
-                if isinstance(result['hashtags'], list):
-                    # 태그 목록을 깨끗하게 표시
-                    tags_html = '<div class="hashtag-container">'
-                    
-                    # 해시태그와 문자열 처리
-                    processed_tags = []
-                    for tag in result['hashtags']:
-                        if isinstance(tag, str):
-                            # 특수 문자 제거
-                            tag = tag.strip()
-                            if tag:
-                                # 해시태그 '#' 처리
-                                if not tag.startswith('#'):
-                                    tag = f'#{tag}'
-                                # 중복 해시태그 제거
-                                if tag not in processed_tags:
-                                    processed_tags.append(tag)
-                    
-                    # 해시태그 HTML 생성
-                    for tag in processed_tags:
-                        # 태그에서 HTML 특수문자 이스케이프 처리
-                        tag_escaped = tag.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                        tags_html += f'<span class="hashtag">{tag_escaped}</span>'
-                        
-                    tags_html += '</div>'
-                    st.markdown(tags_html, unsafe_allow_html=True)
-                    
-                    # 업데이트된 태그 목록 저장 (복사용)
-                    st.session_state['processed_hashtags'] = processed_tags
+                if 'tags_html' in rendered:
+                    # 정리된 태그 목록 (내용별로 캐시)
+                    st.markdown(rendered['tags_html'], unsafe_allow_html=True)
             
             # 복사 버튼
             col1, col2 = st.columns([3, 1])
@@ -768,24 +772,11 @@ def show_results():
                 copy_tags = st.button("복사", key="copy_tags_btn")
                 if copy_tags:
                     try:
-                        # 처리된 해시태그 복사
-                        if 'processed_hashtags' in st.session_state and st.session_state['processed_hashtags']:
-                            # 처리된 태그 목록 사용
-                            tags_text = ' '.join(st.session_state['processed_hashtags'])
+                        # 정리된 해시태그 복사
+                        if 'tags' in rendered:
+                            tags_text = ' '.join(rendered['tags'])
                         else:
-                            # 원본 태그 사용
-                            processed_tags = []
-                            if isinstance(result['hashtags'], list):
-                                for tag in result['hashtags']:
-                                    if isinstance(tag, str):
-                                        tag = tag.strip()
-                                        if tag and not tag.startswith('#'):
-                                            tag = f'#{tag}'
-                                        if tag and tag not in processed_tags:
-                                            processed_tags.append(tag)
-                                tags_text = ' '.join(processed_tags)
-                            else:
-                                tags_text = str(result['hashtags'])
+                            tags_text = str(result['hashtags'])
                                 
                         # 두 해시태그 사이에 공백 추가
                         pyperclip.copy(tags_text)
@@ -793,51 +784,111 @@ def show_results():
                     except Exception as e:
                         st.error(f"복사 중 오류가 발생했습니다: {str(e)}")
 
-# 채팅 기능 제거됨
+def show_modify_chat():
+    """수정 요청 채팅 - 이전 대화를 표시하고 새로 입력된 수정 요청 반환 (없으면 None)"""
+    st.markdown("---")
+    st.markdown("### 💬 수정 요청")
+    for message in st.session_state.get('messages', []):
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+    return st.chat_input("수정하고 싶은 내용을 입력하세요 (예: 더 친근한 말투로 바꿔주세요)")
+
+def show_group_results():
+    """일괄 생성 결과를 작업별 탭으로 표시 (하나를 골라 기존 결과 화면에서 편집)"""
+    group = st.session_state.get('job_group')
+    if not group:
+        return
+    
+    jobs = group['jobs']
+    done, total = batch.group_progress(group)
+    completed = [job for job in jobs if job['status'] == batch.JOB_DONE]
+    
+    btn_col1, btn_col2 = st.columns([1, 1])
+    with btn_col1:
+        if st.button("🔙 새로 작성하기", use_container_width=True, key="group_reset_btn"):
+            st.session_state.job_group = None
+            st.session_state.job_status = None
+            st.rerun()
+    with btn_col2:
+        if completed:
+            st.download_button(
+                label="💾 전체 텍스트 다운로드",
+                data="\n\n".join(
+                    f"[{job['label']}]\n" + generate_download_content(job['result'], job['form_data'].get('platform'))
+                    for job in completed
+                ),
+                file_name=f"BIOFOX_일괄생성_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                mime="text/plain",
+                use_container_width=True,
+                key="group_download_btn"
+            )
+    
+    st.markdown("---")
+    st.markdown(f"## 📦 일괄 생성 결과 ({len(completed)}/{total}개 성공)")
+    
+    labels = [job['label'] for job in jobs]
+    selected = ui.tabs(options=labels, default_value=labels[0], key="job_group_tabs")
+    job = jobs[labels.index(selected)] if selected in labels else jobs[0]
+    
+    if job['status'] != batch.JOB_DONE:
+        st.error(f"❌ 생성하지 못했습니다: {job['error']}")
+        return
+    
+    result = job['result']
+    rendered = get_rendered_result(result)
+    if job['form_data'].get('platform') == '인스타그램':
+        if result.get('headline'):
+            st.markdown(f"### 📣 {result['headline']}")
+        st.markdown(f'<div class="ad-caption">{rendered.get("caption_html", "")}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="hashtags">{rendered.get("hashtags_html", "")}</div>', unsafe_allow_html=True)
+    else:
+        st.markdown(f"### 📝 {rendered['blog_title']}")
+        st.text_area("", value=rendered['blog_content'] or "", height=400, label_visibility="collapsed",
+                     key=f"group_blog_content_{job['job_id']}")
+        st.markdown(rendered.get('tags_html', ''), unsafe_allow_html=True)
+    
+    if st.button("✏️ 이 결과로 계속하기", key=f"group_open_{job['job_id']}"):
+        # 선택한 결과를 기존 결과 화면(버전 관리/다운로드)으로 이동
+        st.session_state.result = result
+        st.session_state.form_data = job['form_data']
+        st.session_state.current_job_id = job['job_id']
+        st.session_state.job_status = "completed"
+        st.session_state.job_group = None
+        st.session_state.version_history = VersionStore([{
+            'version': 1,
+            'timestamp': datetime.now().strftime("%H:%M:%S"),
+            'data': result,
+            'is_original': True
+        }])
+        st.rerun()
+
+def inject_page_assets():
+    """공통 CSS와 메타 태그 적용
+
+    component 모드에서는 재실행마다 작은 컴포넌트 참조만 전송하고, 같은 위치의 iframe이 유지되어
+    스타일시트는 세션당 한 번만 <head>에 추가됩니다. inline 모드는 매번 전체 CSS를 전송합니다.
+    """
+    if PAGE_ASSETS_MODE == "inline":
+        st.markdown(f"<style>{PAGE_CSS}</style>", unsafe_allow_html=True)
+        return
+    _page_assets(version=PAGE_CSS_VERSION, key="biofox_page_assets", default=None)
+
+def streamlit_sink(level, message):
+    """파서/네트워크 모듈의 메시지를 현재 페이지에 표시 (debug는 EVENT_DEBUG일 때만)
+
+    스크립트 실행 스레드가 아닌 곳(전송 스레드 등)에서 온 메시지는 콘솔로 출력합니다.
+    """
+    if get_script_run_ctx() is None:
+        events.print_sink(level, message)
+    elif level == "debug":
+        if events.EVENT_DEBUG:
+            st.caption(message)
+    else:
+        getattr(st, level, st.info)(message)
 
 def init_page():
     """페이지 기본 설정"""
-    # 메타 태그 추가
-    meta_tags = """
-    <head>
-        <title>BIOFOX 폭시</title>
-        <meta property="og:title" content="BIOFOX 폭시">
-        <meta property="og:description" content="BIOFOX 자동화">
-        <meta property="og:image" content="https://ad.biofoxi.com/logo.png">
-        <meta property="og:url" content="https://ad.biofoxi.com">
-        <meta property="og:type" content="website">
-        <meta name="twitter:card" content="summary_large_image">
-        <meta name="twitter:title" content="BIOFOX 폭시">
-        <meta name="twitter:description" content="BIOFOX 자동화">
-        <meta name="twitter:image" content="https://ad.biofoxi.com/logo.png">
-        <meta name="description" content="BIOFOX 자동화">
-    </head>
-    """
-    st.markdown(meta_tags, unsafe_allow_html=True)
-    
-    # CSS 스타일
-    st.markdown("""
-    <style>
-        .stButton > button {
-            width: 100%;
-        }
-        @media (max-width: 768px) {
-            .stColumns > div {
-                margin-bottom: 1rem;
-            }
-        }
-        /* 드롭다운 메뉴 열렸을 때 옵션들의 폰트 크기만 조정 */
-        .stSelectbox [role="listbox"] [role="option"] {
-            font-size: 11px !important;
-            white-space: nowrap !important;
-            padding: 6px 10px !important;
-            line-height: 1.2 !important;
-        }
-        
-        /* 드롭다운 메뉴의 전체 컨테이너 */
-        .stSelectbox [role="listbox"] {
-            max-height: 300px !important;
-            overflow-y: auto !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.set_page_config(page_title=PAGE_TITLE)
+    inject_page_assets()
+    # components.parser 등 Streamlit과 분리된 모듈의 메시지를 화면에 표시
+    events.set_sink(streamlit_sink)
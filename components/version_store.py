@@ -0,0 +1,138 @@
+import os
+import copy
+import zlib
+from dotenv import load_dotenv
+from components import json_codec
+
+# 환경변수 로드
+load_dotenv()
+
+# 큰 필드 값을 zlib으로 압축해서 보관할지 여부
+VERSION_STORE_COMPRESS = os.getenv("VERSION_STORE_COMPRESS", "true").lower() == "true"
+# 압축 대상 최소 크기 (JSON 바이트)
+VERSION_COMPRESS_MIN_BYTES = int(os.getenv("VERSION_COMPRESS_MIN_BYTES", "512"))
+# 전체 스냅샷을 다시 저장하는 간격 (버전 복원 시 적용할 변경분 수의 상한)
+VERSION_KEYFRAME_INTERVAL = int(os.getenv("VERSION_KEYFRAME_INTERVAL", "10"))
+
+
+class _Packed:
+    """zlib으로 압축한 필드 값"""
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+class VersionStore:
+    """버전 히스토리 저장소 (기준 스냅샷 + 필드별 변경분)
+
+    기존 version_history 리스트처럼 len(), 인덱싱, 반복, append()를 지원합니다.
+    각 버전은 {'version', 'timestamp', 'data', ...} 딕셔너리로 요청할 때 만들어지며,
+    내부에는 직전 버전에서 바뀐 필드만 보관합니다.
+    """
+
+    def __init__(self, entries=None, compress=None, keyframe_interval=None):
+        self.compress = VERSION_STORE_COMPRESS if compress is None else compress
+        self.keyframe_interval = max(1, keyframe_interval or VERSION_KEYFRAME_INTERVAL)
+        # (메타데이터, 변경 필드, 삭제 필드) 목록
+        self._records = []
+        # 마지막 버전 데이터 (변경분 계산 및 최신 버전 조회용)
+        self._head = {}
+        # 버전별 내용 해시 (복원 없이 같은 내용인지 비교)
+        self._hashes = []
+        for entry in entries or []:
+            self.append(entry)
+
+    def _pack(self, value):
+        """필드 값을 보관용으로 변환 (큰 값은 압축, 나머지는 복사)"""
+        if self.compress and isinstance(value, (str, list, dict)):
+            # 값의 문자열은 최신 버전/세션 결과에 계속 남으므로 UTF-8 캐시 없이 인코딩
+            raw = json_codec.dumps_retained(value)
+            if len(raw) >= VERSION_COMPRESS_MIN_BYTES:
+                return _Packed(zlib.compress(raw))
+        return copy.deepcopy(value)
+
+    @staticmethod
+    def _unpack(value):
+        """보관된 필드 값 복원"""
+        if isinstance(value, _Packed):
+            return json_codec.loads(zlib.decompress(value.data))
+        return copy.deepcopy(value)
+
+    def append(self, entry):
+        """버전 추가 (직전 버전과 달라진 필드만 저장)
+
+        Args:
+            entry (dict): 'data'에 결과 딕셔너리를 담은 버전 정보
+        """
+        meta = dict(entry)
+        data = meta.pop('data', None) or {}
+
+        if len(self._records) % self.keyframe_interval == 0:
+            changed = data
+            removed = ()
+        else:
+            changed = {field: value for field, value in data.items() if field not in self._head or self._head[field] != value}
+            removed = tuple(field for field in self._head if field not in data)
+
+        self._records.append((meta, {field: self._pack(value) for field, value in changed.items()}, removed))
+        self._hashes.append(json_codec.content_hash(data))
+        self._head = copy.deepcopy(data)
+
+    def _materialize(self, index):
+        """index 번째 버전 딕셔너리 생성 (가장 가까운 전체 스냅샷부터 변경분 적용)"""
+        meta = self._records[index][0]
+        if index == len(self._records) - 1:
+            data = copy.deepcopy(self._head)
+        else:
+            data = {}
+            for _, changed, removed in self._records[index - index % self.keyframe_interval:index + 1]:
+                for field in removed:
+                    data.pop(field, None)
+                for field, value in changed.items():
+                    data[field] = self._unpack(value)
+        return {**meta, 'data': data}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self._records)))]
+        if index < 0:
+            index += len(self._records)
+        if not 0 <= index < len(self._records):
+            raise IndexError("version index out of range")
+        return self._materialize(index)
+
+    def __iter__(self):
+        """처음부터 변경분을 차례로 적용하며 모든 버전 반환"""
+        data = {}
+        for index, (meta, changed, removed) in enumerate(self._records):
+            if index % self.keyframe_interval == 0:
+                data = {}
+            for field in removed:
+                data.pop(field, None)
+            for field, value in changed.items():
+                data[field] = self._unpack(value)
+            yield {**meta, 'data': copy.deepcopy(data)}
+
+    def metadata(self):
+        """데이터 없이 버전 정보만 반환 (버전 선택 목록 등, 복원 비용 없음)"""
+        return [dict(meta) for meta, _, _ in self._records]
+
+    def content_hashes(self):
+        """버전별 내용 해시 목록 (json_codec.content_hash)"""
+        return list(self._hashes)
+
+    def to_list(self):
+        """전체 버전을 JSON으로 보낼 수 있는 리스트로 변환"""
+        return list(self)
+
+    def stored_bytes(self):
+        """보관 중인 필드 값의 대략적인 크기 (압축 값은 압축 크기, 나머지는 JSON 크기)"""
+        total = 0
+        for _, changed, _ in self._records:
+            for value in changed.values():
+                total += len(value.data) if isinstance(value, _Packed) else len(json_codec.dumps(value))
+        return total
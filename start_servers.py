@@ -1,25 +1,40 @@
 #!/usr/bin/env python3
 """
 BIOFOX 자동화 서버 시작 스크립트
-- FastAPI 서버 (포트 8001)
+- 결과 저장소 공유 서버 (RESULT_STORE_BACKEND=shared 인 경우)
+- FastAPI 서버 (포트 8001, API_WORKERS 개 워커)
 - Streamlit 앱 (포트 8501)
 """
 
 import subprocess
+import secrets
 import time
 import sys
 import os
 
+def start_result_store():
+    """결과 저장소 공유 서버 시작 (다중 워커용)"""
+    print(f"🗄️ 결과 저장소 공유 서버 시작 중... ({os.getenv('RESULT_STORE_ADDRESS', '127.0.0.1:8765')})")
+    return subprocess.Popen([
+        sys.executable, "-m", "components.result_store"
+    ])
+
 def start_fastapi():
     """FastAPI 서버 시작"""
-    print("🚀 FastAPI 서버 시작 중... (포트 8001)")
-    return subprocess.Popen([
+    workers = int(os.getenv("API_WORKERS", "1"))
+    print(f"🚀 FastAPI 서버 시작 중... (포트 8001, 워커 {workers}개)")
+    command = [
         sys.executable, "-m", "uvicorn", 
         "api:app", 
         "--host", "0.0.0.0", 
-        "--port", "8001",
-        "--reload"
-    ])
+        "--port", "8001"
+    ]
+    if workers > 1:
+        # --reload는 다중 워커와 함께 사용할 수 없음
+        command += ["--workers", str(workers)]
+    else:
+        command.append("--reload")
+    return subprocess.Popen(command)
 
 def start_streamlit():
     """Streamlit 앱 시작"""
@@ -37,6 +52,17 @@ def main():
     print("=" * 50)
     
     try:
+        # 다중 워커가 같은 결과를 보도록 공유 저장소 서버 먼저 시작
+        store_process = None
+        if os.getenv("RESULT_STORE_BACKEND", "memory").lower() == "shared":
+            # 인증 키가 없으면 실행마다 새로 만들어 공유 서버와 API 워커에 환경변수로 전달
+            if not os.getenv("RESULT_STORE_AUTHKEY"):
+                os.environ["RESULT_STORE_AUTHKEY"] = secrets.token_hex(32)
+            store_process = start_result_store()
+            time.sleep(1)  # 공유 서버 시작 대기
+        elif int(os.getenv("API_WORKERS", "1")) > 1:
+            print("⚠️ API_WORKERS > 1 이면 RESULT_STORE_BACKEND=shared 또는 sqlite 사용을 권장합니다.")
+        
         # FastAPI 서버 시작
         fastapi_process = start_fastapi()
         time.sleep(2)  # FastAPI 시작 대기
@@ -63,6 +89,10 @@ def main():
             if streamlit_process.poll() is not None:
                 print("❌ Streamlit 앱이 종료되었습니다.")
                 break
+            
+            if store_process and store_process.poll() is not None:
+                print("❌ 결과 저장소 공유 서버가 종료되었습니다.")
+                break
                 
     except KeyboardInterrupt:
         print("\n🛑 서버 종료 중...")
@@ -72,6 +102,8 @@ def main():
             fastapi_process.terminate()
         if 'streamlit_process' in locals():
             streamlit_process.terminate()
+        if locals().get('store_process'):
+            store_process.terminate()
             
         print("✅ 모든 서버가 종료되었습니다.")
         